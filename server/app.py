@@ -12,6 +12,8 @@ from utils.kis_websocket import kis_websocket_access_token, scheduled_refresh_we
 from services.websocket_service import get_websocket_service
 from services.stock_service import StockService
 from services.ranking_service import RankingService
+from services.partition_service import PartitionService, STOCK_HISTORY_PARTITIONING
+from services.minute_bar_service import MinuteBarService
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 import atexit
@@ -19,16 +21,21 @@ import time
 
 # config
 from config import setup_logging # logging
-from config.redis import redis_config # redis
+from config import setup_response_pipeline # orjson + 압축
+from config.redis import redis_config, get_redis # redis
 
 # models
 from models import db
 from models.user import User
 from models.stock import Stock
 from models.stock_history import StockHistory
+from models.stock_latest import StockLatest
+from models.stock_candle import StockCandle
+from models.stock_minute_bar import StockMinuteBar
 from models.portfolio import Portfolio
 from models.transaction import Transaction
 from models.bookmark import Bookmark
+from models.schema import upgrade_schema, schema_lock
 
 # routes
 from routes.auth_routes import auth_bp
@@ -38,8 +45,13 @@ from routes.user_routes import user_bp
 from routes.ranking_routes import ranking_bp
 from routes.stock_routes import stock_bp
 from routes.bookmark_routes import bookmark_bp
+from routes.stream_routes import stream_bp
 
-def create_app(): 
+# 실시간 시세 스트림(/api/stock/stream)을 API 앱에 함께 등록할지 (개발 서버용)
+# 배포에서는 스트림 전용 프로세스(stream_app.py, gevent 워커)가 받으므로 API 워커의 스레드를 점유하지 않음
+PRICE_STREAM_EMBEDDED = os.getenv("PRICE_STREAM_EMBEDDED", "0") == "1"
+
+def create_app(embed_stream=PRICE_STREAM_EMBEDDED): 
     app = Flask(__name__)
     app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
@@ -47,10 +59,11 @@ def create_app():
     setup_logging(app)
 
     CORS(app, origins=['http://localhost:3000', 'http://127.0.0.1:3000'])
+    setup_response_pipeline(app)
 
     init_db(app)
     init_redis(app)
-    register_blueprints(app)
+    register_blueprints(app, embed_stream)
     setup_scheduler(app)
 
     # DB
@@ -60,14 +73,42 @@ def create_app():
             db.engine.connect()
             app.logger.info("✅ 데이터베이스 연결 성공!")
 
-            # DB 테이블 생성
-            db.create_all()
-            app.logger.info("✅ 테이블 생성 완료!")
+            # 스키마 변경은 워커 간 잠금 안에서 한 프로세스씩 (먼저 잡은 워커가 변경, 나머지는 변경된 상태 확인 후 통과)
+            with schema_lock():
+                # DB 테이블 생성
+                db.create_all()
+                app.logger.info("✅ 테이블 생성 완료!")
+
+                # 기존 테이블에 누락된 컬럼/인덱스 보강
+                upgrade_schema(app)
+
+                # stock_histories 월 단위 파티셔닝 (STOCK_HISTORY_PARTITIONING=1 일 때)
+                if STOCK_HISTORY_PARTITIONING:
+                    try:
+                        PartitionService.enable_partitioning()
+                        PartitionService.ensure_future_partitions()
+                        app.logger.info("✅ stock_histories 파티션 확인 완료")
+
+                    except Exception as e:
+                        app.logger.error(f"❌ stock_histories 파티션 확인 실패: {e}")
 
         except Exception as e:
             app.logger.error(f"❌ 데이터베이스 연결 실패: {e}")
             raise
 
+        # 최신 시세 스냅샷이 비어 있으면 기존 히스토리로 재구성
+        try:
+            if StockLatest.query.first() is None:
+                StockService.rebuild_stock_latest()
+                app.logger.info("✅ 최신 시세 스냅샷 재구성 완료")
+
+        except Exception as e:
+            app.logger.error(f"❌ 최신 시세 스냅샷 재구성 실패: {e}")
+
+        # 종목 검색 메모리 인덱스 (이후 종목/시세 동기화 때마다 재구성)
+        if StockService.refresh_search_index():
+            app.logger.info("✅ 종목 검색 인덱스 생성 완료")
+
         # KIS Token
         try:
             kis_access_token()  # 앱 시작 시 토큰 발급
@@ -100,11 +141,11 @@ def create_app():
         except Exception as e:
             app.logger.error(f"❌ 앱 시작 시 주식 종목 데이터 동기화 실패: {e}")
 
-        # WebSocket 서비스 시작 (앱 시작 후 3초 지연)
+        # WebSocket 서비스 시작 (앱 시작 후 3초 지연, 워커가 여럿이면 리더로 선출된 워커만 KIS에 연결)
         try:
             def delayed_websocket_start():
                 time.sleep(3)  # 앱 완전 시작 후 3초 대기
-                start_websocket_service(app)
+                start_realtime_ingest(app)
             
             ws_thread = threading.Thread(target=delayed_websocket_start)
             ws_thread.daemon = True
@@ -132,6 +173,23 @@ def init_db(app):
 def init_redis(app):
     redis_config.init_redis(app)
 
+# 모든 gunicorn 워커가 같은 스케줄러를 띄우므로, 한 번만 돌아야 하는 작업은 Redis 키를 먼저 잡은 워커만 실행
+SCHEDULED_RUN_TTL = 3600  # 실행 표시 유지 시간 (초), 같은 트리거에서 워커 간 시차보다 길고 다음 실행 주기보다 짧게
+
+def claim_scheduled_run(app, job_id, ttl=SCHEDULED_RUN_TTL):
+    """이번 실행을 이 워커가 맡으면 True (Redis를 쓸 수 없으면 워커마다 실행)"""
+    try:
+        redis_client = get_redis()
+        if redis_client is None:
+            return True
+        claimed = redis_client.set(f"scheduler:{job_id}", os.getpid(), nx=True, ex=ttl)
+        if not claimed:
+            app.logger.info(f"⏭️ 다른 워커가 실행 중인 작업 건너뜀: {job_id}")
+        return bool(claimed)
+    except Exception as e:
+        app.logger.warning(f"⚠️ 스케줄 작업 실행 표시 실패, 이 워커에서 실행: {job_id} ({e})")
+        return True
+
 def refresh_kis_token(app):
     with app.app_context():
         try:
@@ -141,6 +199,8 @@ def refresh_kis_token(app):
             app.logger.error(f"❌ KIS Token 갱신 실패: {e}")
 
 def update_stock_basic_info(app):
+    if not claim_scheduled_run(app, 'update_basic_info'):
+        return
     with app.app_context():
         try:
             StockService.all_stocks()
@@ -149,6 +209,8 @@ def update_stock_basic_info(app):
             app.logger.error(f"❌ 주식 종목 데이터 동기화 실패: {e}")
 
 def save_daily_stock_history(app):
+    if not claim_scheduled_run(app, 'save_daily_history'):
+        return
     with app.app_context():
         try:
             StockService.update_stock_info_and_history()
@@ -157,6 +219,8 @@ def save_daily_stock_history(app):
             app.logger.error(f"❌ 일별 OHLCV 히스토리 저장 실패: {e}")
 
 def update_daily_rankings(app):
+    if not claim_scheduled_run(app, 'update_daily_rankings'):
+        return
     with app.app_context():
         try:
             result = RankingService.calculate_and_update_rankings()
@@ -167,6 +231,30 @@ def update_daily_rankings(app):
         except Exception as e:
             app.logger.error(f"❌ 일별 투자 랭킹 업데이트 실패: {e}")
 
+def maintain_history_partitions(app):
+    if not claim_scheduled_run(app, 'maintain_history_partitions'):
+        return
+    with app.app_context():
+        try:
+            # 모든 워커의 스케줄러가 같은 시각에 실행하므로 잠금 안에서 (뒤 워커는 이미 처리된 상태를 확인)
+            with schema_lock():
+                if STOCK_HISTORY_PARTITIONING:
+                    PartitionService.ensure_future_partitions()
+                PartitionService.archive_old_histories()
+            app.logger.info("✅ 주가 히스토리 파티션 관리 및 보관 처리 완료")
+        except Exception as e:
+            app.logger.error(f"❌ 주가 히스토리 파티션 관리 실패: {e}")
+
+def purge_minute_bars(app):
+    if not claim_scheduled_run(app, 'purge_minute_bars'):
+        return
+    with app.app_context():
+        try:
+            MinuteBarService.purge_old_bars()
+            app.logger.info("✅ 보관 기간이 지난 분봉 정리 완료")
+        except Exception as e:
+            app.logger.error(f"❌ 분봉 정리 실패: {e}")
+
 # WebSocket 실시간 시세 서비스 시작
 def start_websocket_service(app):
     with app.app_context():
@@ -196,6 +284,15 @@ def start_websocket_service(app):
         except Exception as e:
             app.logger.error(f"❌ WebSocket 서비스 시작 실패: {e}")
 
+# 실시간 시세 수집 시작 (Redis 리더 선출 후 리더만 KIS 웹소켓 연결, 나머지는 pub/sub 구독)
+def start_realtime_ingest(app):
+    websocket_service = get_websocket_service(app)
+    if websocket_service.relay:
+        websocket_service.relay.start(lambda: start_websocket_service(app))
+        app.logger.info(f"✅ 실시간 시세 중계 시작: {websocket_service.relay.node_id}")
+    else:
+        start_websocket_service(app)
+
 # WebSocket 토큰 갱신
 def refresh_websocket_token(app):
     with app.app_context():
@@ -205,11 +302,21 @@ def refresh_websocket_token(app):
         except Exception as e:
             app.logger.error(f"❌ 스케줄러 WebSocket 토큰 갱신 실패: {e}")
 
+# 실시간 분봉 마감/반영 (체결이 끊긴 종목과 장 마감 후 마지막 봉)
+def flush_live_candles(app):
+    try:
+        websocket_service = get_websocket_service(app)
+        websocket_service.flush_live_candles(force=True)
+    except Exception as e:
+        app.logger.error(f"❌ 실시간 분봉 반영 실패: {e}")
+
 # 앱 종료 시 웹소켓 연결 해제
 def cleanup_websocket():
     try:
         websocket_service = get_websocket_service(None)
         if websocket_service:
+            if websocket_service.relay:
+                websocket_service.relay.stop()  # 리더 키를 바로 놓아 다른 워커가 이어받게 함
             websocket_service.disconnect()
         print("✅ WebSocket 정리 완료")
     except Exception as e:
@@ -266,11 +373,38 @@ def setup_scheduler(app):
         replace_existing=True
     )
     
+    # 매월 1일 오전 3시 - 히스토리 파티션 생성 및 오래된 이력 보관 (한국 시간)
+    scheduler.add_job(
+        func=lambda: maintain_history_partitions(app),
+        trigger=CronTrigger(day=1, hour=3, minute=0, timezone='Asia/Seoul'),
+        id='maintain_history_partitions',
+        name='Maintain Stock History Partitions',
+        replace_existing=True
+    )
+    
+    # 평일 장중 30초마다 - 실시간 분봉 마감 및 반영 (한국 시간)
+    scheduler.add_job(
+        func=lambda: flush_live_candles(app),
+        trigger=CronTrigger(day_of_week='mon-fri', hour='9-15', second='*/30', timezone='Asia/Seoul'),
+        id='flush_live_candles',
+        name='Flush Live Intraday Candles',
+        replace_existing=True
+    )
+
+    # 매일 오전 6시 - 보관 기간이 지난 분봉 정리 (한국 시간)
+    scheduler.add_job(
+        func=lambda: purge_minute_bars(app),
+        trigger=CronTrigger(hour=6, minute=0, timezone='Asia/Seoul'),
+        id='purge_minute_bars',
+        name='Purge Old Minute Bars',
+        replace_existing=True
+    )
+
     # 앱 종료 시 웹소켓 연결 해제, 스케줄러도 종료
     atexit.register(cleanup_websocket)
     atexit.register(lambda: scheduler.shutdown())
 
-def register_blueprints(app):
+def register_blueprints(app, embed_stream=False):
     app.register_blueprint(auth_bp)
     app.register_blueprint(chatbot_bp)
     app.register_blueprint(insight_bp)
@@ -278,7 +412,9 @@ def register_blueprints(app):
     app.register_blueprint(ranking_bp)
     app.register_blueprint(stock_bp)
     app.register_blueprint(bookmark_bp)
+    if embed_stream:
+        app.register_blueprint(stream_bp)
 
 if __name__ == '__main__':
-    app = create_app()
+    app = create_app(embed_stream=True)
     app.run(debug=True, port=5001)
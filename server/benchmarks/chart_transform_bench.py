@@ -0,0 +1,124 @@
+"""
+차트 변환 벤치마크 (기존 행 단위 루프 vs NumPy 벡터화)
+
+1년/5년/10년 일봉 길이의 KIS 형식 합성 데이터로
+utils.chart_transform.transform_chart_data와 기존 구현(아래 legacy_transform)의
+호출당 시간을 비교하고, 두 결과가 같은지 먼저 확인한다.
+
+실행 (server 디렉터리에서):
+    python -m benchmarks.chart_transform_bench
+"""
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+
+from utils.chart_transform import transform_chart_data
+
+ITERATIONS = 20
+SERIES_DAYS = {'1y': 250, '5y': 1250, '10y': 2500}
+
+def legacy_transform(kis_output):
+    """KisAPI.transform_chart_data 기존 구현 (이동평균 이중 루프, 행마다 strptime)"""
+    if not kis_output:
+        return {'candleData': [], 'priceRange': {'min': 0, 'max': 0}, 'maxVolume': 0}
+
+    candleData = []
+    sorted_output = sorted(kis_output, key=lambda x: x.get('stck_bsop_date', ''))
+    for i, item in enumerate(sorted_output):
+        close = float(item.get('stck_clpr', 0) or 0)
+        ma5 = close
+        if i >= 4:
+            ma5_values = [candleData[j]['close'] if j < len(candleData) else close for j in range(i - 4, i + 1)]
+            ma5 = sum(ma5_values) / len(ma5_values)
+        ma20 = close
+        if i >= 19:
+            ma20_values = [candleData[j]['close'] if j < len(candleData) else close for j in range(i - 19, i + 1)]
+            ma20 = sum(ma20_values) / len(ma20_values)
+
+        date_obj = datetime.strptime(item.get('stck_bsop_date'), '%Y%m%d')
+        candleData.append({
+            'timestamp': int(date_obj.timestamp() * 1000),
+            'date': date_obj.isoformat(),
+            'open': float(item.get('stck_oprc', 0) or 0),
+            'high': float(item.get('stck_hgpr', 0) or 0),
+            'low': float(item.get('stck_lwpr', 0) or 0),
+            'close': close,
+            'volume': int(item.get('acml_vol', 0) or 0),
+            'ma5': ma5,
+            'ma20': ma20,
+            'changeAmount': int(item.get('prdy_vrss', 0) or 0),
+            'changeRate': float(item.get('prdy_ctrt', 0) or 0),
+            'isUp': item.get('prdy_vrss_sign') in ['1', '2']
+        })
+
+    all_prices = []
+    for d in candleData:
+        all_prices.extend([d['high'], d['low']])
+    return {
+        'candleData': candleData,
+        'priceRange': {'min': min(all_prices) * 0.98, 'max': max(all_prices) * 1.02},
+        'maxVolume': max([d['volume'] for d in candleData])
+    }
+
+def make_kis_output(days):
+    """KIS 기간별시세 output 형식 (최신순, 문자열 값)"""
+    rows = []
+    day = datetime(2015, 1, 2)
+    close = 50000
+    while len(rows) < days:
+        if day.weekday() < 5:
+            previous = close
+            close = max(1000, int(close * random.uniform(0.97, 1.03)))
+            change = close - previous
+            rows.append({
+                'stck_bsop_date': day.strftime('%Y%m%d'),
+                'stck_oprc': str(int(previous * random.uniform(0.99, 1.01))),
+                'stck_hgpr': str(int(close * 1.02)),
+                'stck_lwpr': str(int(close * 0.98)),
+                'stck_clpr': str(close),
+                'acml_vol': str(random.randrange(10 ** 5, 10 ** 8)),
+                'prdy_vrss': str(change),
+                'prdy_ctrt': f"{change / previous * 100:.2f}",
+                'prdy_vrss_sign': '2' if change > 0 else '5' if change < 0 else '3'
+            })
+        day += timedelta(days=1)
+    rows.reverse()
+    return rows
+
+def assert_same(before, after):
+    assert before['maxVolume'] == after['maxVolume']
+    assert before['priceRange'] == after['priceRange']
+    assert len(before['candleData']) == len(after['candleData'])
+    for old, new in zip(before['candleData'], after['candleData']):
+        for key, value in old.items():
+            if isinstance(value, float):
+                assert math.isclose(value, new[key], rel_tol=1e-9), (key, value, new[key])
+            else:
+                assert value == new[key], (key, value, new[key])
+
+def measure(func, *args):
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        func(*args)
+    return (time.perf_counter() - started) / ITERATIONS * 1000
+
+def main():
+    random.seed(7)
+    app = Flask(__name__)
+
+    with app.app_context():
+        print(f"{'series':<7} {'bars':>6} {'legacy ms':>10} {'numpy ms':>9} {'speedup':>8} {'+ma60/120 ms':>13}")
+        for name, days in SERIES_DAYS.items():
+            kis_output = make_kis_output(days)
+            assert_same(legacy_transform(kis_output), transform_chart_data(kis_output))
+
+            legacy_ms = measure(legacy_transform, kis_output)
+            numpy_ms = measure(transform_chart_data, kis_output)
+            extra_ms = measure(transform_chart_data, kis_output, (60, 120))
+            print(f"{name:<7} {days:>6} {legacy_ms:>10.2f} {numpy_ms:>9.2f} {legacy_ms / numpy_ms:>7.1f}x {extra_ms:>13.2f}")
+
+if __name__ == '__main__':
+    main()
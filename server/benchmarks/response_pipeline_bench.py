@@ -0,0 +1,120 @@
+"""
+응답 파이프라인 벤치마크 (Flask 기본 JSON vs orjson + 압축)
+
+거래대금 순위(28/100개)와 일봉 차트(1년/5년) 응답 형태의 합성 데이터를
+Flask 테스트 클라이언트로 요청해 응답 바이트 수와 요청당 CPU 시간을 비교한다.
+
+실행 (server 디렉터리에서):
+    python -m benchmarks.response_pipeline_bench
+"""
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify
+
+from config.response import setup_response_pipeline
+from utils.quote_serializer import RANKING_FIELDS
+
+ITERATIONS = 200
+
+def make_ranking(count):
+    rows = []
+    for i in range(count):
+        price = round(random.uniform(1000, 900000), 2)
+        row = {}
+        for field in RANKING_FIELDS:
+            if field in ('stock_code',):
+                row[field] = f"{random.randrange(1000000):06d}"
+            elif field in ('stock_name', 'market', 'sector', 'sector_detail'):
+                row[field] = f"{field}-{i}"
+            elif field == 'company_info':
+                row[field] = "반도체 메모리와 시스템 반도체를 생산하는 기업입니다. " * 6
+            elif field in ('shares_outstanding', 'daily_volume', 'market_cap', 'trading_value'):
+                row[field] = random.randrange(10 ** 6, 10 ** 12)
+            else:
+                row[field] = round(price * random.uniform(0.9, 1.1), 2)
+        rows.append(row)
+    return {'success': True, 'data': rows, 'count': len(rows)}
+
+def make_chart(days):
+    start = datetime(2020, 1, 1)
+    candles = []
+    close = 50000.0
+    for i in range(days):
+        day = start + timedelta(days=i)
+        close = max(1000.0, close * random.uniform(0.97, 1.03))
+        candles.append({
+            'timestamp': int(day.timestamp() * 1000),
+            'date': day.isoformat(),
+            'open': round(close * random.uniform(0.98, 1.02), 2),
+            'high': round(close * 1.03, 2),
+            'low': round(close * 0.97, 2),
+            'close': round(close, 2),
+            'volume': random.randrange(10 ** 5, 10 ** 8),
+            'ma5': close * 1.001,
+            'ma20': close * 0.999,
+            'changeAmount': random.randrange(-3000, 3000),
+            'changeRate': round(random.uniform(-5, 5), 2),
+            'isUp': random.random() > 0.5
+        })
+    return {
+        'success': True,
+        'data': {
+            'candleData': candles,
+            'priceRange': {'min': min(c['low'] for c in candles), 'max': max(c['high'] for c in candles)},
+            'maxVolume': max(c['volume'] for c in candles)
+        }
+    }
+
+PAYLOADS = {
+    'ranking_28': make_ranking(28),
+    'ranking_100': make_ranking(100),
+    'chart_1y': make_chart(250),
+    'chart_5y': make_chart(1250),
+}
+
+def build_app(pipeline):
+    app = Flask(__name__)
+    if pipeline:
+        setup_response_pipeline(app)
+
+    for name, payload in PAYLOADS.items():
+        app.add_url_rule(f'/{name}', name, (lambda p=payload: jsonify(p)))
+    return app
+
+def measure(app, path, headers):
+    client = app.test_client()
+    size = len(client.get(path, headers=headers).data)
+
+    started = time.process_time()
+    for _ in range(ITERATIONS):
+        client.get(path, headers=headers)
+    cpu_ms = (time.process_time() - started) / ITERATIONS * 1000
+    return size, cpu_ms
+
+def main():
+    random.seed(7)
+    baseline = build_app(pipeline=False)
+    pipeline = build_app(pipeline=True)
+    baseline.logger.disabled = pipeline.logger.disabled = True
+
+    print(f"{'endpoint':<12} {'before bytes':>13} {'before ms':>10} {'after bytes':>12} {'after ms':>9} {'bytes':>7}")
+    for name in PAYLOADS:
+        before_size, before_ms = measure(baseline, f'/{name}', {'Accept-Encoding': 'gzip, br'})
+        after_size, after_ms = measure(pipeline, f'/{name}', {'Accept-Encoding': 'gzip, br'})
+        print(
+            f"{name:<12} {before_size:>13,} {before_ms:>10.3f} {after_size:>12,} {after_ms:>9.3f} "
+            f"{after_size / before_size:>6.1%}"
+        )
+
+    # 압축 없이 직렬화만 비교 (Accept-Encoding 없음)
+    print()
+    print(f"{'serialize only':<14} {'stdlib ms':>10} {'orjson ms':>10}")
+    for name in PAYLOADS:
+        _, before_ms = measure(baseline, f'/{name}', {})
+        _, after_ms = measure(pipeline, f'/{name}', {})
+        print(f"{name:<14} {before_ms:>10.3f} {after_ms:>10.3f}")
+
+if __name__ == '__main__':
+    main()
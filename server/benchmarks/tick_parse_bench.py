@@ -0,0 +1,105 @@
+"""
+실시간 체결 프레임 파싱 벤치마크 (단일 코어 초당 처리 체결 수)
+
+KIS H0STCNT0 형식의 합성 프레임(프레임당 1/5/20건)으로
+- legacy: 기존 구현처럼 프레임을 나눠 첫 레코드만 변환 (나머지 체결은 버려짐)
+- parse: utils.kis_tick.parse_ticks로 프레임의 모든 체결 변환
+- parse+candle: 변환 후 LiveCandleBuilder.add_tick까지 (Redis/DB 반영 제외한 수신 경로)
+의 초당 체결 수를 비교한다. 먼저 parse_ticks가 모든 레코드를 올바르게 읽는지 확인한다.
+
+실행 (server 디렉터리에서):
+    python -m benchmarks.tick_parse_bench
+"""
+import random
+import time
+
+from utils.candle_builder import LiveCandleBuilder
+from utils.kis_tick import H0STCNT0_FIELD_COUNT, parse_ticks
+
+FRAMES = 20000
+RECORDS_PER_FRAME = (1, 5, 20)
+STOCK_CODES = [f"{code:06d}" for code in range(5930, 5930 + 28)]
+
+def make_record(stock_code, seconds, price):
+    fields = [''] * H0STCNT0_FIELD_COUNT
+    change = price - 70000
+    fields[0] = stock_code
+    fields[1] = f"{9 + seconds // 3600:02d}{seconds // 60 % 60:02d}{seconds % 60:02d}"
+    fields[2] = str(price)
+    fields[3] = '2' if change >= 0 else '5'
+    fields[4] = str(change)
+    fields[5] = f"{change / 700:.2f}"
+    fields[6] = str(price)
+    fields[7], fields[8], fields[9] = '70000', str(price + 500), str(price - 500)
+    fields[10], fields[11] = str(price + 100), str(price)
+    fields[12] = str(random.randint(1, 500))
+    fields[13] = str(random.randint(1_000_000, 9_000_000))
+    fields[14] = str(random.randint(10**10, 10**12))
+    fields[33] = '20261016'
+    fields[36], fields[37] = str(random.randint(1, 9999)), str(random.randint(1, 9999))
+    for index in range(H0STCNT0_FIELD_COUNT):
+        if not fields[index]:
+            fields[index] = '0'
+    return fields
+
+def make_frames(records_per_frame):
+    frames = []
+    seconds = 0
+    for _ in range(FRAMES):
+        records = []
+        for _ in range(records_per_frame):
+            seconds = (seconds + 1) % (6 * 3600)
+            records.extend(make_record(random.choice(STOCK_CODES), seconds, random.randint(69000, 71000) // 100 * 100))
+        frames.append(f"0|H0STCNT0|{records_per_frame:03d}|{'^'.join(records)}")
+    return frames
+
+def legacy_parse(frame):
+    """기존 process_realtime_data + process_stock_price_data의 변환 부분 (첫 레코드만)"""
+    parts = frame.split('|')
+    fields = parts[3].split('^')
+    return (fields[0], fields[1], float(fields[2]), fields[3], int(fields[4]), float(fields[5]), int(fields[12]))
+
+def parse(frame):
+    parts = frame.split('|', 3)
+    return parse_ticks(parts[3], parts[2])[0]
+
+def check(frames, records_per_frame):
+    for frame in frames[:100]:
+        ticks = parse(frame)
+        fields = frame.split('|', 3)[3].split('^')
+        assert len(ticks) == records_per_frame
+        for index, tick in enumerate(ticks):
+            offset = index * H0STCNT0_FIELD_COUNT
+            assert tick.stock_code == fields[offset]
+            assert tick.price == float(fields[offset + 2])
+            assert tick.volume == int(fields[offset + 12])
+            assert tick.acc_volume == int(fields[offset + 13])
+
+def measure(func, frames, ticks_per_frame):
+    started = time.perf_counter()
+    for frame in frames:
+        func(frame)
+    elapsed = time.perf_counter() - started
+    return len(frames) * ticks_per_frame / elapsed
+
+def main():
+    random.seed(7)
+    print(f"{'records':>7} {'legacy ticks/s':>15} {'parse ticks/s':>14} {'parse+candle ticks/s':>21}")
+    for records_per_frame in RECORDS_PER_FRAME:
+        frames = make_frames(records_per_frame)
+        check(frames, records_per_frame)
+
+        builder = LiveCandleBuilder()
+
+        def parse_and_build(frame):
+            for tick in parse(frame):
+                builder.add_tick(tick.stock_code, tick.trade_time, tick.price, tick.volume, tick.trade_date)
+
+        # legacy는 프레임당 1건만 처리하므로 실제 처리한 체결 수(1) 기준
+        legacy = measure(legacy_parse, frames, 1)
+        parsed = measure(parse, frames, records_per_frame)
+        built = measure(parse_and_build, frames, records_per_frame)
+        print(f"{records_per_frame:>7} {legacy:>15,.0f} {parsed:>14,.0f} {built:>21,.0f}")
+
+if __name__ == '__main__':
+    main()
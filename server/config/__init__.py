@@ -1,4 +1,5 @@
 from .logging import setup_logging
 from .redis import get_redis, redis_config
+from .response import setup_response_pipeline
 
-__all__ = ['setup_logging', 'get_redis', 'redis_config']
\ No newline at end of file
+__all__ = ['setup_logging', 'get_redis', 'redis_config', 'setup_response_pipeline']
\ No newline at end of file
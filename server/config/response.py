@@ -0,0 +1,104 @@
+import gzip
+import os
+from datetime import date
+from decimal import Decimal
+
+import orjson
+from flask.json.provider import JSONProvider
+from werkzeug.http import http_date
+
+try:
+    import brotli  # 선택 의존성: 설치되어 있으면 br 인코딩 협상
+except ImportError:
+    brotli = None
+
+# 이 크기 미만 응답은 압축 이득보다 CPU 비용이 커서 그대로 전송
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", 1024))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", 3))  # 차트처럼 숫자가 많은 본문은 높은 레벨의 이득이 작음
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", 5))
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/html', 'text/plain', 'text/css', 'application/javascript'}
+
+def _json_default(obj):
+    # 기존 Flask 기본 JSON 변환 규칙 유지 (Decimal -> 문자열, 날짜 -> HTTP 날짜)
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, date):
+        return http_date(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+class OrjsonProvider(JSONProvider):
+    """orjson 기반 JSON 직렬화 (jsonify / app.json.dumps)"""
+
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=_json_default, option=self.option).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_json_default, option=self.option)
+        return self._app.response_class(body, mimetype='application/json')
+
+def _choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+def compress_response(response, accept_encodings):
+    """임계값 이상 응답을 br/gzip으로 압축 (스트리밍/이미 인코딩된 응답은 제외)"""
+    if (
+        response.status_code < 200
+        or response.status_code in (204, 304)
+        or response.direct_passthrough
+        or response.is_streamed
+        or 'Content-Encoding' in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    encoding = _choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    data = response.get_data()
+    if len(data) < RESPONSE_COMPRESS_MIN_BYTES:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=RESPONSE_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+
+    # 표현이 바뀌므로 strong ETag는 weak로 낮춤
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+def setup_response_pipeline(app):
+    """앱 전역 응답 처리: orjson 직렬화 + 크기 기준 br/gzip 압축"""
+    from flask import request
+
+    app.json = OrjsonProvider(app)
+
+    @app.after_request
+    def compress(response):
+        return compress_response(response, request.accept_encodings)
+
+    app.logger.info(
+        f"✅ 응답 파이프라인 설정: orjson, 압축 {'br/gzip' if brotli else 'gzip'} "
+        f"({RESPONSE_COMPRESS_MIN_BYTES}바이트 이상)"
+    )
@@ -8,6 +8,7 @@ PROJECT_DIR="/home/tussak/Tussak/server"
 VENV_PATH="$PROJECT_DIR/venv"
 LOG_FILE="$PROJECT_DIR/logs/deploy.log"
 APP_NAME="app:create_app()"
+STREAM_APP_NAME="stream_app:create_stream_app()"  # 실시간 시세 스트림(SSE) 전용 앱
 
 # 로그 디렉토리 생성
 mkdir -p "$PROJECT_DIR/logs"
@@ -73,7 +74,7 @@ fi
 
 # 기존 gunicorn 프로세스 찾기
 log "🔄 기존 Gunicorn 프로세스 종료 중..."
-OLD_PIDS=$(pgrep -f "gunicorn.*tussak")
+OLD_PIDS=$(pgrep -f "gunicorn.*(tussak|stream_app)")
 
 if [ -n "$OLD_PIDS" ]; then
     log "기존 프로세스 발견 (PIDs: $OLD_PIDS)"
@@ -81,7 +82,7 @@ if [ -n "$OLD_PIDS" ]; then
     
     # 프로세스 종료 대기 (최대 10초)
     for i in {1..10}; do
-        if ! pgrep -f "gunicorn.*tussak" > /dev/null; then
+        if ! pgrep -f "gunicorn.*(tussak|stream_app)" > /dev/null; then
             log "✅ 프로세스 정상 종료"
             break
         fi
@@ -89,9 +90,9 @@ if [ -n "$OLD_PIDS" ]; then
     done
     
     # 강제 종료 (혹시 아직 살아있다면)
-    if pgrep -f "gunicorn.*tussak" > /dev/null; then
+    if pgrep -f "gunicorn.*(tussak|stream_app)" > /dev/null; then
         log "⚠️  강제 종료 실행"
-        pgrep -f "gunicorn.*tussak" | xargs kill -KILL 2>/dev/null
+        pgrep -f "gunicorn.*(tussak|stream_app)" | xargs kill -KILL 2>/dev/null
         sleep 2
     fi
 else
@@ -113,12 +114,29 @@ nohup $VENV_PATH/bin/gunicorn \
 NEW_PID=$!
 log "새 프로세스 시작 (PID: $NEW_PID)"
 
+# 실시간 시세 스트림 프로세스 (연결이 수 분간 유지되므로 gevent 워커, 연결당 greenlet 하나)
+# nginx에서 /api/stock/stream 요청을 127.0.0.1:5002로 프록시 (proxy_buffering off)
+log "🚀 실시간 시세 스트림 프로세스 시작..."
+nohup $VENV_PATH/bin/gunicorn \
+    --bind 127.0.0.1:5002 \
+    --workers 1 \
+    --worker-class gevent \
+    --worker-connections 1000 \
+    --timeout 60 \
+    --access-logfile /var/log/tussak-stream-access.log \
+    --error-logfile /var/log/tussak-app-error.log \
+    "$STREAM_APP_NAME" \
+    >> "$LOG_FILE" 2>&1 &
+
+STREAM_PID=$!
+log "스트림 프로세스 시작 (PID: $STREAM_PID)"
+
 # 프로세스 시작 대기
 log "⏳ 서비스 시작 대기 중..."
 sleep 3
 
 # 프로세스 확인
-if ps -p $NEW_PID > /dev/null 2>&1; then
+if ps -p $NEW_PID > /dev/null 2>&1 && ps -p $STREAM_PID > /dev/null 2>&1; then
     log "✅ 서비스가 정상적으로 실행 중입니다"
     
     log ""
@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from sqlalchemy import inspect, text
+from . import db
+
+# db.create_all()은 새 테이블만 만들고 기존 테이블은 변경하지 않으므로
+# 모델에 추가된 컬럼/인덱스를 기존 DB에 보강한다 (앱 시작 시 create_all 직후 호출)
+# gunicorn 워커들이 동시에 시작하므로 schema_lock 안에서 호출해 한 프로세스씩 상태를 확인하고 변경한다.
+
+SCHEMA_LOCK_NAME = 'tussak_schema_upgrade'
+SCHEMA_LOCK_TIMEOUT = 600  # 다른 워커의 변경(대용량 ALTER, 파티셔닝 변환)을 기다리는 최대 시간 (초)
+
+@contextmanager
+def schema_lock(name=SCHEMA_LOCK_NAME, timeout=SCHEMA_LOCK_TIMEOUT):
+    """MySQL GET_LOCK 기반 프로세스 간 잠금 (잠금을 잡은 연결이 끝날 때까지 유지)"""
+    with db.engine.connect() as conn:
+        acquired = conn.execute(text("SELECT GET_LOCK(:name, :timeout)"), {'name': name, 'timeout': timeout}).scalar()
+        if acquired != 1:
+            raise RuntimeError(f"스키마 잠금 획득 실패: {name} ({timeout}초 대기)")
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT RELEASE_LOCK(:name)"), {'name': name})
+
+def _has_column(inspector, table, column):
+    return any(col['name'] == column for col in inspector.get_columns(table))
+
+def _has_index(inspector, table, name):
+    indexes = inspector.get_indexes(table) + inspector.get_unique_constraints(table)
+    return any(index['name'] == name for index in indexes)
+
+def upgrade_schema(app):
+    """누락된 컬럼/인덱스 보강 (schema_lock 안에서 호출, 잠금을 잡은 뒤의 상태로 다시 확인)"""
+    inspector = inspect(db.engine)
+
+    with db.engine.begin() as conn:
+        # stocks.is_active: 상장폐지 종목 표시
+        if not _has_column(inspector, 'stocks', 'is_active'):
+            conn.execute(text("ALTER TABLE stocks ADD COLUMN is_active BOOLEAN NOT NULL DEFAULT 1"))
+            app.logger.info("✅ stocks.is_active 컬럼 추가")
+
+        # stock_histories.trade_date: 기존 행은 updated_at 날짜로 채우고 (stock_id, trade_date) 유니크 키 생성
+        if not _has_column(inspector, 'stock_histories', 'trade_date'):
+            conn.execute(text("ALTER TABLE stock_histories ADD COLUMN trade_date DATE NULL AFTER stock_id"))
+            conn.execute(text("UPDATE stock_histories SET trade_date = DATE(updated_at) WHERE trade_date IS NULL"))
+            # 같은 날짜 중복 행은 가장 최근 행만 남김
+            conn.execute(text("""
+                DELETE h1 FROM stock_histories h1
+                JOIN stock_histories h2
+                  ON h1.stock_id = h2.stock_id AND h1.trade_date = h2.trade_date AND h1.id < h2.id
+            """))
+            conn.execute(text("ALTER TABLE stock_histories MODIFY trade_date DATE NOT NULL"))
+            app.logger.info("✅ stock_histories.trade_date 컬럼 추가")
+
+        if not _has_index(inspector, 'stock_histories', 'uq_stock_histories_stock_date'):
+            conn.execute(text(
+                "ALTER TABLE stock_histories ADD UNIQUE KEY uq_stock_histories_stock_date (stock_id, trade_date)"
+            ))
+            app.logger.info("✅ stock_histories (stock_id, trade_date) 유니크 키 추가")
+
+        # stock_histories 조회용 인덱스
+        if not _has_index(inspector, 'stock_histories', 'ix_stock_histories_stock_updated'):
+            conn.execute(text(
+                "ALTER TABLE stock_histories ADD INDEX ix_stock_histories_stock_updated (stock_id, updated_at)"
+            ))
+            app.logger.info("✅ stock_histories (stock_id, updated_at) 인덱스 추가")
+
+        if not _has_index(inspector, 'stock_histories', 'ix_stock_histories_trade_date'):
+            conn.execute(text(
+                "ALTER TABLE stock_histories ADD INDEX ix_stock_histories_trade_date (trade_date)"
+            ))
+            app.logger.info("✅ stock_histories (trade_date) 인덱스 추가")
+
+        # 거래대금 컬럼: 기록 시점에 계산해 저장 (stock_latest는 순위 조회용 인덱스 포함)
+        for table in ('stock_latest', 'stock_histories'):
+            if not _has_column(inspector, table, 'trading_value'):
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN trading_value BIGINT NULL AFTER market_cap"))
+                conn.execute(text(
+                    f"UPDATE {table} SET trading_value = CAST(current_price * daily_volume AS SIGNED) "
+                    f"WHERE current_price IS NOT NULL AND daily_volume IS NOT NULL"
+                ))
+                app.logger.info(f"✅ {table}.trading_value 컬럼 추가")
+
+        if not _has_index(inspector, 'stock_latest', 'ix_stock_latest_trading_value'):
+            conn.execute(text("ALTER TABLE stock_latest ADD INDEX ix_stock_latest_trading_value (trading_value)"))
+            app.logger.info("✅ stock_latest (trading_value) 인덱스 추가")
+
+        # stocks.candles_backfilled_at: 일봉 저장소(stock_candles) 최초 적재 여부
+        if not _has_column(inspector, 'stocks', 'candles_backfilled_at'):
+            conn.execute(text("ALTER TABLE stocks ADD COLUMN candles_backfilled_at TIMESTAMP NULL"))
+            app.logger.info("✅ stocks.candles_backfilled_at 컬럼 추가")
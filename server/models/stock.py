@@ -13,6 +13,8 @@ class Stock(db.Model):
     sector_detail = db.Column(db.String(50))  # 산업군 상세
     company_info = db.Column(db.Text)  # 기업개요
     shares_outstanding = db.Column(db.BigInteger)  # 발행주식수 -> 가끔 변할 수 있으나 대부분 변하지 않음
+    is_active = db.Column(db.Boolean, nullable=False, default=True, server_default=db.true())  # 상장폐지 시 False
+    candles_backfilled_at = db.Column(db.TIMESTAMP, nullable=True)  # 일봉 저장소 최초 적재 시각 (None이면 미적재)
 
     updated_at = db.Column(db.TIMESTAMP, default=datetime.now())
     
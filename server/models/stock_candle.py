@@ -0,0 +1,25 @@
+from . import db
+from datetime import datetime
+
+# 종목별 일봉 저장소 (차트 조회용)
+# 최초 조회 시 KIS 일봉으로 한 번 채우고, 이후 일별 동기화가 당일 봉을 추가한다.
+# 주/월/년봉은 이 일봉을 로컬에서 집계한다.
+class StockCandle(db.Model):
+    __tablename__ = 'stock_candles'
+    __table_args__ = (
+        db.UniqueConstraint('stock_id', 'trade_date', name='uq_stock_candles_stock_date'),  # 종목당 하루 1봉, 기간 조회 인덱스 겸용
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
+    trade_date = db.Column(db.Date, nullable=False)  # 거래일
+
+    open_price = db.Column(db.DECIMAL(10, 2))   # 시가
+    high_price = db.Column(db.DECIMAL(10, 2))   # 고가
+    low_price = db.Column(db.DECIMAL(10, 2))    # 저가
+    close_price = db.Column(db.DECIMAL(10, 2))  # 종가
+
+    volume = db.Column(db.BigInteger)          # 거래량
+    trading_value = db.Column(db.BigInteger)   # 거래대금
+
+    updated_at = db.Column(db.TIMESTAMP, default=datetime.now)
@@ -4,9 +4,15 @@ from decimal import Decimal
 
 class StockHistory(db.Model):
     __tablename__ = 'stock_histories'
+    __table_args__ = (
+        db.UniqueConstraint('stock_id', 'trade_date', name='uq_stock_histories_stock_date'),  # 종목당 하루 1행
+        db.Index('ix_stock_histories_stock_updated', 'stock_id', 'updated_at'),  # 종목별 최신 이력 조회
+        db.Index('ix_stock_histories_trade_date', 'trade_date'),                 # 날짜 범위 조회/보관 처리
+    )
     
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
+    trade_date = db.Column(db.Date, nullable=False)  # 거래일
 
     current_price = db.Column(db.DECIMAL(10, 2))   # 현재가
     previous_close = db.Column(db.DECIMAL(10, 2))  # 전일종가
@@ -19,6 +25,7 @@ class StockHistory(db.Model):
     
     daily_volume = db.Column(db.BigInteger)        # 일거래량
     market_cap = db.Column(db.BigInteger)          # 시가총액 (현재가 × 발행주식수)
+    trading_value = db.Column(db.BigInteger)       # 거래대금 (현재가 × 거래량)
     
     week52_high = db.Column(db.DECIMAL(10, 2))     # 52주 최고가
     week52_low = db.Column(db.DECIMAL(10, 2))      # 52주 최저가
@@ -0,0 +1,33 @@
+from . import db
+from datetime import datetime
+
+# 종목별 최신 시세 스냅샷 (종목당 1행)
+# stock_histories 전체에서 max(updated_at)를 찾는 대신 이 테이블과 바로 조인
+class StockLatest(db.Model):
+    __tablename__ = 'stock_latest'
+    __table_args__ = (
+        db.Index('ix_stock_latest_trading_value', 'trading_value'),  # 거래대금 순위 인덱스 범위 조회
+    )
+
+    stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id', ondelete='CASCADE'), primary_key=True)
+
+    current_price = db.Column(db.DECIMAL(10, 2))   # 현재가
+    previous_close = db.Column(db.DECIMAL(10, 2))  # 전일종가
+    change_rate = db.Column(db.DECIMAL(5, 2))      # 등락률
+    change_amount = db.Column(db.DECIMAL(10, 2))   # 등락금액
+
+    day_open = db.Column(db.DECIMAL(10, 2))   # 당일 시가
+    day_high = db.Column(db.DECIMAL(10, 2))   # 당일 고가
+    day_low = db.Column(db.DECIMAL(10, 2))    # 당일 저가
+
+    daily_volume = db.Column(db.BigInteger)        # 일거래량
+    market_cap = db.Column(db.BigInteger)          # 시가총액
+    trading_value = db.Column(db.BigInteger)       # 거래대금 (현재가 × 거래량, 기록 시 계산)
+
+    week52_high = db.Column(db.DECIMAL(10, 2))     # 52주 최고가
+    week52_low = db.Column(db.DECIMAL(10, 2))      # 52주 최저가
+
+    per = db.Column(db.DECIMAL(8, 2))
+    pbr = db.Column(db.DECIMAL(8, 2))
+
+    updated_at = db.Column(db.TIMESTAMP, default=datetime.now)
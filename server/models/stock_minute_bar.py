@@ -0,0 +1,25 @@
+from . import db
+from datetime import datetime
+
+# 종목별 1분봉 저장소 (분/시간봉 차트용)
+# 차트 조회 시 마지막 저장 분봉 이후만 KIS에서 가져와 추가하고,
+# 5분/15분/1시간봉은 이 1분봉을 로컬에서 집계한다. 보관 기간이 지난 분봉은 매일 삭제.
+class StockMinuteBar(db.Model):
+    __tablename__ = 'stock_minute_bars'
+    __table_args__ = (
+        db.UniqueConstraint('stock_id', 'bar_time', name='uq_stock_minute_bars_stock_time'),  # 종목당 1분 1봉, 기간 조회 인덱스 겸용
+        db.Index('ix_stock_minute_bars_bar_time', 'bar_time'),  # 보관 기간 정리용
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    stock_id = db.Column(db.Integer, db.ForeignKey('stocks.id', ondelete='CASCADE'), nullable=False)
+    bar_time = db.Column(db.DateTime, nullable=False)  # 분봉 시각 (KIS 체결시간 기준, 초 제외)
+
+    open_price = db.Column(db.DECIMAL(10, 2))   # 시가
+    high_price = db.Column(db.DECIMAL(10, 2))   # 고가
+    low_price = db.Column(db.DECIMAL(10, 2))    # 저가
+    close_price = db.Column(db.DECIMAL(10, 2))  # 종가
+
+    volume = db.Column(db.BigInteger)  # 체결거래량
+
+    updated_at = db.Column(db.TIMESTAMP, default=datetime.now)
@@ -1,11 +1,24 @@
 from flask import Blueprint, jsonify, current_app, request
 from services.keyword_sevice import KeywordService
-from services.news_service import NewsService
+from services.news_service import NewsService, DEFAULT_NEWS_CACHE_KEY
+from utils.http_cache import conditional_get, cache_entry_tag
 
 insight_bp = Blueprint('insight', __name__, url_prefix='/api/insight')
 
+# 조건부 GET 태그: 응답을 만드는 캐시 항목 (캐시가 없으면 새로 조회하므로 미적용)
+def _keywords_tag():
+    return cache_entry_tag('keywords')
+
+def _news_tag():
+    keyword = request.args.get('keyword', '').strip()
+    if not keyword:
+        return cache_entry_tag(DEFAULT_NEWS_CACHE_KEY)
+    display = min(request.args.get('display', 5, type=int), 10)
+    return cache_entry_tag(NewsService.keyword_news_cache_key(keyword, display))
+
 # 키워드 관련 ===================================================
 @insight_bp.route('/keywords')
+@conditional_get(_keywords_tag)
 def get_keywords():
     try:
         keywords = KeywordService.get_keywords()
@@ -48,13 +61,14 @@ def refresh_keywords():
 
 # 뉴스 관련 ===================================================
 @insight_bp.route('/news', methods=['GET', 'OPTIONS'])
+@conditional_get(_news_tag)
 def get_news():
     # Preflight 대응
     if request.method == 'OPTIONS':
         return '', 204
     try:
         keyword = request.args.get('keyword', '').strip()
-        display = min(int(request.args.get('display', 5)), 10)
+        display = min(request.args.get('display', 5, type=int), 10)
         
         if keyword:
             news_data = NewsService.get_keyword_news(keyword, display)
@@ -91,7 +105,7 @@ def refresh_news():
         else:
             # 기본 뉴스 갱신
             from services.cache_service import CacheService
-            CacheService.delete("default_news")
+            CacheService.delete(DEFAULT_NEWS_CACHE_KEY)
             news_data = NewsService.get_default_news()
             message = '기본 뉴스 갱신 성공'
         
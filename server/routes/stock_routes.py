@@ -1,20 +1,64 @@
 from flask import Blueprint, request, jsonify, current_app
-from services.stock_service import StockService
-from services.websocket_service import get_websocket_service
+from services.stock_service import StockService, SNAPSHOT_VERSION, MASTER_VERSION
+from services.websocket_service import get_websocket_service, REALTIME_VERSION
+from services.candle_service import CandleService, CANDLE_VERSION, CHART_DEFAULT_BARS, CHART_MAX_BARS, PERIOD_DAYS
+from services.indicator_service import IndicatorService, INDICATOR_DEFAULT_POINTS, INDICATOR_MAX_POINTS
+from services.minute_bar_service import MinuteBarService, INTRADAY_TIMEFRAMES, INTRADAY_MAX_DAYS
 from utils.kis_api import KisAPI
+from utils.chart_transform import parse_ma_windows
+from utils.indicators import parse_indicator
+from utils.quote_serializer import parse_fields, STOCK_DETAIL_FIELDS, RANKING_FIELDS, STOCK_MASTER_FIELDS
+from utils.http_cache import conditional_get, versions_tag
 
 stock_bp = Blueprint('stock', __name__, url_prefix='/api/stock')
 
+# 조건부 GET 태그: 응답이 의존하는 데이터 버전
+def _quote_tag(*args, **kwargs):
+    return versions_tag(MASTER_VERSION, SNAPSHOT_VERSION)
+
+def _ranking_tag(*args, **kwargs):
+    return versions_tag(SNAPSHOT_VERSION)
+
+def _realtime_tag(*args, **kwargs):
+    return versions_tag(SNAPSHOT_VERSION, REALTIME_VERSION)
+
+def _candle_tag(*args, **kwargs):
+    return versions_tag(CANDLE_VERSION)
+
 @stock_bp.route('/all')
 def get_all_stocks():
-    """모든 종목 조회"""
+    """
+    모든 종목 조회
+    ?fields=stock_code,stock_name  응답 필드 선택
+    ?limit=500&cursor=<next_cursor>  커서 페이지네이션 (limit 없으면 전체)
+    마스터 버전 기반 ETag로 If-None-Match 재검증 시 304 응답
+    """
     try:
-        stocks = StockService.get_all_stocks()
+        fields = parse_fields(request.args.get('fields'), STOCK_MASTER_FIELDS, STOCK_MASTER_FIELDS)
+        cursor = request.args.get('cursor', type=int)
+        limit = request.args.get('limit', type=int)
+
+        payload = StockService.get_all_stocks_payload(fields, cursor, limit)
+
+        # 같은 JSON을 gzip/비압축 두 가지로 내보내므로 weak ETag
+        if request.if_none_match.contains_weak(payload['etag']):
+            response = current_app.response_class(status=304)
+        elif 'gzip' in request.accept_encodings:
+            response = current_app.response_class(payload['gzip_body'], mimetype='application/json')
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = current_app.response_class(payload['body'], mimetype='application/json')
+
+        response.set_etag(payload['etag'], weak=True)
+        response.headers['Cache-Control'] = 'no-cache'  # 매번 ETag로 재검증
+        response.vary.add('Accept-Encoding')
+        return response
+
+    except ValueError as e:
         return jsonify({
-            'success': True,
-            'data': stocks,
-            'count': len(stocks)
-        }), 200
+            'success': False,
+            'message': str(e)
+        }), 400
         
     except Exception as e:
         current_app.logger.error(f"종목 조회 API 오류: {e}")
@@ -24,6 +68,7 @@ def get_all_stocks():
         }), 500
 
 @stock_bp.route('/search')
+@conditional_get(_quote_tag)
 def search_stocks():
     """종목명으로 검색"""
     try:
@@ -35,7 +80,8 @@ def search_stocks():
                 'message': '검색어를 입력해주세요.'
             }), 400
         
-        stocks = StockService.search_stocks(keyword)
+        fields = parse_fields(request.args.get('fields'), STOCK_DETAIL_FIELDS)
+        stocks = StockService.search_stocks(keyword, fields)
         return jsonify({
             'success': True,
             'data': stocks,
@@ -43,6 +89,12 @@ def search_stocks():
             'keyword': keyword
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+        
     except Exception as e:
         current_app.logger.error(f"종목 검색 API 오류: {e}")
         return jsonify({
@@ -50,11 +102,44 @@ def search_stocks():
             'message': f'오류가 발생했습니다: {str(e)}'
         }), 500
 
+@stock_bp.route('/autocomplete')
+@conditional_get(_quote_tag)
+def autocomplete_stocks():
+    """검색창 자동완성 (종목코드/종목명/시장/현재가, 최대 k개)"""
+    try:
+        keyword = request.args.get('q', '').strip()
+        k = request.args.get('k', 10, type=int)
+
+        if not keyword:
+            return jsonify({
+                'success': True,
+                'data': [],
+                'count': 0,
+                'keyword': keyword
+            }), 200
+
+        stocks = StockService.autocomplete_stocks(keyword, k)
+        return jsonify({
+            'success': True,
+            'data': stocks,
+            'count': len(stocks),
+            'keyword': keyword
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"자동완성 API 오류: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'오류가 발생했습니다: {str(e)}'
+        }), 500
+
 @stock_bp.route('/<int:id>')
+@conditional_get(_quote_tag)
 def get_stock_by_id(id):
     """종목 ID로 조회"""
     try:
-        stock = StockService.get_stock_by_id(id)
+        fields = parse_fields(request.args.get('fields'), STOCK_DETAIL_FIELDS)
+        stock = StockService.get_stock_by_id(id, fields)
         
         if not stock:
             return jsonify({
@@ -67,6 +152,12 @@ def get_stock_by_id(id):
             'data': stock
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+        
     except Exception as e:
         current_app.logger.error(f"종목 ID 조회 API 오류: {e}")
         return jsonify({
@@ -76,10 +167,12 @@ def get_stock_by_id(id):
 
 
 @stock_bp.route('/code/<stock_code>')
+@conditional_get(_quote_tag)
 def get_stock_by_code(stock_code):
     """종목 코드로 단일 종목 조회 (stock_code)"""
     try:
-        stock = StockService.get_stock_by_code(stock_code)
+        fields = parse_fields(request.args.get('fields'), STOCK_DETAIL_FIELDS)
+        stock = StockService.get_stock_by_code(stock_code, fields)
 
         if not stock:
             return jsonify({
@@ -91,6 +184,12 @@ def get_stock_by_code(stock_code):
             'success': True,
             'data': stock
         }), 200
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+        
     except Exception as e:
         current_app.logger.error(f"종목 코드 조회 API 오류: {e}")
         return jsonify({
@@ -99,11 +198,13 @@ def get_stock_by_code(stock_code):
         }), 500
 
 @stock_bp.route('/ranking')
+@conditional_get(_ranking_tag)
 def get_stocks_ranking_top28():
     """거래대금 순위 28개 조회"""
     try:
         limit = request.args.get('limit', 28, type=int)
-        stocks = StockService.get_volume_ranking(limit)  # 🆕 조회 전용 함수 사용
+        fields = parse_fields(request.args.get('fields'), RANKING_FIELDS)
+        stocks = StockService.get_volume_ranking(limit, fields)  # 🆕 조회 전용 함수 사용
         
         return jsonify({
             'success': True,
@@ -111,6 +212,12 @@ def get_stocks_ranking_top28():
             'count': len(stocks)
         }), 200
         
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+        
     except Exception as e:
         current_app.logger.error(f"거래대금 순위 조회 API 오류: {e}")
         return jsonify({
@@ -120,6 +227,7 @@ def get_stocks_ranking_top28():
 
 # 실시간 거래대금 순위 (실시간 가격 포함)
 @stock_bp.route('/realtime')
+@conditional_get(_realtime_tag)
 def get_realtime_top28():
     try:
         limit = request.args.get('limit', 28, type=int)
@@ -142,6 +250,7 @@ def get_realtime_top28():
 
 # 실시간 가격 조회
 @stock_bp.route('/realtime/<stock_code>')
+@conditional_get(_realtime_tag)
 def get_realtime_by_stock_code(stock_code):
     try:
         
@@ -276,7 +385,10 @@ def get_realtime_status():
                 'connected': websocket_service.is_connected,
                 'reconnect_attempts': websocket_service.reconnect_attempts,
                 'stock_codes_count': len(websocket_service.stock_codes)
-            }
+            },
+            'redis_writes': websocket_service.realtime_buffer.get_metrics() if websocket_service.realtime_buffer else None,
+            'tick_pipeline': websocket_service.get_pipeline_metrics(),
+            'ingest': websocket_service.relay.get_status() if websocket_service.relay else None
         }
         
         return jsonify({
@@ -457,11 +569,17 @@ def get_realtime_status():
 #         }), 500
 
 @stock_bp.route('/kis-chart/<stock_code>')
+@conditional_get(_candle_tag)
 def get_kis_chart_data(stock_code):
-    """KIS API를 사용한 주식 차트 데이터 조회"""
+    """
+    일/주/월/년봉 차트 데이터 조회 (로컬 일봉 저장소, 최초 조회 종목만 KIS에서 적재)
+    ?period=D|W|M|Y  ?count=100 (최대 1000봉)  ?ma=60,120 (추가 이동평균)
+    """
     try:
         # 요청 파라미터 처리
         period = request.args.get('period', 'D')
+        count = request.args.get('count', CHART_DEFAULT_BARS, type=int)
+        extra_ma_windows = parse_ma_windows(request.args.get('ma'))
 
         # 지원하는 기간 검증
         supported_periods = {
@@ -478,18 +596,34 @@ def get_kis_chart_data(stock_code):
                 'supported_periods': supported_periods
             }), 400
 
+        if count < 1 or count > CHART_MAX_BARS:
+            return jsonify({
+                'success': False,
+                'message': f'count는 1~{CHART_MAX_BARS} 사이여야 합니다.'
+            }), 400
+
         # 종목코드 패딩 (6자리로 맞춤)
         stock_code = stock_code.zfill(6)
 
-        # KIS API 호출
-        kis_api = KisAPI()
-        result = kis_api.fetch_daily_chart_data(stock_code, period)
-
-        if not result['success']:
+        stock = CandleService.get_chart_stock(stock_code)
+        if stock is None:
             return jsonify({
                 'success': False,
-                'message': result['message']
-            }), 500
+                'message': '종목을 찾을 수 없습니다.'
+            }), 404
+
+        if stock.candles_backfilled_at is not None:
+            chart_data = CandleService.get_chart(stock, period, count, extra_ma_windows)
+        else:
+            # 적재가 끝나지 않았으면(다른 워커가 적재 중 등) 기존처럼 KIS 직접 조회
+            result = KisAPI().fetch_daily_chart_data(stock_code, period, extra_ma_windows, count)
+
+            if not result['success']:
+                return jsonify({
+                    'success': False,
+                    'message': result['message']
+                }), 500
+            chart_data = result['data']
 
         return jsonify({
             'success': True,
@@ -497,14 +631,139 @@ def get_kis_chart_data(stock_code):
                 'stock_code': stock_code,
                 'period': period,
                 'period_name': supported_periods[period],
-                'data_count': len(result['data']['candleData']) if result['data'] else 0
+                'data_count': len(chart_data['candleData']) if chart_data else 0
             },
-            'data': result['data']
+            'data': chart_data
         }), 200
 
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+
     except Exception as e:
         current_app.logger.error(f"KIS 차트 데이터 조회 API 오류: {e}")
         return jsonify({
             'success': False,
             'message': f'서버 오류가 발생했습니다: {str(e)}'
         }), 500
+
+@stock_bp.route('/intraday-chart/<stock_code>')
+def get_intraday_chart_data(stock_code):
+    """
+    분/시간봉 차트 데이터 조회 (저장된 1분봉을 집계, 새 분봉만 KIS에서 추가)
+    ?timeframe=1m|5m|15m|1h  ?days=1 (최근 거래일 수, 최대 5)  ?ma=60,120 (추가 이동평균)
+    """
+    try:
+        timeframe = request.args.get('timeframe', '5m')
+        days = request.args.get('days', type=int)
+        extra_ma_windows = parse_ma_windows(request.args.get('ma'))
+
+        if timeframe not in INTRADAY_TIMEFRAMES:
+            return jsonify({
+                'success': False,
+                'message': f'지원하지 않는 차트 타입입니다.',
+                'supported_timeframes': {key: name for key, (name, _) in INTRADAY_TIMEFRAMES.items()}
+            }), 400
+
+        if days is not None and (days < 1 or days > INTRADAY_MAX_DAYS):
+            return jsonify({
+                'success': False,
+                'message': f'days는 1~{INTRADAY_MAX_DAYS} 사이여야 합니다.'
+            }), 400
+
+        stock_code = stock_code.zfill(6)
+
+        chart_data = MinuteBarService.get_chart(stock_code, timeframe, days, extra_ma_windows)
+        if chart_data is None:
+            return jsonify({
+                'success': False,
+                'message': '종목을 찾을 수 없습니다.'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'chart_info': {
+                'stock_code': stock_code,
+                'timeframe': timeframe,
+                'timeframe_name': INTRADAY_TIMEFRAMES[timeframe][0],
+                'days': days or INTRADAY_TIMEFRAMES[timeframe][1],
+                'data_count': len(chart_data['candleData']),
+                'partial': chart_data.pop('partial', False)  # KIS 동기화 실패로 저장된 분봉만 응답
+            },
+            'data': chart_data
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+
+    except Exception as e:
+        current_app.logger.error(f"분봉 차트 데이터 조회 API 오류: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'서버 오류가 발생했습니다: {str(e)}'
+        }), 500
+
+@stock_bp.route('/indicator/<stock_code>/<name>')
+@conditional_get(_candle_tag)
+def get_stock_indicator(stock_code, name):
+    """
+    기술적 지표 조회 (로컬 일봉 저장소 기준)
+    name: ema | rsi | macd | bollinger | vwap
+    ?period=D|W|M|Y  ?count=100 (최대 1000)
+    지표 파라미터: ema/rsi/vwap ?length=  bollinger ?length=&k=  macd ?fast=&slow=&signal=
+    """
+    try:
+        period = request.args.get('period', 'D')
+        count = request.args.get('count', INDICATOR_DEFAULT_POINTS, type=int)
+
+        if period not in PERIOD_DAYS:
+            return jsonify({
+                'success': False,
+                'message': f'지원하지 않는 기간입니다: {period}'
+            }), 400
+
+        if count < 1 or count > INDICATOR_MAX_POINTS:
+            return jsonify({
+                'success': False,
+                'message': f'count는 1~{INDICATOR_MAX_POINTS} 사이여야 합니다.'
+            }), 400
+
+        indicator = parse_indicator(name, request.args)
+        stock_code = stock_code.zfill(6)
+
+        points = IndicatorService.get_indicator(stock_code, indicator, period, count)
+        if points is None:
+            return jsonify({
+                'success': False,
+                'message': '종목을 찾을 수 없습니다.'
+            }), 404
+
+        return jsonify({
+            'success': True,
+            'indicator_info': {
+                'stock_code': stock_code,
+                'name': indicator.name,
+                'params': indicator.params,
+                'period': period,
+                'data_count': len(points)
+            },
+            'data': points
+        }), 200
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+
+    except Exception as e:
+        current_app.logger.error(f"지표 조회 API 오류: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'서버 오류가 발생했습니다: {str(e)}'
+        }), 500
@@ -0,0 +1,84 @@
+import time
+from flask import Blueprint, Response, request, jsonify, current_app
+from services.realtime_relay import get_price_feed
+from utils.price_stream import parse_stream_codes, format_event, PRICE_STREAM_KEEPALIVE, PRICE_STREAM_MAX_SECONDS, PRICE_STREAM_RETRY_MS
+
+# 실시간 시세 스트림은 연결 하나가 최대 PRICE_STREAM_MAX_SECONDS 동안 열려 있으므로
+# API 워커(gthread)가 아닌 스트림 전용 프로세스(stream_app.py, gevent 워커)에 등록한다.
+stream_bp = Blueprint('stream', __name__, url_prefix='/api/stock')
+
+# 실시간 시세 스트림 (Server-Sent Events, 폴링 대신 사용)
+# ?codes=005930,000660 -> 'price' 이벤트로 종목별 시세를 종목당 초당 최대 PRICE_STREAM_MAX_RATE번 전송
+@stream_bp.route('/stream')
+def stream_realtime_prices():
+    try:
+        codes = parse_stream_codes(request.args.get('codes'))
+
+        price_feed = get_price_feed(current_app._get_current_object())
+        broadcaster = price_feed.broadcaster
+
+        client = broadcaster.register(codes)
+        if client is None:
+            return jsonify({
+                'success': False,
+                'message': '실시간 스트림 연결 수가 많습니다. 잠시 후 다시 시도해주세요.'
+            }), 503
+
+        # 아직 체결을 받지 못한 종목은 Redis의 마지막 시세로 초기값 전송
+        initial_codes = [code for code in codes if code not in client.pending]
+
+        def generate():
+            try:
+                yield f"retry: {PRICE_STREAM_RETRY_MS}\n\n"
+                for code in initial_codes:
+                    realtime_data = price_feed.get_latest_price(code)
+                    if realtime_data:
+                        yield format_event(realtime_data)
+
+                # 최대 유지 시간이 지나면 종료 (브라우저 EventSource가 retry 후 재연결)
+                deadline = time.monotonic() + PRICE_STREAM_MAX_SECONDS
+                while time.monotonic() < deadline:
+                    messages = client.next_batch(PRICE_STREAM_KEEPALIVE)
+                    yield ''.join(messages) if messages else ": keepalive\n\n"
+            finally:
+                # 클라이언트가 연결을 끊으면 다음 전송 시 GeneratorExit로 여기 도달
+                broadcaster.unregister(client)
+
+        return Response(generate(), mimetype='text/event-stream', headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # nginx 프록시 버퍼링 해제
+        })
+
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        current_app.logger.error(f"실시간 시세 스트림 API 오류: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'서버 오류가 발생했습니다: {str(e)}'
+        }), 500
+
+# 스트림 프로세스 상태 조회 (연결 수, 전송/병합 수)
+@stream_bp.route('/stream/status')
+def get_stream_status():
+    try:
+        price_feed = get_price_feed(current_app._get_current_object())
+
+        return jsonify({
+            'success': True,
+            'data': {
+                'price_stream': price_feed.broadcaster.get_metrics(),
+                'local_prices': len(price_feed.prices),
+                'received_messages': price_feed.received_messages
+            }
+        }), 200
+
+    except Exception as e:
+        current_app.logger.error(f"실시간 스트림 상태 조회 API 오류: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'오류가 발생했습니다: {str(e)}'
+        }), 500
@@ -1,4 +1,5 @@
 import json
+import hashlib
 from config.redis import get_redis
 
 class CacheService:
@@ -110,4 +111,62 @@ class CacheService:
             return client.ttl(key)
         except Exception as e:
             print(f"TTL 조회 오류 [{key}]: {e}")
-            return -1
\ No newline at end of file
+            return -1
+    
+    # 버전 카운터 조회 (키가 없으면 0)
+    # 캐시 키에 버전을 포함해 두면 버전 증가만으로 관련 캐시 전체가 무효화됨
+    @staticmethod
+    def get_version(name):
+        try:
+            client = get_redis()
+            if not client:
+                return 0
+                
+            version = client.get(f"version:{name}")
+            return int(version) if version else 0
+        except Exception as e:
+            print(f"버전 조회 오류 [{name}]: {e}")
+            return 0
+    
+    # 버전 카운터 증가
+    @staticmethod
+    def bump_version(name):
+        try:
+            client = get_redis()
+            if not client:
+                return None
+                
+            return client.incr(f"version:{name}")
+        except Exception as e:
+            print(f"버전 증가 오류 [{name}]: {e}")
+            return None
+    
+    # 여러 버전 카운터 한 번에 조회 (MGET) -> {이름: 버전}, Redis 사용 불가 시 None
+    @staticmethod
+    def get_versions(names):
+        try:
+            client = get_redis()
+            if not client:
+                return None
+                
+            values = client.mget([f"version:{name}" for name in names])
+            return {name: int(value) if value else 0 for name, value in zip(names, values)}
+        except Exception as e:
+            print(f"버전 조회 오류 [{names}]: {e}")
+            return None
+    
+    # 캐시 값의 지문 (저장된 원문 해시, 키가 없으면 None)
+    @staticmethod
+    def get_fingerprint(key):
+        try:
+            client = get_redis()
+            if not client:
+                return None
+                
+            cached_data = client.get(key)
+            if cached_data is None:
+                return None
+            return hashlib.sha1(cached_data.encode('utf-8')).hexdigest()[:16]
+        except Exception as e:
+            print(f"캐시 지문 조회 오류 [{key}]: {e}")
+            return None
\ No newline at end of file
@@ -0,0 +1,257 @@
+import os
+from datetime import datetime, date, timedelta
+from itertools import groupby
+
+from flask import current_app
+from sqlalchemy.dialects.mysql import insert
+
+from config.redis import get_redis
+from models import db
+from models.stock import Stock
+from models.stock_candle import StockCandle
+from services.cache_service import CacheService
+from utils.kis_api import KisAPI
+from utils.chart_transform import transform_chart_data, BASE_MA_WINDOWS
+
+# 최초 적재 시 가져올 일봉 기간 (년)
+CANDLE_BACKFILL_YEARS = int(os.getenv("CANDLE_BACKFILL_YEARS", 10))
+# KIS 일봉 1회 조회 최대 100개 -> 달력일 기준 약 140일
+KIS_DAILY_PAGE_DAYS = 140
+CANDLE_BACKFILL_MAX_EMPTY_PAGES = 3  # 연속으로 빈 구간이 이만큼 나오면 상장 이전으로 보고 중단 (거래정지 구간은 건너뜀)
+CANDLE_BACKFILL_LOCK_TTL = 120  # 같은 종목 동시 적재 방지 (초)
+CANDLE_WRITE_CHUNK_SIZE = 1000
+
+CHART_DEFAULT_BARS = 100
+CHART_MAX_BARS = 1000
+
+# 일봉 저장소 버전 - 일별 추가 시 증가 (차트 API ETag 기준)
+CANDLE_VERSION = 'stock_candles'
+
+# 주/월/년봉 집계 키와 조회 구간(달력일) 계산
+PERIOD_GROUP_KEYS = {
+    'W': lambda day: day.isocalendar()[:2],
+    'M': lambda day: (day.year, day.month),
+    'Y': lambda day: day.year,
+}
+PERIOD_DAYS = {'D': 1, 'W': 7, 'M': 31, 'Y': 366}
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+class CandleService:
+
+    @staticmethod
+    def get_chart_stock(stock_code):
+        """
+        차트 조회 대상 종목 (일봉 적재 전이면 이 요청에서 적재)
+        다른 워커가 적재 중이면 candles_backfilled_at이 비어 있는 채로 반환 -> 호출자가 KIS 직접 조회
+        return -> Stock, 종목이 없으면 None
+        """
+        try:
+            stock = Stock.query.filter_by(stock_code=stock_code).first()
+            if stock and stock.candles_backfilled_at is None:
+                CandleService.backfill_stock(stock)
+            return stock
+
+        except Exception as e:
+            current_app.logger.error(f"캔들 적재 확인 실패 {stock_code}: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def get_chart(stock, period='D', count=CHART_DEFAULT_BARS, extra_ma_windows=()):
+        """
+        로컬 일봉 저장소로 D/W/M/Y 차트 데이터 생성 (KIS 호출 없음, 적재는 get_chart_stock에서)
+        이동평균 구간만큼 앞선 봉을 더 읽어 첫 봉부터 온전한 이동평균을 계산
+        return -> dict: 차트 데이터
+        """
+        try:
+            warmup = max(BASE_MA_WINDOWS + tuple(extra_ma_windows)) - 1
+            bars = CandleService._load_bars(stock.id, period, count + warmup)
+            rows = CandleService._to_chart_rows(bars, count + warmup)
+            return transform_chart_data(rows, extra_ma_windows, tail=count)
+
+        except Exception as e:
+            current_app.logger.error(f"캔들 차트 조회 실패 {stock.stock_code}: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def backfill_stock(stock):
+        """KIS 일봉을 과거 방향으로 페이지 조회해 CANDLE_BACKFILL_YEARS년치 적재 (종목당 1회)"""
+        redis_client = get_redis()
+        lock_key = f"candle_backfill:{stock.stock_code}"
+        if redis_client and not redis_client.set(lock_key, 1, nx=True, ex=CANDLE_BACKFILL_LOCK_TTL):
+            current_app.logger.info(f"일봉 적재 진행 중: {stock.stock_code}")
+            return 0
+
+        try:
+            kis_api = KisAPI()
+            oldest = date.today() - timedelta(days=365 * CANDLE_BACKFILL_YEARS)
+            end_date = date.today()
+            rows = []
+
+            empty_pages = 0
+
+            while end_date >= oldest:
+                start_date = max(end_date - timedelta(days=KIS_DAILY_PAGE_DAYS), oldest)
+                page = kis_api.fetch_daily_candles(stock.stock_code, start_date, end_date)
+                if not page:
+                    # 거래정지 등으로 빈 구간일 수 있으므로 바로 끝내지 않고 이전 구간 계속 조회
+                    empty_pages += 1
+                    if empty_pages >= CANDLE_BACKFILL_MAX_EMPTY_PAGES:
+                        break  # 상장 이전 구간
+                    end_date = start_date - timedelta(days=1)
+                    continue
+
+                empty_pages = 0
+                rows.extend(CandleService._parse_kis_row(stock.id, item) for item in page)
+                end_date = min(row['trade_date'] for row in rows[-len(page):]) - timedelta(days=1)
+
+            CandleService.upsert_candles(rows)
+            stock.candles_backfilled_at = datetime.now()
+            db.session.commit()
+            CandleService.publish_candles()  # 캐시된 차트 응답(ETag) 무효화
+
+            current_app.logger.info(f"일봉 적재 완료: {stock.stock_code} {len(rows)}개")
+            return len(rows)
+
+        except Exception as e:
+            current_app.logger.error(f"일봉 적재 실패 {stock.stock_code}: {e}")
+            db.session.rollback()
+            raise e
+
+        finally:
+            if redis_client:
+                redis_client.delete(lock_key)
+
+    @staticmethod
+    def _parse_kis_row(stock_id, item):
+        return {
+            'stock_id': stock_id,
+            'trade_date': datetime.strptime(item['stck_bsop_date'], '%Y%m%d').date(),
+            'open_price': _to_float(item.get('stck_oprc')),
+            'high_price': _to_float(item.get('stck_hgpr')),
+            'low_price': _to_float(item.get('stck_lwpr')),
+            'close_price': _to_float(item.get('stck_clpr')),
+            'volume': int(item['acml_vol']) if item.get('acml_vol') else None,
+            'trading_value': int(item['acml_tr_pbmn']) if item.get('acml_tr_pbmn') else None,
+            'updated_at': datetime.now()
+        }
+
+    @staticmethod
+    def upsert_candles(rows):
+        """(stock_id, trade_date) 기준 다중행 UPSERT (커밋은 호출자)"""
+        for i in range(0, len(rows), CANDLE_WRITE_CHUNK_SIZE):
+            chunk = rows[i:i + CANDLE_WRITE_CHUNK_SIZE]
+            stmt = insert(StockCandle).values(chunk)
+            stmt = stmt.on_duplicate_key_update(
+                open_price=stmt.inserted.open_price,
+                high_price=stmt.inserted.high_price,
+                low_price=stmt.inserted.low_price,
+                close_price=stmt.inserted.close_price,
+                volume=stmt.inserted.volume,
+                trading_value=stmt.inserted.trading_value,
+                updated_at=stmt.inserted.updated_at
+            )
+            db.session.execute(stmt)
+
+    @staticmethod
+    def publish_candles():
+        """일봉 추가 알림: 차트 ETag 무효화"""
+        return CacheService.bump_version(CANDLE_VERSION)
+
+    @staticmethod
+    def _load_bars(stock_id, period, count):
+        """
+        period 봉 최대 count개 + 직전 봉 1개(등락 계산용)를 오래된 순으로 반환
+        bar: (trade_date, open, high, low, close, volume)
+        """
+        columns = (
+            StockCandle.trade_date,
+            StockCandle.open_price,
+            StockCandle.high_price,
+            StockCandle.low_price,
+            StockCandle.close_price,
+            StockCandle.volume
+        )
+
+        if period == 'D':
+            rows = (
+                db.session.query(*columns)
+                .filter(StockCandle.stock_id == stock_id)
+                .order_by(StockCandle.trade_date.desc())
+                .limit(count + 1)
+                .all()
+            )
+            return [tuple(row) for row in reversed(rows)]
+
+        # 주/월/년봉: 필요한 기간의 일봉을 읽어 로컬 집계
+        since = date.today() - timedelta(days=PERIOD_DAYS[period] * (count + 2))
+        rows = (
+            db.session.query(*columns)
+            .filter(StockCandle.stock_id == stock_id, StockCandle.trade_date >= since)
+            .order_by(StockCandle.trade_date)
+            .all()
+        )
+        return CandleService.rollup(rows, period)[-(count + 1):]
+
+    @staticmethod
+    def load_bars(stock_id, period, since=None):
+        """
+        since(포함) 이후 period 봉 전체를 오래된 순으로 반환 (since가 없으면 전 구간)
+        주/월/년봉은 since가 구간의 첫 거래일이어야 해당 구간이 온전히 집계됨
+        """
+        query = db.session.query(
+            StockCandle.trade_date,
+            StockCandle.open_price,
+            StockCandle.high_price,
+            StockCandle.low_price,
+            StockCandle.close_price,
+            StockCandle.volume
+        ).filter(StockCandle.stock_id == stock_id)
+        if since is not None:
+            query = query.filter(StockCandle.trade_date >= since)
+
+        rows = [tuple(row) for row in query.order_by(StockCandle.trade_date).all()]
+        return rows if period == 'D' else CandleService.rollup(rows, period)
+
+    @staticmethod
+    def rollup(daily_rows, period):
+        """일봉 -> 주/월/년봉 (봉 날짜는 구간의 첫 거래일)"""
+        group_key = PERIOD_GROUP_KEYS[period]
+        bars = []
+        for _, group in groupby(daily_rows, key=lambda row: group_key(row[0])):
+            group = list(group)
+            highs = [row[2] for row in group if row[2] is not None]
+            lows = [row[3] for row in group if row[3] is not None]
+            bars.append((
+                group[0][0],
+                group[0][1],
+                max(highs) if highs else None,
+                min(lows) if lows else None,
+                group[-1][4],
+                sum(row[5] or 0 for row in group)
+            ))
+        return bars
+
+    @staticmethod
+    def _to_chart_rows(bars, count):
+        """봉 목록 -> KIS 기간별시세 필드명 행 (최근 count개, 앞의 남는 봉은 등락 계산용)"""
+        rows = []
+        for i in range(max(len(bars) - count, 0), len(bars)):
+            trade_date, open_price, high, low, close, volume = bars[i]
+            previous_close = bars[i - 1][4] if i > 0 else None
+            change = float(close - previous_close) if close is not None and previous_close else 0.0
+            rows.append({
+                'stck_bsop_date': trade_date.strftime('%Y%m%d'),
+                'stck_oprc': open_price,
+                'stck_hgpr': high,
+                'stck_lwpr': low,
+                'stck_clpr': close,
+                'acml_vol': volume,
+                'prdy_vrss': change,
+                'prdy_ctrt': round(change / float(previous_close) * 100, 2) if previous_close else 0.0,
+                'prdy_vrss_sign': '2' if change > 0 else '5' if change < 0 else '3'
+            })
+        return rows
@@ -0,0 +1,153 @@
+import copy
+import os
+import threading
+from datetime import datetime
+
+from flask import current_app
+
+from models import db
+from models.stock import Stock
+from services.candle_service import CandleService
+
+# 프로세스 내 지표 캐시 크기 ((종목, 봉 주기, 지표, 파라미터) 조합 수)
+INDICATOR_CACHE_SIZE = int(os.getenv("INDICATOR_CACHE_SIZE", 256))
+INDICATOR_DEFAULT_POINTS = 100
+INDICATOR_MAX_POINTS = 1000
+
+# (stock_id, period, 지표 cache_key) -> IndicatorSeries (오래 안 쓴 항목부터 제거)
+_indicator_cache = {}
+_indicator_cache_lock = threading.Lock()
+
+def _to_float(value):
+    return float(value) if value is not None else 0.0
+
+class IndicatorSeries:
+    """
+    한 종목/봉 주기/지표 조합의 계산 결과와 지표 상태
+    마지막 봉은 같은 날짜로 값이 바뀔 수 있으므로(주/월/년봉 진행 중, 당일 봉 재기록)
+    마지막 봉 반영 직전 상태를 함께 보관해 그 봉만 다시 계산한다.
+    """
+
+    def __init__(self, indicator, bars):
+        self.indicator = indicator
+        self.dates = [bar[0] for bar in bars]
+        self.values = {key: [] for key in indicator.OUTPUTS}
+        self.last_bar = None
+        self.state_before_last = None
+
+        if bars:
+            # 마지막 봉 이전까지는 일괄 계산, 마지막 봉은 update로 반영
+            history = bars[:-1]
+            computed = indicator.run(*(
+                [_to_float(bar[i]) for bar in history] for i in (2, 3, 4, 5)
+            ))
+            for key in indicator.OUTPUTS:
+                self.values[key] = computed[key]
+            self.dates.pop()
+            self._append(bars[-1])
+
+    @property
+    def last_date(self):
+        return self.dates[-1] if self.dates else None
+
+    def _append(self, bar):
+        self.state_before_last = copy.deepcopy(self.indicator)
+        row = self.indicator.update(*(_to_float(bar[i]) for i in (2, 3, 4, 5)))
+        self.dates.append(bar[0])
+        for key, value in zip(self.indicator.OUTPUTS, row):
+            self.values[key].append(value)
+        self.last_bar = bar
+
+    def extend(self, bars):
+        """last_date(포함) 이후 봉 반영 -> 새로 계산한 봉 수"""
+        changed = 0
+        for bar in bars:
+            if self.last_date is not None and bar[0] < self.last_date:
+                continue
+
+            if bar[0] == self.last_date:
+                if bar == self.last_bar:
+                    continue
+                # 마지막 봉 값 변경: 직전 상태로 되돌린 뒤 다시 반영
+                self.indicator = self.state_before_last
+                self.dates.pop()
+                for values in self.values.values():
+                    values.pop()
+
+            self._append(bar)
+            changed += 1
+        return changed
+
+    def tail(self, count):
+        start = max(len(self.dates) - count, 0)
+        return self.dates[start:], {key: values[start:] for key, values in self.values.items()}
+
+class IndicatorService:
+
+    @staticmethod
+    def get_indicator(stock_code, indicator, period='D', count=INDICATOR_DEFAULT_POINTS):
+        """
+        저장된 봉으로 기술적 지표 계산 (최근 count개)
+        최초 조회 시 전 구간을 계산해 캐시하고, 이후에는 캐시의 마지막 봉 이후 봉만 반영
+        return -> list: [{'timestamp', 'date', <지표 값>...}], 종목이 없으면 None
+        """
+        try:
+            stock = Stock.query.filter_by(stock_code=stock_code).first()
+            if not stock:
+                return None
+
+            if stock.candles_backfilled_at is None:
+                CandleService.backfill_stock(stock)
+
+            key = (stock.id, period, indicator.cache_key)
+            series = IndicatorService._get_cached(key)
+
+            if series is None:
+                bars = CandleService.load_bars(stock.id, period)
+                series = IndicatorSeries(indicator, bars)
+                if bars:
+                    IndicatorService._put_cached(key, series)
+            else:
+                bars = CandleService.load_bars(stock.id, period, since=series.last_date)
+                with _indicator_cache_lock:
+                    changed = series.extend(bars)
+                if changed:
+                    current_app.logger.debug(f"지표 캐시 갱신 {stock_code} {key[1:]}: {changed}봉")
+
+            with _indicator_cache_lock:
+                dates, values = series.tail(count)
+
+            return IndicatorService._to_points(dates, values)
+
+        except Exception as e:
+            current_app.logger.error(f"지표 계산 실패 {stock_code} {indicator.name}: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _get_cached(key):
+        with _indicator_cache_lock:
+            series = _indicator_cache.pop(key, None)
+            if series is not None:
+                _indicator_cache[key] = series  # 최근 사용 순서로 이동
+            return series
+
+    @staticmethod
+    def _put_cached(key, series):
+        with _indicator_cache_lock:
+            while len(_indicator_cache) >= INDICATOR_CACHE_SIZE:
+                _indicator_cache.pop(next(iter(_indicator_cache)), None)
+            _indicator_cache[key] = series
+
+    @staticmethod
+    def _to_points(dates, values):
+        # 차트 데이터와 같은 timestamp 기준 (서버 로컬 자정, epoch ms)
+        keys = list(values)
+        points = []
+        for i, trade_date in enumerate(dates):
+            day = datetime(trade_date.year, trade_date.month, trade_date.day)
+            point = {'timestamp': int(day.timestamp() * 1000), 'date': day.isoformat()}
+            for key in keys:
+                point[key] = values[key][i]
+            points.append(point)
+        return points
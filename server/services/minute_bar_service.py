@@ -0,0 +1,338 @@
+import json
+import os
+from datetime import datetime, time, timedelta
+
+import numpy as np
+from flask import current_app
+from sqlalchemy.dialects.mysql import insert
+
+from config.redis import get_redis
+from models import db
+from models.stock import Stock
+from models.stock_candle import StockCandle
+from models.stock_minute_bar import StockMinuteBar
+from services.candle_service import CandleService
+from utils.kis_api import KisAPI
+from utils.candle_resample import resample, TIMEFRAME_MINUTES
+from utils.chart_transform import candles_to_chart
+
+# 분봉 보관 기간 (달력일) - 지난 분봉은 매일 정리
+MINUTE_BAR_RETENTION_DAYS = int(os.getenv("MINUTE_BAR_RETENTION_DAYS", 10))
+# 같은 종목 분봉을 KIS에서 다시 가져오는 최소 간격 (초, 워커 간 공유)
+MINUTE_SYNC_INTERVAL = int(os.getenv("MINUTE_SYNC_INTERVAL", 30))
+MINUTE_WRITE_CHUNK_SIZE = 1000
+# 하루 최대 조회 페이지 수 (당일 30개/페이지 기준 390분 + 여유)
+MINUTE_MAX_PAGES_PER_DAY = 15
+
+MARKET_OPEN = time(9, 0)
+MARKET_CLOSE = time(15, 30)
+
+# 분/시간봉 차트: 주기 -> (이름, 기본 조회 거래일 수)
+INTRADAY_TIMEFRAMES = {
+    '1m': ('1분봉', 1),
+    '5m': ('5분봉', 1),
+    '15m': ('15분봉', 3),
+    '1h': ('1시간봉', 5),
+}
+INTRADAY_MAX_DAYS = 5
+
+# 실시간 체결로 집계 중인 봉 (웹소켓 구독 종목): 해시 필드 since(오늘 집계 시작 분), 1/5(진행 중 봉 JSON)
+LIVE_CANDLE_KEY = "live_candle:{}"
+LIVE_CANDLE_TTL = 600  # 체결이 끊기면 만료 -> REST 동기화로 복귀
+
+class MinuteBarService:
+
+    @staticmethod
+    def get_chart(stock_code, timeframe='5m', days=None, extra_ma_windows=()):
+        """
+        저장된 1분봉을 timeframe으로 집계한 차트 데이터 (최근 days 거래일)
+        조회 전에 마지막 저장 분봉 이후만 KIS에서 가져와 추가 (MINUTE_SYNC_INTERVAL 간격)
+        KIS 동기화가 실패하면 이미 저장된 분봉과 Redis의 진행 중 분봉으로 응답하고 partial=True
+        return -> dict: 차트 데이터 (+ partial), 종목이 없으면 None
+        """
+        try:
+            stock = Stock.query.filter_by(stock_code=stock_code).first()
+            if not stock:
+                return None
+
+            days = days or INTRADAY_TIMEFRAMES[timeframe][1]
+            trade_days = MinuteBarService._recent_trading_days(stock, days)
+            if not trade_days:
+                return candles_to_chart(np.array([], dtype='datetime64[m]'), [], [], [], [], [])
+
+            live = MinuteBarService.get_live_state(stock.stock_code)
+            partial = False
+            try:
+                MinuteBarService.sync_stock(stock, trade_days, live)
+            except Exception as e:
+                # 실패 로그/롤백은 sync_stock에서, 저장된 구간만으로 응답
+                current_app.logger.warning(f"⚠️ 분봉 동기화 실패, 저장된 분봉으로 응답 {stock_code}: {e}")
+                partial = True
+
+            rows = (
+                db.session.query(
+                    StockMinuteBar.bar_time,
+                    StockMinuteBar.open_price,
+                    StockMinuteBar.high_price,
+                    StockMinuteBar.low_price,
+                    StockMinuteBar.close_price,
+                    StockMinuteBar.volume
+                )
+                .filter(
+                    StockMinuteBar.stock_id == stock.id,
+                    StockMinuteBar.bar_time >= datetime.combine(min(trade_days), time.min)
+                )
+                .order_by(StockMinuteBar.bar_time)
+                .all()
+            )
+
+            # 진행 중인 1분봉은 아직 DB에 없으므로 Redis 값을 덧붙임
+            open_bar = live and live['bars'].get(1)
+            if open_bar and (not rows or open_bar[0] > rows[-1][0]):
+                rows.append(tuple(open_bar))
+
+            bars = resample(
+                np.array([row[0] for row in rows], dtype='datetime64[m]'),
+                *(np.array([float(row[i] or 0) for row in rows]) for i in (1, 2, 3, 4)),
+                np.array([row[5] or 0 for row in rows], dtype=np.int64),
+                minutes=TIMEFRAME_MINUTES[timeframe]
+            )
+            chart = candles_to_chart(*bars, extra_ma_windows=extra_ma_windows)
+            chart['partial'] = partial
+            return chart
+
+        except Exception as e:
+            current_app.logger.error(f"분봉 차트 조회 실패 {stock_code}: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _recent_trading_days(stock, days):
+        """
+        최근 거래일 목록 (최신순)
+        지난 거래일은 일봉 저장소 날짜를 사용 (휴장일 제외), 장 시작 후 평일이면 오늘 포함
+        """
+        if stock.candles_backfilled_at is None:
+            try:
+                CandleService.backfill_stock(stock)
+            except Exception as e:
+                # 일봉 적재 실패는 backfill_stock에서 기록, 이미 있는 일봉 날짜로 진행
+                current_app.logger.warning(f"⚠️ 일봉 적재 실패, 저장된 거래일로 진행 {stock.stock_code}: {e}")
+
+        now = datetime.now()
+        today = now.date()
+        trade_days = [today] if today.weekday() < 5 and now.time() >= MARKET_OPEN else []
+
+        past_days = (
+            db.session.query(StockCandle.trade_date)
+            .filter(StockCandle.stock_id == stock.id, StockCandle.trade_date < today)
+            .order_by(StockCandle.trade_date.desc())
+            .limit(days - len(trade_days))
+            .all()
+        )
+        return trade_days + [row[0] for row in past_days]
+
+    @staticmethod
+    def sync_stock(stock, trade_days, live=None):
+        """
+        trade_days의 분봉 중 저장되지 않은 구간만 KIS에서 가져와 UPSERT
+        지난 거래일은 장 마감 봉까지 있으면 건너뛰고, 당일은 마지막 저장 분봉(진행 중일 수 있음)부터 다시 가져옴
+        실시간 집계 중인 종목(live)의 당일은 집계 시작 이전 빈 구간만 가져옴
+        return -> int: 기록한 분봉 수
+        """
+        redis_client = get_redis()
+        if redis_client and not redis_client.set(
+            f"minute_sync:{stock.stock_code}", 1, nx=True, ex=MINUTE_SYNC_INTERVAL
+        ):
+            return 0
+
+        try:
+            kis_api = KisAPI()
+            now = datetime.now()
+            rows = []
+
+            for trade_day in trade_days:
+                day_start = datetime.combine(trade_day, time.min)
+                market_close = datetime.combine(trade_day, MARKET_CLOSE)
+                last_bar_time = (
+                    db.session.query(db.func.max(StockMinuteBar.bar_time))
+                    .filter(
+                        StockMinuteBar.stock_id == stock.id,
+                        StockMinuteBar.bar_time >= day_start,
+                        StockMinuteBar.bar_time < day_start + timedelta(days=1)
+                    )
+                    .scalar()
+                )
+
+                if trade_day < now.date() and last_bar_time is not None and last_bar_time >= market_close:
+                    continue
+
+                end_time = now.strftime('%H%M%S') if now < market_close else MARKET_CLOSE.strftime('%H%M%S')
+                if trade_day == now.date() and live and live['since'].date() == trade_day:
+                    if last_bar_time is not None and last_bar_time >= live['since'] - timedelta(minutes=1):
+                        continue  # 실시간 집계로 이어지는 구간
+                    end_time = (live['since'] - timedelta(minutes=1)).strftime('%H%M%S')
+                rows.extend(MinuteBarService._fetch_day(kis_api, stock, trade_day, end_time, last_bar_time))
+
+            MinuteBarService.upsert_bars(rows)
+            db.session.commit()
+
+            if rows:
+                current_app.logger.debug(f"분봉 동기화: {stock.stock_code} {len(rows)}개")
+            return len(rows)
+
+        except Exception as e:
+            current_app.logger.error(f"분봉 동기화 실패 {stock.stock_code}: {e}")
+            db.session.rollback()
+            if redis_client:
+                redis_client.delete(f"minute_sync:{stock.stock_code}")  # 다음 요청에서 재시도
+            raise e
+
+    @staticmethod
+    def _fetch_day(kis_api, stock, trade_day, end_time, last_bar_time):
+        """end_time부터 과거 방향으로 페이지 조회, 마지막 저장 분봉(포함) 또는 장 시작에 닿으면 중단"""
+        rows = []
+        for _ in range(MINUTE_MAX_PAGES_PER_DAY):
+            page = kis_api.fetch_minute_bars(stock.stock_code, trade_day, end_time)
+            if not page:
+                break
+
+            parsed = [MinuteBarService._parse_kis_row(stock.id, item) for item in page]
+            rows.extend(
+                row for row in parsed if last_bar_time is None or row['bar_time'] >= last_bar_time
+            )
+
+            earliest = min(row['bar_time'] for row in parsed)
+            if (last_bar_time is not None and earliest <= last_bar_time) or earliest.time() <= MARKET_OPEN:
+                break
+            end_time = (earliest - timedelta(minutes=1)).strftime('%H%M%S')
+        return rows
+
+    @staticmethod
+    def _parse_kis_row(stock_id, item):
+        return {
+            'stock_id': stock_id,
+            'bar_time': datetime.strptime(item['stck_bsop_date'] + item['stck_cntg_hour'][:4], '%Y%m%d%H%M'),
+            'open_price': float(item['stck_oprc']) if item.get('stck_oprc') else None,
+            'high_price': float(item['stck_hgpr']) if item.get('stck_hgpr') else None,
+            'low_price': float(item['stck_lwpr']) if item.get('stck_lwpr') else None,
+            'close_price': float(item['stck_prpr']) if item.get('stck_prpr') else None,
+            'volume': int(item['cntg_vol']) if item.get('cntg_vol') else 0,
+            'updated_at': datetime.now()
+        }
+
+    @staticmethod
+    def get_live_state(stock_code):
+        """실시간 집계 상태 -> {'since': datetime, 'bars': {분: [시작, 시가, 고가, 저가, 종가, 거래량]}}, 없으면 None"""
+        redis_client = get_redis()
+        if not redis_client:
+            return None
+
+        try:
+            data = redis_client.hgetall(LIVE_CANDLE_KEY.format(stock_code))
+            if not data or not data.get('since'):
+                return None
+
+            bars = {}
+            for field, value in data.items():
+                if field.isdigit():
+                    bar = json.loads(value)
+                    bars[int(field)] = [datetime.fromisoformat(bar[0]), *bar[1:]]
+            return {'since': datetime.fromisoformat(data['since']), 'bars': bars}
+
+        except Exception as e:
+            current_app.logger.warning(f"실시간 분봉 조회 실패 {stock_code}: {e}")
+            return None
+
+    @staticmethod
+    def publish_live_bars(snapshot):
+        """
+        LiveCandleBuilder.drain_open() 결과를 Redis에 기록 (종목당 해시 1개, 한 번의 파이프라인)
+        마감되어 진행 중 봉이 없는 주기는 필드 삭제
+        """
+        redis_client = get_redis()
+        if not redis_client or not snapshot:
+            return
+
+        pipe = redis_client.pipeline(transaction=False)
+        for stock_code, state in snapshot.items():
+            key = LIVE_CANDLE_KEY.format(stock_code)
+            mapping = {'since': state['since'].isoformat()}
+            for interval, bar in state.items():
+                if interval == 'since':
+                    continue
+                if bar is None:
+                    pipe.hdel(key, str(interval))
+                else:
+                    mapping[str(interval)] = json.dumps([bar[0].isoformat(), *bar[1:]])
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, LIVE_CANDLE_TTL)
+        pipe.execute()
+
+    @staticmethod
+    def store_closed_bars(bars):
+        """LiveCandleBuilder.drain_closed() 결과 -> stock_minute_bars 다중행 UPSERT"""
+        if not bars:
+            return 0
+
+        try:
+            stock_ids = dict(
+                db.session.query(Stock.stock_code, Stock.id)
+                .filter(Stock.stock_code.in_({bar[0] for bar in bars}))
+                .all()
+            )
+            now = datetime.now()
+            rows = [
+                {
+                    'stock_id': stock_ids[stock_code],
+                    'bar_time': start,
+                    'open_price': open_price,
+                    'high_price': high,
+                    'low_price': low,
+                    'close_price': close,
+                    'volume': volume,
+                    'updated_at': now
+                }
+                for stock_code, start, open_price, high, low, close, volume in bars
+                if stock_code in stock_ids
+            ]
+            MinuteBarService.upsert_bars(rows)
+            db.session.commit()
+            return len(rows)
+
+        except Exception as e:
+            current_app.logger.error(f"실시간 분봉 기록 실패: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def upsert_bars(rows):
+        """(stock_id, bar_time) 기준 다중행 UPSERT (커밋은 호출자)"""
+        for i in range(0, len(rows), MINUTE_WRITE_CHUNK_SIZE):
+            chunk = rows[i:i + MINUTE_WRITE_CHUNK_SIZE]
+            stmt = insert(StockMinuteBar).values(chunk)
+            stmt = stmt.on_duplicate_key_update(
+                open_price=stmt.inserted.open_price,
+                high_price=stmt.inserted.high_price,
+                low_price=stmt.inserted.low_price,
+                close_price=stmt.inserted.close_price,
+                volume=stmt.inserted.volume,
+                updated_at=stmt.inserted.updated_at
+            )
+            db.session.execute(stmt)
+
+    @staticmethod
+    def purge_old_bars():
+        """보관 기간이 지난 분봉 삭제"""
+        try:
+            cutoff = datetime.combine(datetime.now().date() - timedelta(days=MINUTE_BAR_RETENTION_DAYS), time.min)
+            deleted = StockMinuteBar.query.filter(StockMinuteBar.bar_time < cutoff).delete(synchronize_session=False)
+            db.session.commit()
+
+            current_app.logger.info(f"분봉 정리 완료: {deleted}개 삭제 ({cutoff} 이전)")
+            return deleted
+
+        except Exception as e:
+            current_app.logger.error(f"분봉 정리 실패: {e}")
+            db.session.rollback()
+            raise e
@@ -5,7 +5,14 @@ from flask import current_app
 from services.cache_service import CacheService
 from models.stock import Stock
 
+DEFAULT_NEWS_CACHE_KEY = "default_news"
+
 class NewsService:
+    # 키워드 뉴스 캐시 키
+    @staticmethod
+    def keyword_news_cache_key(keyword, display):
+        return f"news_{keyword}_{display}"
+
     # 네이버 뉴스 API
     @staticmethod
     def get_naver_news(query, display=5):
@@ -106,7 +113,7 @@ class NewsService:
     @staticmethod
     def get_keyword_news(keyword, display=5):
         try:
-            cache_key = f"news_{keyword}_{display}"
+            cache_key = NewsService.keyword_news_cache_key(keyword, display)
             
             cached_news = CacheService.get(cache_key)
             if cached_news:
@@ -256,7 +263,7 @@ class NewsService:
     @staticmethod
     def refresh_keyword_news(keyword, display=5):
         try:
-            cache_key = f"news_{keyword}_{display}"
+            cache_key = NewsService.keyword_news_cache_key(keyword, display)
             CacheService.delete(cache_key)
             return NewsService.get_keyword_news(keyword, display)
         except Exception as e:
@@ -267,7 +274,7 @@ class NewsService:
     @staticmethod
     def get_default_news():
         try:
-            cache_key = "default_news"
+            cache_key = DEFAULT_NEWS_CACHE_KEY
             cached_news = CacheService.get(cache_key)
             
             if cached_news:
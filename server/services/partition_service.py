@@ -0,0 +1,209 @@
+import os
+from datetime import date
+from sqlalchemy import inspect, text
+from flask import current_app
+
+from models import db
+
+# stock_histories 월 단위 RANGE 파티셔닝 사용 여부 (기존 테이블 변환이 필요하므로 명시적으로 켠다)
+STOCK_HISTORY_PARTITIONING = os.getenv("STOCK_HISTORY_PARTITIONING", "0") == "1"
+# 본 테이블에 유지할 개월 수 (이전 데이터는 stock_histories_archive로 이동)
+STOCK_HISTORY_RETENTION_MONTHS = int(os.getenv("STOCK_HISTORY_RETENTION_MONTHS", 36))
+# 미리 만들어 둘 미래 파티션 개월 수
+STOCK_HISTORY_FUTURE_PARTITIONS = 3
+
+HISTORY_TABLE = 'stock_histories'
+ARCHIVE_TABLE = 'stock_histories_archive'
+ARCHIVE_DELETE_CHUNK_SIZE = 5000
+
+def _add_months(day, months):
+    month_index = day.year * 12 + (day.month - 1) + months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+def _partition_name(month_start):
+    return f"p{month_start.strftime('%Y%m')}"
+
+def _partition_clause(month_start):
+    upper = _add_months(month_start, 1)
+    return f"PARTITION {_partition_name(month_start)} VALUES LESS THAN ('{upper.isoformat()}')"
+
+class PartitionService:
+
+    @staticmethod
+    def get_partitions():
+        """stock_histories 파티션 목록 [(이름, 상한값 문자열)] (파티셔닝 전이면 빈 목록)"""
+        rows = db.session.execute(text("""
+            SELECT PARTITION_NAME, PARTITION_DESCRIPTION
+            FROM information_schema.PARTITIONS
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table AND PARTITION_NAME IS NOT NULL
+            ORDER BY PARTITION_ORDINAL_POSITION
+        """), {'table': HISTORY_TABLE}).fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    @staticmethod
+    def enable_partitioning():
+        """
+        stock_histories를 trade_date 월 단위 RANGE COLUMNS 파티션 테이블로 변환 (최초 1회)
+        MySQL 파티션 테이블은 외래키를 지원하지 않고 모든 유니크 키에 파티션 컬럼이 있어야 하므로
+        FK를 제거하고 PK를 (id, trade_date)로 바꾼다. 종목은 삭제하지 않고 is_active로만 관리하므로 CASCADE가 필요 없다.
+        여러 워커가 동시에 변환하지 않도록 schema_lock 안에서 호출 (잠금 후 파티션 여부를 다시 확인)
+        """
+        try:
+            if PartitionService.get_partitions():
+                return False
+
+            current_app.logger.info("stock_histories 파티셔닝 변환 시작")
+
+            first_date = db.session.execute(text(
+                f"SELECT MIN(trade_date) FROM {HISTORY_TABLE}"
+            )).scalar() or date.today()
+            db.session.commit()
+
+            start_month = date(first_date.year, first_date.month, 1)
+            end_month = _add_months(date.today().replace(day=1), STOCK_HISTORY_FUTURE_PARTITIONS)
+
+            clauses = []
+            month = start_month
+            while month <= end_month:
+                clauses.append(_partition_clause(month))
+                month = _add_months(month, 1)
+            clauses.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+
+            inspector = inspect(db.engine)
+            foreign_keys = [fk['name'] for fk in inspector.get_foreign_keys(HISTORY_TABLE) if fk.get('name')]
+
+            with db.engine.begin() as conn:
+                for fk_name in foreign_keys:
+                    conn.execute(text(f"ALTER TABLE {HISTORY_TABLE} DROP FOREIGN KEY {fk_name}"))
+                conn.execute(text(
+                    f"ALTER TABLE {HISTORY_TABLE} DROP PRIMARY KEY, ADD PRIMARY KEY (id, trade_date)"
+                ))
+                conn.execute(text(
+                    f"ALTER TABLE {HISTORY_TABLE} PARTITION BY RANGE COLUMNS(trade_date) ({', '.join(clauses)})"
+                ))
+
+            current_app.logger.info(f"stock_histories 파티셔닝 변환 완료: {len(clauses)}개 파티션")
+            return True
+
+        except Exception as e:
+            current_app.logger.error(f"stock_histories 파티셔닝 변환 실패: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def ensure_future_partitions(months_ahead=STOCK_HISTORY_FUTURE_PARTITIONS):
+        """pmax를 분할해 앞으로 months_ahead 개월치 파티션을 미리 생성"""
+        try:
+            partitions = PartitionService.get_partitions()
+            if not partitions:
+                return 0
+
+            existing = {name for name, _ in partitions}
+            target_month = _add_months(date.today().replace(day=1), months_ahead)
+
+            # 마지막 월 파티션 다음 달부터 생성
+            month_partitions = sorted(name for name in existing if name != 'pmax')
+            if month_partitions:
+                last = month_partitions[-1]
+                month = _add_months(date(int(last[1:5]), int(last[5:7]), 1), 1)
+            else:
+                month = date.today().replace(day=1)
+
+            clauses = []
+            while month <= target_month:
+                if _partition_name(month) not in existing:
+                    clauses.append(_partition_clause(month))
+                month = _add_months(month, 1)
+
+            if not clauses:
+                return 0
+
+            clauses.append("PARTITION pmax VALUES LESS THAN (MAXVALUE)")
+            with db.engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {HISTORY_TABLE} REORGANIZE PARTITION pmax INTO ({', '.join(clauses)})"
+                ))
+
+            current_app.logger.info(f"stock_histories 미래 파티션 {len(clauses) - 1}개 생성")
+            return len(clauses) - 1
+
+        except Exception as e:
+            current_app.logger.error(f"stock_histories 파티션 생성 실패: {e}")
+            raise e
+
+    @staticmethod
+    def archive_old_histories(retention_months=STOCK_HISTORY_RETENTION_MONTHS):
+        """
+        보관 기간이 지난 이력을 stock_histories_archive로 이동
+        파티션 테이블이면 월 파티션 단위로 복사 후 DROP PARTITION, 아니면 trade_date 인덱스로 청크 삭제
+        """
+        try:
+            cutoff = _add_months(date.today().replace(day=1), -retention_months)
+            PartitionService._ensure_archive_table()
+
+            partitions = PartitionService.get_partitions()
+            if partitions:
+                archived = PartitionService._archive_partitions(partitions, cutoff)
+            else:
+                archived = PartitionService._archive_rows(cutoff)
+
+            current_app.logger.info(f"stock_histories 보관 처리 완료: {cutoff} 이전 {archived}")
+            return archived
+
+        except Exception as e:
+            current_app.logger.error(f"stock_histories 보관 처리 실패: {e}")
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def _ensure_archive_table():
+        inspector = inspect(db.engine)
+        if inspector.has_table(ARCHIVE_TABLE):
+            return
+
+        with db.engine.begin() as conn:
+            conn.execute(text(f"CREATE TABLE {ARCHIVE_TABLE} LIKE {HISTORY_TABLE}"))
+            # LIKE는 파티션 정의까지 복사하므로 보관 테이블은 일반 테이블로 둔다
+            if PartitionService.get_partitions():
+                conn.execute(text(f"ALTER TABLE {ARCHIVE_TABLE} REMOVE PARTITIONING"))
+
+    @staticmethod
+    def _archive_partitions(partitions, cutoff):
+        """상한값이 cutoff 이하인 월 파티션을 보관 테이블로 옮기고 제거"""
+        archived = []
+        for name, description in partitions:
+            if name == 'pmax' or not description or 'MAXVALUE' in description:
+                continue
+
+            upper = date.fromisoformat(description.strip("'"))
+            if upper > cutoff:
+                continue
+
+            with db.engine.begin() as conn:
+                conn.execute(text(
+                    f"INSERT IGNORE INTO {ARCHIVE_TABLE} SELECT * FROM {HISTORY_TABLE} PARTITION ({name})"
+                ))
+                conn.execute(text(f"ALTER TABLE {HISTORY_TABLE} DROP PARTITION {name}"))
+            archived.append(name)
+
+        return f"{len(archived)}개 파티션 {archived}"
+
+    @staticmethod
+    def _archive_rows(cutoff):
+        """파티셔닝 전 테이블: cutoff 이전 행을 복사 후 청크 단위로 삭제"""
+        db.session.execute(text(
+            f"INSERT IGNORE INTO {ARCHIVE_TABLE} SELECT * FROM {HISTORY_TABLE} WHERE trade_date < :cutoff"
+        ), {'cutoff': cutoff})
+        db.session.commit()
+
+        deleted = 0
+        while True:
+            result = db.session.execute(text(
+                f"DELETE FROM {HISTORY_TABLE} WHERE trade_date < :cutoff LIMIT {ARCHIVE_DELETE_CHUNK_SIZE}"
+            ), {'cutoff': cutoff})
+            db.session.commit()
+            deleted += result.rowcount
+            if result.rowcount < ARCHIVE_DELETE_CHUNK_SIZE:
+                break
+
+        return f"{deleted}행"
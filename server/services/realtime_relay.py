@@ -0,0 +1,263 @@
+import os
+import socket
+import threading
+import time
+import uuid
+
+import orjson
+
+from config.redis import get_redis
+from utils.price_stream import PriceBroadcaster
+
+# gunicorn 워커 여러 개가 KIS 웹소켓 연결 하나를 공유하기 위한 Redis 중계
+# - 리더 선출: realtime:leader 키를 SET NX EX로 잡은 프로세스만 KIS 웹소켓에 연결(수집)하고 TTL/3마다 갱신
+#   리더가 죽으면 키가 만료되고 다른 워커가 이어받음
+# - 시세 전달: 리더의 realtime_price 일괄 반영(RealtimeWriteBuffer)과 같은 트랜잭션에서 realtime:ticks로 PUBLISH
+#   모든 워커(리더 포함)가 구독해 로컬 시세 맵을 갱신
+# - 구독 제어: 리더가 아닌 워커로 들어온 추가/해제 요청은 realtime:control로 리더에 전달
+# - SSE 전송: 별도 스트림 프로세스(stream_app.py, 비동기 워커)가 같은 채널을 구독해 PriceBroadcaster로 전송
+#   (API 워커의 스레드는 요청/응답 처리에만 사용)
+
+REALTIME_LEADER_KEY = 'realtime:leader'
+REALTIME_LEADER_TTL = int(os.getenv("REALTIME_LEADER_TTL", "15"))  # 리더 키 만료 (초), 리더 장애 시 최대 이 시간 뒤 교체
+REALTIME_STATUS_KEY = 'realtime:status'    # 리더의 구독 상태 (리더가 아닌 워커의 상태 조회용)
+REALTIME_TICK_CHANNEL = 'realtime:ticks'
+REALTIME_CONTROL_CHANNEL = 'realtime:control'
+REALTIME_LOCAL_PRICE_TTL = 300  # 로컬 시세 맵 유효 시간 (realtime_price 만료와 동일)
+
+# 리더 키가 자신의 것일 때만 갱신/삭제 (다른 프로세스가 이어받은 키를 건드리지 않도록)
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+def to_quote(mapping):
+    """realtime_price 해시/중계 메시지(문자열 값) -> 시세 dict"""
+    return {
+        "stock_code": mapping.get("stock_code"),
+        "current_price": float(mapping.get("current_price") or 0),
+        "change_rate": float(mapping.get("change_rate") or 0),
+        "change_amount": int(float(mapping.get("change_amount") or 0)),
+        "change_sign": mapping.get("change_sign"),
+        "updated_at": mapping.get("updated_at")
+    }
+
+class RealtimeSubscriber:
+    """realtime:ticks 구독 -> 로컬 시세 맵 (broadcaster를 주면 SSE 전송도)"""
+
+    channels = (REALTIME_TICK_CHANNEL,)
+
+    def __init__(self, app, redis_client, broadcaster=None):
+        self.app = app
+        self.redis_client = redis_client
+        self.broadcaster = broadcaster
+
+        self.prices = {}  # 종목코드 -> (수신 시각, 시세)
+        self.received_messages = 0
+
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _start_threads(self, *targets):
+        if self._threads:
+            return False
+        for target in targets:
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return True
+
+    def start(self):
+        """구독 스레드 시작"""
+        self._start_threads(self._subscribe_loop)
+
+    def stop(self):
+        self._stop.set()
+
+    # 시세 구독
+    def _subscribe_loop(self):
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(*self.channels)
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self._handle_message(message['channel'], message['data'])
+            except Exception as e:
+                self.app.logger.error(f"❌ 실시간 시세 구독 실패 (재구독 대기): {e}")
+                self._stop.wait(1)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def _handle_message(self, channel, data):
+        if channel == REALTIME_TICK_CHANNEL:
+            self._apply_ticks(data)
+
+    def _apply_ticks(self, data):
+        received_at = time.time()
+        broadcaster = self.broadcaster
+        for mapping in orjson.loads(data):
+            quote = to_quote(mapping)
+            self.prices[quote['stock_code']] = (received_at, quote)
+            if broadcaster is not None:
+                broadcaster.publish(quote['stock_code'], {
+                    **quote,
+                    "volume": int(mapping.get("volume") or 0),
+                    "trade_time": mapping.get("trade_time")
+                })
+        self.received_messages += 1
+
+    def get_price(self, stock_code):
+        """로컬 시세 맵 조회 (없거나 오래됐으면 None)"""
+        entry = self.prices.get(stock_code)
+        if entry is None or time.time() - entry[0] > REALTIME_LOCAL_PRICE_TTL:
+            return None
+        return entry[1]
+
+    def get_latest_price(self, stock_code):
+        """로컬 시세 맵, 없으면 Redis realtime_price 해시 (둘 다 없으면 None)"""
+        quote = self.get_price(stock_code)
+        if quote:
+            return dict(quote)
+        data = self.redis_client.hgetall(f"realtime_price:{stock_code}")
+        return to_quote(data) if data else None
+
+class RealtimeRelay(RealtimeSubscriber):
+    """프로세스별 중계기 (KisWebSocketService 하나에 하나), 시세 구독 + 리더 선출 + 구독 제어 전달"""
+
+    channels = (REALTIME_TICK_CHANNEL, REALTIME_CONTROL_CHANNEL)
+
+    def __init__(self, websocket_service):
+        super().__init__(websocket_service.app, websocket_service.redis_client)
+        self.service = websocket_service
+        self.node_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+        self.is_leader = False
+        self.leader_since = None
+
+        self._renew = self.redis_client.register_script(_RENEW_SCRIPT)
+        self._release = self.redis_client.register_script(_RELEASE_SCRIPT)
+        self._start_ingest = None
+
+    def start(self, start_ingest):
+        """리더 선출/구독 스레드 시작, start_ingest: 리더가 됐을 때 KIS 웹소켓 연결을 시작하는 함수"""
+        if self._threads:
+            return
+        self._start_ingest = start_ingest
+        self._start_threads(self._elect_loop, self._subscribe_loop)
+
+    def stop(self):
+        """종료 시 리더 키를 바로 놓아 다른 워커가 TTL을 기다리지 않고 이어받게 함"""
+        super().stop()
+        if self.is_leader:
+            try:
+                self._release(keys=[REALTIME_LEADER_KEY], args=[self.node_id])
+            except Exception:
+                pass
+            self.is_leader = False
+
+    # 리더 선출
+    def _elect_loop(self):
+        while not self._stop.is_set():
+            try:
+                if self.is_leader:
+                    if self._renew(keys=[REALTIME_LEADER_KEY], args=[self.node_id, REALTIME_LEADER_TTL]):
+                        self._publish_status()
+                    else:
+                        self._step_down()
+                elif self.redis_client.set(REALTIME_LEADER_KEY, self.node_id, nx=True, ex=REALTIME_LEADER_TTL):
+                    self._take_over()
+            except Exception as e:
+                self.app.logger.error(f"❌ 실시간 수집 리더 선출 실패: {e}")
+
+            self._stop.wait(REALTIME_LEADER_TTL / 3)
+
+    def _take_over(self):
+        self.is_leader = True
+        self.leader_since = time.time()
+        self.app.logger.info(f"👑 실시간 수집 리더 선출: {self.node_id}")
+        threading.Thread(target=self._start_ingest, daemon=True).start()
+
+    def _step_down(self):
+        self.is_leader = False
+        self.leader_since = None
+        self.app.logger.warning(f"⚠️ 실시간 수집 리더 상실, KIS 웹소켓 연결 해제: {self.node_id}")
+        self.service.disconnect()
+
+    def _publish_status(self):
+        status = self.service.get_local_subscription_status()
+        self.redis_client.set(REALTIME_STATUS_KEY, orjson.dumps(status), ex=REALTIME_LEADER_TTL * 2)
+
+    # 제어 메시지 (리더만 처리)
+    def _handle_message(self, channel, data):
+        if channel == REALTIME_CONTROL_CHANNEL:
+            if self.is_leader:
+                self._apply_control(data)
+        else:
+            super()._handle_message(channel, data)
+
+    def _apply_control(self, data):
+        command = orjson.loads(data)
+        action = command.get('action')
+        codes = command.get('codes') or []
+        self.app.logger.info(f"📨 구독 제어 요청 수신: {action} {codes}")
+
+        # 구독 요청은 종목마다 대기하므로 수신 루프를 막지 않도록 별도 스레드에서
+        if action == 'add':
+            target, args = self.service.add_additional_subscriptions, (codes,)
+        elif action == 'remove':
+            target, args = self.service.remove_additional_subscriptions, (codes,)
+        elif action == 'clear':
+            target, args = self.service.clear_all_additional_subscriptions, ()
+        else:
+            return
+        threading.Thread(target=target, args=args, daemon=True).start()
+
+    def forward(self, action, codes=()):
+        """구독 추가/해제 요청을 리더에 전달 (현재 리더가 없으면 False)"""
+        if not self.redis_client.get(REALTIME_LEADER_KEY):
+            return False
+        self.redis_client.publish(REALTIME_CONTROL_CHANNEL, orjson.dumps({'action': action, 'codes': list(codes)}))
+        return True
+
+    def get_leader_status(self):
+        """리더가 마지막으로 기록한 구독 상태 (없으면 None)"""
+        data = self.redis_client.get(REALTIME_STATUS_KEY)
+        return orjson.loads(data) if data else None
+
+    def get_status(self):
+        return {
+            'node_id': self.node_id,
+            'is_leader': self.is_leader,
+            'leader': self.redis_client.get(REALTIME_LEADER_KEY),
+            'leader_since': self.leader_since,
+            'local_prices': len(self.prices),
+            'received_messages': self.received_messages
+        }
+
+# 전역 SSE 시세 구독기 (스트림 프로세스, 또는 스트림을 함께 띄운 개발 서버에서만 생성)
+price_feed = None
+_price_feed_lock = threading.Lock()
+
+def get_price_feed(app):
+    """SSE 전송용 시세 구독기 반환 (지연 초기화, 첫 호출 때 구독 시작)"""
+    global price_feed
+    with _price_feed_lock:
+        if price_feed is None:
+            price_feed = RealtimeSubscriber(app, get_redis(), broadcaster=PriceBroadcaster())
+            price_feed.start()
+    return price_feed
@@ -1,16 +1,58 @@
 import utils.stock_download as stock_dl
 from utils.kis_api import KisAPI
+from utils.kis_session import kis_session
+from utils.kis_fetcher import KisFetchEngine, KisFetchAbort, KisFetchItemError
 from utils.stock_company_info import ask_gpt_company_info
+from utils.quote_serializer import get_serializer, STOCK_DETAIL_FIELDS, RANKING_FIELDS, STOCK_MASTER_FIELDS
+from utils.stock_search import stock_search_index
 from models.stock import Stock
 from models.stock_history import StockHistory
+from models.stock_latest import StockLatest
 from models import db
 from flask import current_app
 from sqlalchemy.dialects.mysql import insert
-from sqlalchemy import text, func, and_
+from sqlalchemy import text, func, and_, update
 
 from datetime import datetime, date, timedelta
+import gzip
+import hashlib
+import threading
 import time
 from services.cache_service import CacheService
+from services.candle_service import CandleService
+from services.minute_bar_service import MinuteBarService
+
+# stock_histories / stock_latest 공통 시세 컬럼
+QUOTE_COLUMNS = [
+    'current_price', 'previous_close', 'change_rate', 'change_amount',
+    'day_open', 'day_high', 'day_low', 'daily_volume', 'market_cap',
+    'week52_high', 'week52_low', 'per', 'pbr'
+]
+
+STOCK_UPSERT_CHUNK_SIZE = 1000  # 종목 마스터 UPSERT 1회당 행 수
+STOCK_DELIST_GUARD_RATIO = 0.8   # 마스터 종목 수가 기존 활성 종목의 80% 미만이면 상장폐지 처리 보류
+HISTORY_WRITE_BATCH_SIZE = 500   # 일별 히스토리 동기화 다중행 기록 단위
+
+# 시세 스냅샷(stock_latest) 버전 - 스냅샷이 바뀔 때마다 증가해 파생 캐시를 무효화
+SNAPSHOT_VERSION = 'stock_snapshot'
+VOLUME_RANKING_CACHE_TTL = 3600  # 이전 버전 캐시는 TTL로 자연 만료
+
+MARKET_OPEN_DAY_CACHE_TTL = 86400  # 날짜별 개장일 여부 캐시 (KIS 휴장일조회는 하루 1회 권장)
+
+SEARCH_RESULT_LIMIT = 100  # 종목 검색 최대 결과 수
+
+# 종목 마스터 버전 - 종목 추가/변경/상장폐지 시 증가 (/api/stock/all ETag 기준)
+MASTER_VERSION = 'stock_master'
+ALL_STOCKS_MAX_PAGE_SIZE = 1000
+ALL_STOCKS_PAYLOAD_TTL = 600         # Redis 장애로 버전을 못 읽어도 이 시간 이상 묵은 응답은 내지 않음
+ALL_STOCKS_PAYLOAD_CACHE_SIZE = 32   # (필드, 커서, 페이지 크기) 조합별 보관 수
+
+# 프로세스 내 /api/stock/all 응답 캐시: (버전, 필드, 커서, 페이지 크기) -> 직렬화/압축된 본문
+_all_stocks_payloads = {}
+
+# 검색 인덱스가 반영하는 데이터 버전 (다른 워커가 동기화해 버전이 바뀌면 다음 검색 때 재구성)
+SEARCH_INDEX_VERSIONS = (MASTER_VERSION, SNAPSHOT_VERSION)
+_search_index_lock = threading.Lock()  # 버전이 바뀐 뒤 동시에 들어온 요청 중 하나만 재구성
 
 class StockService:
 
@@ -28,7 +70,7 @@ class StockService:
                 return False
             
             # 2. DB에 저장
-            success_count = StockService._save_stocks_basic_info_to_db(all_stocks)
+            return StockService._save_stocks_basic_info_to_db(all_stocks)
             
         except Exception as e:
             current_app.logger.error(f"주식 종목 동기화 실패: {e}")
@@ -37,60 +79,104 @@ class StockService:
     
     @staticmethod
     def _save_stocks_basic_info_to_db(stocks_data):
-        """종목 데이터를 DB에 저장 (개별 UPSERT)"""
+        """
+        마스터 파일과 DB의 차이만 반영 (단일 트랜잭션)
+        신규 상장 -> INSERT, 종목명/시장 변경·재상장 -> UPDATE, 마스터에서 빠진 종목 -> is_active=False
+        """
         try:
-            success_count = 0
-            
+            # 1. 유효한 데이터만 정리 (같은 종목코드가 여러 번 나오면 마지막 값 사용)
+            parsed = {}
             for stock_info in stocks_data:
                 stock_code = stock_info.get('stock_code', '').strip()
                 stock_name = stock_info.get('stock_name', '').strip()
                 market = stock_info.get('market', '').strip()
-                # sector = stock_info.get('sector', '').strip() or None
                 
-                # 유효한 데이터만 처리
                 if not stock_code or not stock_name:
                     continue
                 
-                try:
-                    # 기존 종목 확인
-                    existing_stock = Stock.query.filter_by(stock_code=stock_code).first()
-                    
-                    if existing_stock:
-                        # 업데이트
-                        existing_stock.stock_name = stock_name
-                        existing_stock.market = market
-                        # existing_stock.sector = sector
-                        existing_stock.company_info = StockService.__create_basic_company_info(stock_info)
-                        existing_stock.updated_at = db.func.now()
-                        # current_app.logger.debug(f"종목 업데이트: {stock_code} - {stock_name}")
-                    else:
-                        # 새로 추가
-                        new_stock = Stock(
-                            stock_code=stock_code,
-                            stock_name=stock_name,
-                            market=market,
-                            # sector=sector,
-                            company_info=StockService.__create_basic_company_info(stock_info),
-                            updated_at=db.func.now()
-                        )
-                        db.session.add(new_stock)
-                        # current_app.logger.debug(f"종목 추가: {stock_code} - {stock_name}")
-                    
-                    success_count += 1
-                    
-                    # 100개마다 중간 커밋
-                    if success_count % 100 == 0:
-                        db.session.commit()
-                        current_app.logger.info(f"중간 커밋: {success_count}개 처리")
-                        
-                except Exception as e:
-                    current_app.logger.warning(f"종목 처리 실패: {stock_code} - {e}")
+                parsed[stock_code] = {
+                    'stock_code': stock_code,
+                    'stock_name': stock_name,
+                    'market': market
+                }
+            
+            # 2. 현재 DB 상태를 한 번에 조회
+            existing = {
+                stock_code: (stock_name, market, is_active)
+                for stock_code, stock_name, market, is_active in db.session.query(
+                    Stock.stock_code, Stock.stock_name, Stock.market, Stock.is_active
+                )
+            }
+            
+            # 3. 차이 계산
+            now = datetime.now()
+            rows_to_write = []
+            counts = {'inserted': 0, 'updated': 0, 'delisted': 0, 'unchanged': 0}
+            
+            for stock_code, row in parsed.items():
+                current = existing.get(stock_code)
+                if current is None:
+                    counts['inserted'] += 1
+                elif current != (row['stock_name'], row['market'], True):
+                    counts['updated'] += 1
+                else:
+                    counts['unchanged'] += 1
                     continue
+                
+                rows_to_write.append({
+                    **row,
+                    'company_info': StockService.__create_basic_company_info(row),
+                    'is_active': True,
+                    'updated_at': now
+                })
+            
+            delisted_codes = [
+                stock_code for stock_code, (_, _, is_active) in existing.items()
+                if is_active and stock_code not in parsed
+            ]
+            
+            # 마스터 파일이 비정상적으로 작으면(다운로드/파싱 이상) 상장폐지 처리 보류
+            active_count = sum(1 for _, _, is_active in existing.values() if is_active)
+            if delisted_codes and len(parsed) < active_count * STOCK_DELIST_GUARD_RATIO:
+                current_app.logger.warning(
+                    f"마스터 종목 수 이상({len(parsed)}개 / 기존 {active_count}개) - 상장폐지 처리 보류"
+                )
+                delisted_codes = []
+            counts['delisted'] = len(delisted_codes)
+            
+            # 4. 변경분만 반영
+            for i in range(0, len(rows_to_write), STOCK_UPSERT_CHUNK_SIZE):
+                chunk = rows_to_write[i:i + STOCK_UPSERT_CHUNK_SIZE]
+                stmt = insert(Stock).values(chunk)
+                stmt = stmt.on_duplicate_key_update(
+                    stock_name=stmt.inserted.stock_name,
+                    market=stmt.inserted.market,
+                    company_info=stmt.inserted.company_info,
+                    is_active=stmt.inserted.is_active,
+                    updated_at=stmt.inserted.updated_at
+                )
+                db.session.execute(stmt)
+            
+            for i in range(0, len(delisted_codes), STOCK_UPSERT_CHUNK_SIZE):
+                chunk = delisted_codes[i:i + STOCK_UPSERT_CHUNK_SIZE]
+                db.session.execute(
+                    update(Stock)
+                    .where(Stock.stock_code.in_(chunk))
+                    .values(is_active=False, updated_at=now)
+                )
             
-            # 최종 커밋
             db.session.commit()
-            current_app.logger.info(f"배치 저장 완료: {success_count}개")
-            return success_count
+            if rows_to_write or delisted_codes:
+                StockService.publish_master()
+                StockService.publish_snapshot()  # 상장/폐지 변경은 순위 대상에도 영향
+            StockService.refresh_search_index()
+            current_app.logger.info(
+                f"종목 마스터 동기화 완료: 신규 {counts['inserted']}, 변경 {counts['updated']}, "
+                f"상장폐지 {counts['delisted']}, 동일 {counts['unchanged']}"
+            )
+            if delisted_codes:
+                current_app.logger.info(f"상장폐지 처리 종목: {delisted_codes[:50]}")
+            return counts
             
         except Exception as e:
             current_app.logger.error(f"DB 저장 중 오류: {e}")
@@ -121,471 +207,558 @@ class StockService:
 
             kis_api = KisAPI()
             
-            stocks = Stock.query.all()
-            updated_count = 0
-            failed_count = 0
+            stock_ids = dict(
+                db.session.query(Stock.stock_code, Stock.id).filter(Stock.is_active.is_(True)).all()
+            )
             today = datetime.now().date()
-            
-            for stock in stocks:
-                try:
-                    # 한 번의 API 호출로 모든 데이터 가져오기
-                    stock_data = kis_api.fetch_stock_basic_info_and_history_from_kis(stock.stock_code)
-                    
-                    if stock_data:
-                        # 1. Stock 기본정보 업데이트
-                        if stock_data.get('shares_outstanding'):
-                            stock.shares_outstanding = stock_data.get('shares_outstanding')
-                            stock.sector = stock_data.get('sector')
-                            stock.sector_detail = stock_data.get('sector_detail')
-                            stock.updated_at = db.func.now()
-                        
-                        # 2. StockHistory 저장/업데이트
-                        existing_history = StockHistory.query.filter(
-                            StockHistory.stock_id == stock.id,
-                            db.func.date(StockHistory.updated_at) == today
-                        ).first()
-                        
-                        if existing_history:
-                            StockService._update_stock_history(existing_history, stock_data)
-                        else:
-                            new_history = StockService._create_stock_history(stock.id, stock_data)
-                            db.session.add(new_history)
-                        
-                        updated_count += 1
-                        # current_app.logger.debug(f"통합 업데이트 완료: {stock.stock_code}")
-                        
-                    else:
-                        failed_count += 1
-                    
-                    # 100개마다 중간 커밋
-                    if updated_count % 50 == 0:
-                        db.session.commit()
-                        current_app.logger.info(f"통합 업데이트 중간 커밋: {updated_count}개")
-                    
-                    time.sleep(0.06)  # API 제한 -> 60ms = 1초당 16건 정도
-                    
-                except Exception as e:
-                    failed_count += 1
-                    current_app.logger.warning(f"종목 {stock.stock_code} 통합 업데이트 실패: {e}")
-                    continue
-            
-            db.session.commit()
-            current_app.logger.info(f"통합 업데이트 완료: {updated_count}개 성공, {failed_count}개 실패")
-            return updated_count
+            buffers = {
+                'stocks': [],            # Stock 기본정보 (발행주식수, 업종)
+                'histories': [],         # stock_histories (stock_id, trade_date) UPSERT
+                'latest_snapshots': [],  # stock_latest UPSERT
+                'candles': []            # stock_candles 당일 일봉 UPSERT
+            }
+            # 주말/공휴일 등 휴장일에는 장이 없으므로 현재가 조회 결과를 일봉으로 추가하지 않음 (실행당 1회 확인)
+            is_trading_day = StockService.is_market_open_day(kis_api, today)
+
+            # 조회는 worker pool에서 병렬로, 결과는 이 스레드에서 버퍼에 모았다가 다중행 문장으로 기록
+            def collect_stock_data(stock_code, stock_data):
+                stock_id = stock_ids[stock_code]
+                now = datetime.now()
+
+                if stock_data.get('shares_outstanding'):
+                    buffers['stocks'].append({
+                        'id': stock_id,
+                        'shares_outstanding': stock_data.get('shares_outstanding'),
+                        'sector': stock_data.get('sector'),
+                        'sector_detail': stock_data.get('sector_detail'),
+                        'updated_at': now
+                    })
+
+                if stock_data.get('current_price') is None:
+                    # 현재가 조회 실패(재시도 소진 등): NULL 시세로 히스토리/최신 스냅샷을 덮어쓰지 않고 실패 종목으로 보고
+                    raise KisFetchItemError("현재가 응답 없음")
+
+                buffers['histories'].append(StockService._build_history_row(stock_id, stock_data, today))
+                buffers['latest_snapshots'].append(StockService._build_latest_snapshot(stock_id, stock_data))
+                if is_trading_day and stock_data.get('day_open') is not None:
+                    buffers['candles'].append(StockService._build_candle_row(stock_id, stock_data, today))
+
+                if len(buffers['histories']) >= HISTORY_WRITE_BATCH_SIZE:
+                    try:
+                        StockService._flush_sync_buffers(buffers)
+                    except Exception as e:
+                        # 종목별 실패가 아니라 배치 기록 실패 -> 남은 조회를 취소하고 동기화 중단
+                        raise KisFetchAbort(f"배치 기록 실패: {e}") from e
+
+            engine = KisFetchEngine(
+                kis_api.fetch_stock_basic_info_and_history_from_kis,
+                calls_per_item=2  # 기본정보 + 현재가
+            )
+            report = engine.run(list(stock_ids.keys()), collect_stock_data)
+            
+            StockService._flush_sync_buffers(buffers)
+            StockService.publish_master()  # 발행주식수/업종 갱신
+            StockService.publish_snapshot()
+            CandleService.publish_candles()
+            StockService.refresh_search_index()  # 거래대금 순위 반영 (나머지 워커는 바뀐 버전을 보고 다음 검색 때 재구성)
+
+            current_app.logger.info(
+                f"통합 업데이트 완료: {report['succeeded']}개 성공, {report['failed']}개 실패, "
+                f"{report['elapsed_seconds']}초 소요 (이론상 최소 {report['theoretical_min_seconds']}초, "
+                f"{report['calls_per_second']}건/초)"
+            )
+            session_stats = kis_session.get_stats()
+            current_app.logger.info(
+                f"KIS 세션 통계: 요청 {session_stats['requests']}건, 재시도 {session_stats['retries']}건, "
+                f"새 연결 {session_stats['new_connections']}개, 재사용 {session_stats['reused_connections']}건"
+            )
+            if report['failures']:
+                failed_samples = list(report['failures'].items())[:20]
+                current_app.logger.warning(f"통합 업데이트 실패 종목 (최대 20개): {failed_samples}")
+
+            return report['succeeded']
             
         except Exception as e:
             current_app.logger.error(f"통합 업데이트 실패: {e}")
             db.session.rollback()
             raise e
-    
+
     @staticmethod
-    def _create_stock_history(stock_id, stock_data):
-        """StockHistory 객체 생성"""
-        return StockHistory(
-            stock_id=stock_id,
-            current_price=stock_data.get('current_price'),
-            previous_close=stock_data.get('previous_close'),
-            change_rate=stock_data.get('change_rate'),
-            change_amount=stock_data.get('change_amount'),
-            day_open=stock_data.get('day_open'),
-            day_high=stock_data.get('day_high'),
-            day_low=stock_data.get('day_low'),
-            daily_volume=stock_data.get('daily_volume'),
-            market_cap=stock_data.get('market_cap'),
-            week52_high=stock_data.get('week52_high'),
-            week52_low=stock_data.get('week52_low'),
-            per=stock_data.get('per'),
-            pbr=stock_data.get('pbr'),
-            updated_at=datetime.now()
-        )
+    def _flush_sync_buffers(buffers):
+        """수집된 동기화 결과를 다중행 문장으로 기록하고 커밋"""
+        if not buffers['histories'] and not buffers['stocks']:
+            return
+
+        try:
+            if buffers['stocks']:
+                # 기본키 기준 ORM 일괄 UPDATE (executemany)
+                db.session.execute(update(Stock), buffers['stocks'])
+            StockService._bulk_upsert_stock_histories(buffers['histories'])
+            StockService._upsert_stock_latest(buffers['latest_snapshots'])
+            CandleService.upsert_candles(buffers['candles'])
+            db.session.commit()
+
+            current_app.logger.info(f"통합 업데이트 배치 기록: {len(buffers['histories'])}개")
+            for rows in buffers.values():
+                rows.clear()
+
+        except Exception as e:
+            # 호출자(update_stock_info_and_history)가 동기화를 중단 -> 다음 실행에서 같은 날짜 행을 다시 UPSERT
+            current_app.logger.error(f"통합 업데이트 배치 기록 실패: {e}")
+            db.session.rollback()
+            raise e
 
     @staticmethod
-    def _update_stock_history(history, stock_data):
-        """기존 StockHistory 업데이트"""
-        history.current_price = stock_data.get('current_price')
-        history.previous_close = stock_data.get('previous_close')
-        history.change_rate = stock_data.get('change_rate')
-        history.change_amount = stock_data.get('change_amount')
-        history.day_open = stock_data.get('day_open')
-        history.day_high = stock_data.get('day_high')
-        history.day_low = stock_data.get('day_low')
-        history.daily_volume = stock_data.get('daily_volume')
-        history.market_cap = stock_data.get('market_cap')
-        history.week52_high = stock_data.get('week52_high')
-        history.week52_low = stock_data.get('week52_low')
-        history.per = stock_data.get('per')
-        history.pbr = stock_data.get('pbr')
-        history.updated_at = datetime.now()
+    def _build_history_row(stock_id, stock_data, trade_date):
+        """stock_histories 행 데이터 생성"""
+        row = {col: stock_data.get(col) for col in QUOTE_COLUMNS}
+        row['stock_id'] = stock_id
+        row['trade_date'] = trade_date
+        row['trading_value'] = StockService._calc_trading_value(stock_data)
+        row['updated_at'] = datetime.now()
+        return row
 
     @staticmethod
-    def get_all_stocks():
-        """DB에서 모든 종목 조회"""
+    def is_market_open_day(kis_api, target_date):
+        """
+        target_date가 개장일인지 (KIS 국내휴장일조회, 결과는 날짜별로 Redis에 하루 보관)
+        주말은 조회하지 않고 False, 조회에 실패하면 평일 여부로 판단
+        """
+        if target_date.weekday() >= 5:
+            return False
+
+        cache_key = f"market_open_day:{target_date.strftime('%Y%m%d')}"
+        cached = CacheService.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            stocks = Stock.query.all()
-            return [
-                {
-                    'id': stock.id,
-                    'stock_code': stock.stock_code,
-                    'stock_name': stock.stock_name,
-                    'market': stock.market,
-                    'sector': stock.sector,
-                    'sector_detail': stock.sector_detail,
-                    'company_info': stock.company_info,
-                    'shares_outstanding': stock.shares_outstanding,
-                    'updated_at': stock.updated_at.isoformat() if stock.updated_at else None
-                }
-                for stock in stocks
-            ]
+            open_days = kis_api.fetch_market_open_days(target_date)
         except Exception as e:
-            current_app.logger.error(f"종목 조회 중 오류: {e}")
-            raise e
+            current_app.logger.warning(f"⚠️ 휴장일 조회 실패, 평일 기준으로 판단: {e}")
+            return True
+
+        # 한 번의 조회로 받은 이후 날짜도 함께 보관
+        for day, is_open in open_days.items():
+            CacheService.set_with_ttl(f"market_open_day:{day.strftime('%Y%m%d')}", is_open, MARKET_OPEN_DAY_CACHE_TTL)
+
+        if target_date not in open_days:
+            current_app.logger.warning(f"⚠️ 휴장일 조회 결과에 {target_date}가 없어 평일 기준으로 판단")
+            return True
+        return open_days[target_date]
+
+    @staticmethod
+    def _build_candle_row(stock_id, stock_data, trade_date):
+        """stock_candles 당일 일봉 행 (종가 = 장 마감 후 현재가)"""
+        return {
+            'stock_id': stock_id,
+            'trade_date': trade_date,
+            'open_price': stock_data.get('day_open'),
+            'high_price': stock_data.get('day_high'),
+            'low_price': stock_data.get('day_low'),
+            'close_price': stock_data.get('current_price'),
+            'volume': stock_data.get('daily_volume'),
+            'trading_value': StockService._calc_trading_value(stock_data),
+            'updated_at': datetime.now()
+        }
+
+    @staticmethod
+    def _calc_trading_value(stock_data):
+        """거래대금 = 현재가 × 거래량 (둘 중 하나라도 없으면 None)"""
+        current_price = stock_data.get('current_price')
+        daily_volume = stock_data.get('daily_volume')
+        if current_price is None or daily_volume is None:
+            return None
+        return int(current_price * daily_volume)
+
+    @staticmethod
+    def _bulk_upsert_stock_histories(rows):
+        """(stock_id, trade_date) 기준 일괄 UPSERT (커밋은 호출자가 담당)"""
+        for i in range(0, len(rows), HISTORY_WRITE_BATCH_SIZE):
+            chunk = rows[i:i + HISTORY_WRITE_BATCH_SIZE]
+            stmt = insert(StockHistory).values(chunk)
+            stmt = stmt.on_duplicate_key_update({
+                col: stmt.inserted[col] for col in QUOTE_COLUMNS + ['trading_value', 'updated_at']
+            })
+            db.session.execute(stmt)
+        return len(rows)
+
+    # ========== 최신 시세 스냅샷 (stock_latest) ==========
+
+    @staticmethod
+    def _build_latest_snapshot(stock_id, stock_data):
+        """stock_latest 행 데이터 생성"""
+        snapshot = {col: stock_data.get(col) for col in QUOTE_COLUMNS}
+        snapshot['stock_id'] = stock_id
+        snapshot['trading_value'] = StockService._calc_trading_value(stock_data)
+        snapshot['updated_at'] = datetime.now()
+        return snapshot
+
+    @staticmethod
+    def _upsert_stock_latest(snapshots):
+        """stock_latest 일괄 UPSERT (커밋은 호출자가 담당)"""
+        if not snapshots:
+            return 0
+
+        stmt = insert(StockLatest).values(snapshots)
+        stmt = stmt.on_duplicate_key_update({
+            col: stmt.inserted[col] for col in QUOTE_COLUMNS + ['trading_value', 'updated_at']
+        })
+        db.session.execute(stmt)
+        return len(snapshots)
 
     @staticmethod
-    def search_stocks(keyword):
-        """종목명으로 검색"""
+    def rebuild_stock_latest():
+        """stock_histories의 종목별 최신 이력으로 stock_latest 재구성 (최초 1회/복구용)"""
         try:
-            # 각 종목의 최신 StockHistory를 선택하기 위한 서브쿼리
             latest_history_subq = db.session.query(
                 StockHistory.stock_id.label('stock_id'),
                 func.max(StockHistory.updated_at).label('max_updated_at')
             ).group_by(StockHistory.stock_id).subquery()
 
-            # Stock과 최신 StockHistory 조인하여 검색
-            results = (
-                db.session.query(
-                    Stock.id,
-                    Stock.stock_code,
-                    Stock.stock_name,
-                    Stock.market,
-                    Stock.sector,
-                    Stock.sector_detail,
-                    Stock.company_info,
-                    Stock.shares_outstanding,
-                    Stock.updated_at,
-                    StockHistory.current_price,
-                    StockHistory.previous_close,
-                    StockHistory.change_rate,
-                    StockHistory.change_amount,
-                    StockHistory.day_open,
-                    StockHistory.day_high,
-                    StockHistory.day_low,
-                    StockHistory.daily_volume,
-                    StockHistory.market_cap,
-                    StockHistory.week52_high,
-                    StockHistory.week52_low,
-                    StockHistory.per,
-                    StockHistory.pbr,
-                    StockHistory.updated_at.label('history_updated_at')
-                )
-                .outerjoin(StockHistory, Stock.id == StockHistory.stock_id)
-                .outerjoin(
+            columns = ['stock_id'] + QUOTE_COLUMNS + ['trading_value', 'updated_at']
+            select_stmt = (
+                db.select(*[getattr(StockHistory, col) for col in columns])
+                .join(
                     latest_history_subq,
                     and_(
                         StockHistory.stock_id == latest_history_subq.c.stock_id,
                         StockHistory.updated_at == latest_history_subq.c.max_updated_at
                     )
                 )
-                .filter(Stock.stock_name.contains(keyword))
-                .limit(100)
-                .all()
             )
-            
-            # 결과를 딕셔너리 리스트로 변환
-            return [
-                {
-                    'id': result.id,
-                    'stock_code': result.stock_code,
-                    'stock_name': result.stock_name,
-                    'market': result.market,
-                    'sector': result.sector,
-                    'sector_detail': result.sector_detail,
-                    'company_info': result.company_info,
-                    'shares_outstanding': int(result.shares_outstanding) if result.shares_outstanding else None,
-                    'updated_at': result.updated_at.isoformat() if result.updated_at else None,
-                    'current_price': float(result.current_price) if result.current_price else None,
-                    'previous_close': float(result.previous_close) if result.previous_close else None,
-                    'change_rate': float(result.change_rate) if result.change_rate else None,
-                    'change_amount': float(result.change_amount) if result.change_amount else None,
-                    'day_open': float(result.day_open) if result.day_open else None,
-                    'day_high': float(result.day_high) if result.day_high else None,
-                    'day_low': float(result.day_low) if result.day_low else None,
-                    'daily_volume': int(result.daily_volume) if result.daily_volume else None,
-                    'market_cap': int(result.market_cap) if result.market_cap else None,
-                    'week52_high': float(result.week52_high) if result.week52_high else None,
-                    'week52_low': float(result.week52_low) if result.week52_low else None,
-                    'per': float(result.per) if result.per else None,
-                    'pbr': float(result.pbr) if result.pbr else None,
-                    'history_updated_at': result.history_updated_at.isoformat() if result.history_updated_at else None
-                }
-                for result in results
-            ]
+
+            stmt = insert(StockLatest).from_select(columns, select_stmt)
+            stmt = stmt.on_duplicate_key_update({
+                col: stmt.inserted[col] for col in QUOTE_COLUMNS + ['trading_value', 'updated_at']
+            })
+            result = db.session.execute(stmt)
+            db.session.commit()
+            StockService.publish_snapshot()
+
+            current_app.logger.info(f"stock_latest 재구성 완료: {result.rowcount}행")
+            return result.rowcount
+
         except Exception as e:
-            current_app.logger.error(f"종목 검색 중 오류: {e}")
+            current_app.logger.error(f"stock_latest 재구성 실패: {e}")
+            db.session.rollback()
             raise e
 
     @staticmethod
-    def get_stock_by_id(id):
-        """ID로 단일 종목 조회"""
+    def publish_snapshot():
+        """스냅샷 변경 알림: 버전을 올려 순위 등 파생 캐시를 무효화"""
+        return CacheService.bump_version(SNAPSHOT_VERSION)
+
+    @staticmethod
+    def publish_master():
+        """종목 마스터 변경 알림: 버전을 올리고 이 프로세스의 /all 응답 캐시를 비움"""
+        _all_stocks_payloads.clear()
+        return CacheService.bump_version(MASTER_VERSION)
+
+    @staticmethod
+    def apply_realtime_quotes(quotes):
+        """
+        실시간 체결가를 stock_latest에 반영 (호출부에서 LATEST_FLUSH_INTERVAL마다 일괄 호출)
+        반영된 행이 있으면 스냅샷 버전을 바로 올려 시세 ETag와 순위 캐시가 새 값을 가리키게 함
+        quotes: [{'stock_code', 'current_price', 'change_rate', 'change_amount', 'daily_volume'(누적거래량)}, ...]
+        """
+        if not quotes:
+            return 0
+
         try:
-            # 각 종목의 최신 StockHistory를 선택하기 위한 서브쿼리
-            latest_history_subq = db.session.query(
-                StockHistory.stock_id.label('stock_id'),
-                func.max(StockHistory.updated_at).label('max_updated_at')
-            ).group_by(StockHistory.stock_id).subquery()
+            result = db.session.execute(
+                text("""
+                    UPDATE stock_latest sl
+                    JOIN stocks s ON s.id = sl.stock_id
+                    SET sl.current_price = :current_price,
+                        sl.change_rate = :change_rate,
+                        sl.change_amount = :change_amount,
+                        sl.daily_volume = COALESCE(NULLIF(:daily_volume, 0), sl.daily_volume),
+                        sl.trading_value = CAST(:current_price * COALESCE(NULLIF(:daily_volume, 0), sl.daily_volume) AS SIGNED),
+                        sl.updated_at = NOW()
+                    WHERE s.stock_code = :stock_code
+                """),
+                quotes
+            )
+            db.session.commit()
+            if result.rowcount != 0:  # -1: 드라이버가 행 수를 모르면 반영된 것으로 간주
+                StockService.publish_snapshot()
+            return len(quotes)
+
+        except Exception as e:
+            current_app.logger.error(f"실시간 시세 스냅샷 반영 실패: {e}")
+            db.session.rollback()
+            return 0
+
+    @staticmethod
+    def get_all_stocks(fields=STOCK_MASTER_FIELDS, cursor=None, limit=None):
+        """
+        DB에서 종목 조회 (상장폐지 종목 제외, 요청 필드만)
+        cursor: 이전 페이지 마지막 종목 id, limit: 페이지 크기 (없으면 전체)
+        return -> (종목 목록, 다음 페이지 cursor 또는 None)
+        """
+        try:
+            fields = tuple(fields)
+            # 커서 계산을 위해 id는 항상 조회
+            serializer = get_serializer(tuple(dict.fromkeys(('id',) + fields)))
+
+            query = StockService._query_quotes(serializer, Stock.is_active.is_(True))
+            if cursor is not None:
+                query = query.filter(Stock.id > cursor)
+            query = query.order_by(Stock.id)
+            if limit is not None:
+                query = query.limit(limit + 1)  # 다음 페이지 존재 여부 확인용 1행 추가
+
+            rows = query.all()
+            next_cursor = None
+            if limit is not None and len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = rows[-1].id
+
+            stocks = serializer.serialize_all(rows)
+            if 'id' not in fields:
+                for stock in stocks:
+                    del stock['id']
+            return stocks, next_cursor
+        except Exception as e:
+            current_app.logger.error(f"종목 조회 중 오류: {e}")
+            raise e
+
+    @staticmethod
+    def get_all_stocks_payload(fields=STOCK_MASTER_FIELDS, cursor=None, limit=None):
+        """
+        /api/stock/all 응답 본문 (JSON + gzip) 과 ETag
+        마스터 버전이 같으면 프로세스 내 캐시를 그대로 반환하므로 재직렬화/재압축하지 않는다.
+        """
+        if limit is not None and not 1 <= limit <= ALL_STOCKS_MAX_PAGE_SIZE:
+            raise ValueError(f"limit은 1~{ALL_STOCKS_MAX_PAGE_SIZE} 사이여야 합니다.")
+
+        version = CacheService.get_version(MASTER_VERSION)
+        key = (version, tuple(fields), cursor, limit)
+
+        payload = _all_stocks_payloads.get(key)
+        if payload and time.monotonic() - payload['created_at'] < ALL_STOCKS_PAYLOAD_TTL:
+            return payload
+
+        stocks, next_cursor = StockService.get_all_stocks(fields, cursor, limit)
+        body = current_app.json.dumps({
+            'success': True,
+            'data': stocks,
+            'count': len(stocks),
+            'next_cursor': next_cursor
+        }).encode('utf-8')
+
+        payload = {
+            'etag': f"stocks-{version}-{hashlib.sha1(body).hexdigest()[:16]}",
+            'body': body,
+            'gzip_body': gzip.compress(body, compresslevel=6, mtime=0),
+            'created_at': time.monotonic()
+        }
+
+        # 가장 오래된 항목부터 제거
+        while len(_all_stocks_payloads) >= ALL_STOCKS_PAYLOAD_CACHE_SIZE:
+            _all_stocks_payloads.pop(next(iter(_all_stocks_payloads)), None)
+        _all_stocks_payloads[key] = payload
+        return payload
+
+    @staticmethod
+    def _query_quotes(serializer, *criteria):
+        """직렬화기의 컬럼만 SELECT (시세 필드가 없으면 stock_latest 조인 생략)"""
+        query = db.session.query(*serializer.columns).select_from(Stock)
+        if serializer.needs_latest:
+            query = query.outerjoin(StockLatest, Stock.id == StockLatest.stock_id)
+        return query.filter(*criteria)
 
-            # Stock과 최신 StockHistory 조회
-            result = (
+    @staticmethod
+    def refresh_search_index(versions=None):
+        """
+        활성 종목으로 메모리 검색 인덱스 재구성 (실패해도 기존 인덱스 유지)
+        versions: 이미 확인한 데이터 버전 (없으면 조회 전에 읽어 인덱스와 함께 보관)
+        """
+        try:
+            if versions is None:
+                versions = CacheService.get_versions(SEARCH_INDEX_VERSIONS)
+            rows = (
                 db.session.query(
                     Stock.id,
                     Stock.stock_code,
                     Stock.stock_name,
                     Stock.market,
-                    Stock.sector,
-                    Stock.sector_detail,
-                    Stock.company_info,
-                    Stock.shares_outstanding,
-                    Stock.updated_at,
-                    StockHistory.current_price,
-                    StockHistory.previous_close,
-                    StockHistory.change_rate,
-                    StockHistory.change_amount,
-                    StockHistory.day_open,
-                    StockHistory.day_high,
-                    StockHistory.day_low,
-                    StockHistory.daily_volume,
-                    StockHistory.market_cap,
-                    StockHistory.week52_high,
-                    StockHistory.week52_low,
-                    StockHistory.per,
-                    StockHistory.pbr,
-                    StockHistory.updated_at.label('history_updated_at')
+                    StockLatest.trading_value,
+                    StockLatest.current_price
                 )
-                .outerjoin(StockHistory, Stock.id == StockHistory.stock_id)
-                .outerjoin(
-                    latest_history_subq,
-                    and_(
-                        StockHistory.stock_id == latest_history_subq.c.stock_id,
-                        StockHistory.updated_at == latest_history_subq.c.max_updated_at
+                .outerjoin(StockLatest, Stock.id == StockLatest.stock_id)
+                .filter(Stock.is_active.is_(True))
+                .all()
+            )
+            count = stock_search_index.build(rows, built_at=datetime.now(), versions=versions)
+            current_app.logger.info(f"종목 검색 인덱스 재구성: {count}개")
+            return count
+        except Exception as e:
+            current_app.logger.error(f"종목 검색 인덱스 재구성 실패: {e}")
+            return 0
+
+    @staticmethod
+    def _ensure_search_index():
+        """
+        검색 인덱스가 비었거나 만든 뒤 마스터/스냅샷 버전이 바뀌었으면 재구성
+        (동기화는 한 워커에서만 돌므로 나머지 워커는 여기서 따라잡음, Redis를 쓸 수 없으면 기존 인덱스 유지)
+        """
+        def is_stale(versions):
+            if not stock_search_index.is_ready:
+                return True
+            return versions is not None and versions != stock_search_index.versions
+
+        versions = CacheService.get_versions(SEARCH_INDEX_VERSIONS)
+        if not is_stale(versions):
+            return
+
+        with _search_index_lock:
+            # 기다리는 동안 다른 요청이 재구성했으면 그대로 사용
+            if is_stale(versions):
+                StockService.refresh_search_index(versions)
+
+    @staticmethod
+    def autocomplete_stocks(keyword, k=10):
+        """검색창 자동완성: 메모리 인덱스에서 상위 k개 (DB 조회 없음)"""
+        StockService._ensure_search_index()
+
+        return [
+            {
+                'stock_code': entry.stock_code,
+                'stock_name': entry.stock_name,
+                'market': entry.market,
+                'current_price': entry.current_price
+            }
+            for entry in stock_search_index.autocomplete(keyword, k)
+        ]
+
+    @staticmethod
+    def search_stocks(keyword, fields=STOCK_DETAIL_FIELDS):
+        """종목명/종목코드/초성으로 검색 (메모리 인덱스 우선, 인덱스가 비어 있으면 DB LIKE 검색)"""
+        try:
+            serializer = get_serializer(tuple(fields))
+
+            StockService._ensure_search_index()
+            if not stock_search_index.is_ready:
+                # Stock과 최신 시세 스냅샷 조인하여 검색 (요청 필드만 조회)
+                results = (
+                    StockService._query_quotes(
+                        serializer,
+                        Stock.is_active.is_(True),
+                        Stock.stock_name.contains(keyword)
                     )
+                    .limit(SEARCH_RESULT_LIMIT)
+                    .all()
                 )
-                .filter(Stock.id == id)
-                .first()
-            )
+                return serializer.serialize_all(results)
+
+            # 1. 인덱스에서 순위가 매겨진 종목 ID 조회
+            stock_ids = [entry.stock_id for entry in stock_search_index.search(keyword, SEARCH_RESULT_LIMIT)]
+            if not stock_ids:
+                return []
+
+            # 2. 기본키로 요청 필드만 조회 후 인덱스 순서대로 정렬
+            id_serializer = get_serializer(tuple(dict.fromkeys(('id',) + serializer.fields)))
+            rows = StockService._query_quotes(
+                id_serializer,
+                Stock.id.in_(stock_ids),
+                Stock.is_active.is_(True)  # 인덱스 재구성 전 상장폐지된 종목 제외
+            ).all()
+            by_id = {row.id: row for row in rows}
+
+            results = []
+            for stock_id in stock_ids:
+                row = by_id.get(stock_id)
+                if row is None:
+                    continue
+                stock = id_serializer.serialize(row)
+                if 'id' not in serializer.fields:
+                    del stock['id']
+                results.append(stock)
+            return results
+        except Exception as e:
+            current_app.logger.error(f"종목 검색 중 오류: {e}")
+            raise e
+
+    @staticmethod
+    def get_stock_by_id(id, fields=STOCK_DETAIL_FIELDS):
+        """ID로 단일 종목 조회"""
+        try:
+            serializer = get_serializer(tuple(fields))
+
+            # Stock과 최신 시세 스냅샷 조회
+            result = StockService._query_quotes(serializer, Stock.id == id).first()
             
             if not result:
                 return None
 
-            company_info = ask_gpt_company_info(result.stock_code)
+            stock = serializer.serialize(result)
 
-            if 'error' in company_info:
-                company_info = result.company_info
-            else:
-                company_info = company_info.get('summary')
+            # 기업 개요는 요청된 경우에만 생성
+            if 'company_info' in stock:
+                company_info = ask_gpt_company_info(stock['stock_code'])
+
+                if 'error' not in company_info:
+                    stock['company_info'] = company_info.get('summary')
             
-            return {
-                'id': result.id,
-                'stock_code': result.stock_code,
-                'stock_name': result.stock_name,
-                'market': result.market,
-                'sector': result.sector,
-                'sector_detail': result.sector_detail,
-                'company_info': company_info,
-                'shares_outstanding': int(result.shares_outstanding) if result.shares_outstanding else None,
-                'updated_at': result.updated_at.isoformat() if result.updated_at else None,
-                'current_price': float(result.current_price) if result.current_price else None,
-                'previous_close': float(result.previous_close) if result.previous_close else None,
-                'change_rate': float(result.change_rate) if result.change_rate else None,
-                'change_amount': float(result.change_amount) if result.change_amount else None,
-                'day_open': float(result.day_open) if result.day_open else None,
-                'day_high': float(result.day_high) if result.day_high else None,
-                'day_low': float(result.day_low) if result.day_low else None,
-                'daily_volume': int(result.daily_volume) if result.daily_volume else None,
-                'market_cap': int(result.market_cap) if result.market_cap else None,
-                'week52_high': float(result.week52_high) if result.week52_high else None,
-                'week52_low': float(result.week52_low) if result.week52_low else None,
-                'per': float(result.per) if result.per else None,
-                'pbr': float(result.pbr) if result.pbr else None,
-                'history_updated_at': result.history_updated_at.isoformat() if result.history_updated_at else None
-            }
+            return stock
 
         except Exception as e:
             current_app.logger.error(f"단일 종목 조회 중 오류: {e}")
             raise e
 
     @staticmethod
-    def get_stock_by_code(stock_code):
+    def get_stock_by_code(stock_code, fields=STOCK_DETAIL_FIELDS):
         """종목 코드로 단일 종목 조회"""
         try:
-            # 각 종목의 최신 StockHistory를 선택하기 위한 서브쿼리
-            latest_history_subq = db.session.query(
-                StockHistory.stock_id.label('stock_id'),
-                func.max(StockHistory.updated_at).label('max_updated_at')
-            ).group_by(StockHistory.stock_id).subquery()
+            serializer = get_serializer(tuple(fields))
 
-            # Stock과 최신 StockHistory 조회
-            result = (
-                db.session.query(
-                    Stock.id,
-                    Stock.stock_code,
-                    Stock.stock_name,
-                    Stock.market,
-                    Stock.sector,
-                    Stock.sector_detail,
-                    Stock.company_info,
-                    Stock.shares_outstanding,
-                    Stock.updated_at,
-                    StockHistory.current_price,
-                    StockHistory.previous_close,
-                    StockHistory.change_rate,
-                    StockHistory.change_amount,
-                    StockHistory.day_open,
-                    StockHistory.day_high,
-                    StockHistory.day_low,
-                    StockHistory.daily_volume,
-                    StockHistory.market_cap,
-                    StockHistory.week52_high,
-                    StockHistory.week52_low,
-                    StockHistory.per,
-                    StockHistory.pbr,
-                    StockHistory.updated_at.label('history_updated_at')
-                )
-                .outerjoin(StockHistory, Stock.id == StockHistory.stock_id)
-                .outerjoin(
-                    latest_history_subq,
-                    and_(
-                        Stock.id == latest_history_subq.c.stock_id,
-                        StockHistory.updated_at == latest_history_subq.c.max_updated_at
-                    )
-                )
-                .filter(Stock.stock_code == stock_code)
-                .first()
-            )
+            # Stock과 최신 시세 스냅샷 조회
+            result = StockService._query_quotes(serializer, Stock.stock_code == stock_code).first()
 
             if not result:
                 return None
 
-            return {
-                'id': result.id,
-                'stock_code': result.stock_code,
-                'stock_name': result.stock_name,
-                'market': result.market,
-                'sector': result.sector,
-                'sector_detail': result.sector_detail,
-                'company_info': result.company_info,
-                'shares_outstanding': int(result.shares_outstanding) if result.shares_outstanding else None,
-                'updated_at': result.updated_at.isoformat() if result.updated_at else None,
-                'current_price': float(result.current_price) if result.current_price else None,
-                'previous_close': float(result.previous_close) if result.previous_close else None,
-                'change_rate': float(result.change_rate) if result.change_rate else None,
-                'change_amount': float(result.change_amount) if result.change_amount else None,
-                'day_open': float(result.day_open) if result.day_open else None,
-                'day_high': float(result.day_high) if result.day_high else None,
-                'day_low': float(result.day_low) if result.day_low else None,
-                'daily_volume': int(result.daily_volume) if result.daily_volume else None,
-                'market_cap': int(result.market_cap) if result.market_cap else None,
-                'week52_high': float(result.week52_high) if result.week52_high else None,
-                'week52_low': float(result.week52_low) if result.week52_low else None,
-                'per': float(result.per) if result.per else None,
-                'pbr': float(result.pbr) if result.pbr else None,
-                'history_updated_at': result.history_updated_at.isoformat() if result.history_updated_at else None
-            }
+            return serializer.serialize(result)
 
         except Exception as e:
             current_app.logger.error(f"종목 코드 조회 중 오류: {e}")
             raise e
 
     @staticmethod
-    def get_volume_ranking(limit=28):
+    def get_volume_ranking(limit=28, fields=RANKING_FIELDS):
         """거래대금 순위 조회 (캐시 우선, 없으면 DB에서 계산)"""
         try:
-            # 2. 캐시가 없으면 DB에서 계산
-            
-            # 각 종목의 최신 StockHistory를 선택하기 위한 서브쿼리
-            latest_history_subq = db.session.query(
-                StockHistory.stock_id.label('stock_id'),
-                func.max(StockHistory.updated_at).label('max_updated_at')
-            ).group_by(StockHistory.stock_id).subquery()
-
-            # 거래대금 = 현재가 × 거래량 (최신 이력 기준)
+            fields = tuple(fields)
+            serializer = get_serializer(fields)
+
+            # 1. 현재 스냅샷 버전의 캐시 확인 (필드 조합별)
+            cache_key = f"volume_ranking:{CacheService.get_version(SNAPSHOT_VERSION)}:{limit}"
+            if fields != RANKING_FIELDS:
+                cache_key += f":{','.join(fields)}"
+            cached = CacheService.get(cache_key)
+            if cached is not None:
+                return cached
+
+            # 2. 캐시가 없으면 DB에서 계산 (기록 시 저장된 trading_value 기준)
             ranking_query = (
-                db.session.query(
-                    Stock.stock_code,
-                    Stock.stock_name,
-                    Stock.market,
-                    Stock.sector,
-                    Stock.sector_detail,
-                    Stock.company_info,
-                    Stock.shares_outstanding,
-                    StockHistory.current_price,
-                    StockHistory.previous_close,
-                    StockHistory.change_rate,
-                    StockHistory.change_amount,
-                    StockHistory.day_open,
-                    StockHistory.day_high,
-                    StockHistory.day_low,
-                    StockHistory.daily_volume,
-                    StockHistory.market_cap,
-                    StockHistory.week52_high,
-                    StockHistory.week52_low,
-                    StockHistory.per,
-                    StockHistory.pbr,
-                    func.cast(
-                        StockHistory.current_price * StockHistory.daily_volume,
-                        db.BigInteger
-                    ).label('trading_value')
-                )
-                # Stock.id와 StockHistory.stock_id 조인
-                .join(StockHistory, Stock.id == StockHistory.stock_id)
-                # 최신 이력만 선택
-                .join(
-                    latest_history_subq,
-                    and_(
-                        StockHistory.stock_id == latest_history_subq.c.stock_id,
-                        StockHistory.updated_at == latest_history_subq.c.max_updated_at
-                    )
-                )
+                db.session.query(*serializer.columns)
+                .select_from(Stock)
+                # 종목별 최신 시세 스냅샷 조인
+                .join(StockLatest, Stock.id == StockLatest.stock_id)
                 .filter(
-                    StockHistory.current_price.isnot(None),
-                    StockHistory.daily_volume.isnot(None)
-                )
-                .order_by(
-                    func.cast(
-                        StockHistory.current_price * StockHistory.daily_volume,
-                        db.BigInteger
-                    ).desc()
+                    Stock.is_active.is_(True),
+                    StockLatest.trading_value.isnot(None)
                 )
+                # 기록 시 계산된 거래대금 인덱스를 역순으로 읽고 limit에서 중단
+                .order_by(StockLatest.trading_value.desc())
                 .limit(limit)
             )
             
-            results = []
-            for row in ranking_query:
-                results.append({
-                    # Stock 정보
-                    'stock_code': row.stock_code,
-                    'stock_name': row.stock_name,
-                    'market': row.market,
-                    'sector': row.sector,
-                    'sector_detail': row.sector_detail,
-                    'company_info': row.company_info,
-                    'shares_outstanding': int(row.shares_outstanding) if row.shares_outstanding else None,
-                    
-                    # StockHistory 정보
-                    'current_price': float(row.current_price) if row.current_price else None,
-                    'previous_close': float(row.previous_close) if row.previous_close else None,
-                    'change_rate': float(row.change_rate) if row.change_rate else None,
-                    'change_amount': float(row.change_amount) if row.change_amount else None,
-                    'day_open': float(row.day_open) if row.day_open else None,
-                    'day_high': float(row.day_high) if row.day_high else None,
-                    'day_low': float(row.day_low) if row.day_low else None,
-                    'daily_volume': int(row.daily_volume) if row.daily_volume else None,
-                    'market_cap': int(row.market_cap) if row.market_cap else None,
-                    'week52_high': float(row.week52_high) if row.week52_high else None,
-                    'week52_low': float(row.week52_low) if row.week52_low else None,
-                    'per': float(row.per) if row.per else None,
-                    'pbr': float(row.pbr) if row.pbr else None,
-                    'trading_value': int(row.trading_value) if getattr(row, 'trading_value', None) is not None else None
-                })
+            results = serializer.serialize_all(ranking_query)
             
+            CacheService.set_with_ttl(cache_key, results, VOLUME_RANKING_CACHE_TTL)
             return results
             
         except Exception as e:
@@ -641,110 +814,24 @@ class StockService:
 
     @staticmethod
     def _get_5min_chart(stock_code):
-        """1일 5분봉 차트 비즈니스 로직"""
+        """1일 5분봉 차트 (저장된 1분봉 집계)"""
         try:
-            current_app.logger.info(f"5분봉 차트 생성 시작: {stock_code}")
-            kis_api = KisAPI()
-            
-            # 1. API 호출
-            api_result = kis_api.fetch_minute_data_raw(stock_code)
-            
-            if not api_result['success']:
-                current_app.logger.warning(f"5분봉 API 호출 실패: {api_result['message']}")
-                return []
-            
-            # 2. 데이터 파싱
-            minute_data = StockService._parse_minute_data(api_result['data'])
-            
-            if not minute_data:
-                current_app.logger.warning(f"5분봉 파싱된 데이터 없음: {stock_code}")
-                return []
-            
-            # 3. 5분봉 집계
-            chart_data = StockService._aggregate_to_5min(minute_data)
-            
-            current_app.logger.info(f"5분봉 생성 완료: {len(chart_data)}개")
-            return chart_data
-            
+            chart = MinuteBarService.get_chart(stock_code, '5m', 1)
+            return chart['candleData'] if chart else []
+
         except Exception as e:
             current_app.logger.error(f"5분봉 차트 생성 실패: {e}")
             return []
 
     @staticmethod
     def _get_1hour_chart(stock_code):
-        """1주 1시간봉 차트 비즈니스 로직"""
+        """1주 1시간봉 차트 (저장된 1분봉 집계)"""
         try:
-            current_app.logger.info(f"1시간봉 차트 생성 시작 (일봉 변환 방식): {stock_code}")
-            
-            # 1. 최근 7일 일봉 데이터 가져오기
-            daily_data = StockService._get_daily_chart(stock_code, 7)
-            
-            if not daily_data:
-                current_app.logger.warning(f"일봉 데이터 없음: {stock_code}")
-                return []
-            
-            hourly_data = []
-            
-            # 2. 각 일봉을 6개 시간봉으로 분할
-            for daily in daily_data:
-                date = daily['date']
-                
-                # 장 시간: 09:00, 10:00, 11:00, 13:00, 14:00, 15:00
-                trading_hours = ['09', '10', '11', '13', '14', '15']
-                
-                # 가격 범위를 6시간으로 분할
-                price_range = daily['high'] - daily['low']
-                volume_per_hour = daily['volume'] // 6
-                
-                previous_close = daily['open']  # 첫 시간의 시작점
-                
-                for i, hour in enumerate(trading_hours):
-                    # 각 시간의 가격 변동 패턴을 자연스럽게 생성
-                    if i == 0:
-                        # 09시: 시가에서 시작
-                        hour_open = daily['open']
-                        hour_close = daily['open'] + (price_range * 0.15)  # 적당한 변동
-                    elif i == len(trading_hours) - 1:
-                        # 15시: 종가로 마무리
-                        hour_open = previous_close
-                        hour_close = daily['close']
-                    else:
-                        # 중간 시간들: 점진적 변화
-                        hour_open = previous_close
-                        progress = (i + 1) / len(trading_hours)
-                        hour_close = daily['open'] + (daily['close'] - daily['open']) * progress
-                    
-                    # 고가/저가 설정
-                    hour_high = max(hour_open, hour_close) + (price_range * 0.1)
-                    hour_low = min(hour_open, hour_close) - (price_range * 0.05)
-                    
-                    # 일봉 범위 내로 제한
-                    hour_high = min(hour_high, daily['high'])
-                    hour_low = max(hour_low, daily['low'])
-                    
-                    # 시간봉 캔들 생성
-                    hourly_candle = {
-                        'datetime': f"{date}_{hour}00",
-                        'date': date,
-                        'hour': hour,
-                        'open': round(hour_open, 2),
-                        'high': round(hour_high, 2),
-                        'low': round(hour_low, 2),
-                        'close': round(hour_close, 2),
-                        'volume': volume_per_hour + (i * 1000)  # 시간대별 약간의 차이
-                    }
-                    
-                    hourly_data.append(hourly_candle)
-                    previous_close = hour_close  # 다음 시간의 시작점
-            
-            # 3. 날짜+시간순 정렬
-            hourly_data.sort(key=lambda x: x['datetime'])
-            
-            current_app.logger.info(f"일봉 → 시간봉 변환 완료: {len(daily_data)}일 → {len(hourly_data)}시간")
-            return hourly_data
-            
+            chart = MinuteBarService.get_chart(stock_code, '1h', 5)
+            return chart['candleData'] if chart else []
+
         except Exception as e:
-            current_app.logger.error(f"일봉 → 시간봉 변환 실패: {e}")
+            current_app.logger.error(f"1시간봉 차트 생성 실패: {e}")
             return []
 
     @staticmethod
@@ -776,32 +863,6 @@ class StockService:
 
     # ========== 데이터 파싱 및 변환 함수들 ==========
 
-    @staticmethod
-    def _parse_minute_data(raw_data):
-        """1분봉 원시 데이터 파싱"""
-        parsed_data = []
-        
-        for item in raw_data:
-            try:
-                parsed_item = {
-                    'time': item.get('stck_cntg_hour', ''),  # 체결시간 (HHMMSS)
-                    'open': float(item.get('stck_oprc', 0)),  # 시가
-                    'high': float(item.get('stck_hgpr', 0)),  # 고가
-                    'low': float(item.get('stck_lwpr', 0)),   # 저가
-                    'close': float(item.get('stck_prpr', 0)), # 현재가(종가)
-                    'volume': int(item.get('cntg_vol', 0))    # 체결거래량
-                }
-                
-                # 유효성 검증
-                if parsed_item['time'] and parsed_item['close'] > 0:
-                    parsed_data.append(parsed_item)
-                    
-            except (ValueError, TypeError) as e:
-                current_app.logger.warning(f"분봉 데이터 파싱 오류: {e}")
-                continue
-                
-        return sorted(parsed_data, key=lambda x: x['time'])
-
     @staticmethod
     def _parse_daily_data(raw_data):
         """일봉 원시 데이터 파싱"""
@@ -827,70 +888,3 @@ class StockService:
                 continue
         
         return sorted(parsed_data, key=lambda x: x['date'])
-
-    # ========== 데이터 집계 알고리즘 ==========
-
-    @staticmethod
-    def _aggregate_to_5min(minute_data):
-        """1분봉을 5분봉으로 집계"""
-        if not minute_data:
-            return []
-        
-        aggregated = []
-        current_group = []
-        current_time_key = None
-        
-        for item in minute_data:
-            try:
-                time_str = item['time']
-                if len(time_str) < 4:
-                    continue
-                    
-                hour = int(time_str[:2])
-                minute = int(time_str[2:4])
-                
-                # 5분 단위로 그룹핑 (00-04, 05-09, 10-14, ...)
-                time_key = f"{hour:02d}{(minute // 5) * 5:02d}"
-                
-                # 새로운 그룹 시작
-                if current_time_key != time_key:
-                    if current_group:
-                        candle = StockService._create_candle(current_group, current_time_key)
-                        if candle:
-                            aggregated.append(candle)
-                    
-                    current_group = [item]
-                    current_time_key = time_key
-                else:
-                    current_group.append(item)
-                    
-            except (ValueError, KeyError) as e:
-                current_app.logger.warning(f"5분봉 집계 오류: {e}")
-                continue
-        
-        # 마지막 그룹 처리
-        if current_group:
-            candle = StockService._create_candle(current_group, current_time_key)
-            if candle:
-                aggregated.append(candle)
-        
-        return aggregated
-
-    @staticmethod
-    def _create_candle(group, time_key):
-        """분봉 그룹을 하나의 캔들로 집계 (5분봉용)"""
-        if not group:
-            return None
-        
-        try:
-            return {
-                'time': time_key,  # 예: "0900", "0905"
-                'open': group[0]['open'],  # 첫 번째 시가
-                'high': max(item['high'] for item in group),  # 최고가
-                'low': min(item['low'] for item in group),    # 최저가
-                'close': group[-1]['close'],  # 마지막 종가
-                'volume': sum(item['volume'] for item in group)  # 거래량 합계
-            }
-        except (KeyError, ValueError) as e:
-            current_app.logger.warning(f"캔들 생성 오류: {e}")
-            return None
@@ -7,11 +7,28 @@ from config.redis import get_redis
 import os
 
 from services.stock_service import StockService
+from services.minute_bar_service import MinuteBarService
+from utils.candle_builder import LiveCandleBuilder
+from utils.kis_tick import parse_ticks, frame_symbol
+from utils.tick_pipeline import TickQueue, LatencyHistogram
+from services.realtime_relay import RealtimeRelay, REALTIME_TICK_CHANNEL, to_quote
+from utils.realtime_buffer import RealtimeWriteBuffer
 from utils.kis_websocket import get_websocket_token, invalidate_websocket_token, _is_token_format_valid
 
 KIS_CLIENT_ID=os.getenv("KIS_API_KEY")
 KIS_CLIENT_SECRET=os.getenv("KIS_SECRET_KEY")
 
+LATEST_FLUSH_INTERVAL = 5  # stock_latest 스냅샷 반영 주기 (초)
+LIVE_CANDLE_PUBLISH_INTERVAL = 1  # 진행 중 분봉 Redis 반영 주기 (초)
+LIVE_CANDLE_STORE_INTERVAL = 10   # 마감된 1분봉 DB 기록 주기 (초)
+LIVE_CANDLE_MAX_PENDING = 20000   # DB 기록 실패 시 보관할 최대 1분봉 수
+REALTIME_FLUSH_INTERVAL_MS = int(os.getenv("REALTIME_FLUSH_INTERVAL_MS", "50"))  # 실시간 시세 Redis 일괄 반영 주기
+REALTIME_MAX_PENDING = 5000       # Redis 반영 대기 최대 종목 수
+REALTIME_PRICE_TTL = 300          # realtime_price 만료 (5분)
+TICK_QUEUE_CAPACITY = int(os.getenv("TICK_QUEUE_CAPACITY", "10000"))  # 수신 -> 처리 대기 프레임 최대 수
+TICK_QUEUE_OVERFLOW = os.getenv("TICK_QUEUE_OVERFLOW", "drop_oldest")  # 가득 찼을 때 정책 (drop_oldest: 같은 종목의 오래된 프레임부터, drop_newest)
+REALTIME_VERSION = 'realtime_tick'  # 실시간 시세 Redis 반영마다 증가 (실시간 조회 API ETag 기준)
+
 class KisWebSocketService:
     def __init__(self, app=None):
         self.ws = None
@@ -25,6 +42,17 @@ class KisWebSocketService:
 
         self.redis_client = get_redis()
         self.app = app
+
+        # 실시간 시세 Redis 반영 (수신 스레드는 버퍼에만 기록, 종목별 마지막 체결만 주기적으로 일괄 반영)
+        self.realtime_buffer = RealtimeWriteBuffer(
+            self.redis_client,
+            ttl=REALTIME_PRICE_TTL,
+            interval_ms=REALTIME_FLUSH_INTERVAL_MS,
+            max_pending=REALTIME_MAX_PENDING,
+            counters=(f"version:{REALTIME_VERSION}",),  # 반영마다 체결 버전 증가 (실시간 조회 API ETag 기준)
+            channel=REALTIME_TICK_CHANNEL,               # 반영한 시세를 모든 워커에 중계
+            logger=app.logger if app else None
+        ) if self.redis_client else None
         
         # KIS API 정보
         self.app_key = KIS_CLIENT_ID
@@ -32,15 +60,41 @@ class KisWebSocketService:
         self.access_token = None
         self.successful_subscriptions = 0
         self.failed_subscriptions = []  # 실패한 구독 추적
+
+        # stock_latest 반영 대기 시세 (종목별 마지막 체결만 유지)
+        self.pending_latest_quotes = {}
+        self.last_latest_flush = time.time()
+
+        # 수신 스레드 -> 처리 스레드 대기열 (수신 스레드는 Redis/DB 반영을 기다리지 않음)
+        self.tick_queue = TickQueue(TICK_QUEUE_CAPACITY, TICK_QUEUE_OVERFLOW)
+        self.tick_latency = {
+            'receive': LatencyHistogram(),     # on_message 시작 -> 대기열 추가
+            'queue_wait': LatencyHistogram(),  # 대기열 추가 -> 처리 시작
+            'process': LatencyHistogram(),     # 파싱 + Redis/DB 반영
+        }
+        self.processed_frames = 0
+        self.tick_worker = None
+        self.tick_worker_stop = threading.Event()
+
+        # 워커 간 KIS 웹소켓 공유 (리더 워커만 연결, 시세는 Redis pub/sub으로 모든 워커에 중계)
+        self.relay = RealtimeRelay(self) if self.redis_client and app else None
+        self.stopped = False  # disconnect() 후 on_close 자동 재연결 방지
+
+        # 실시간 체결 -> 1분/5분봉 집계
+        self.candle_builder = LiveCandleBuilder()
+        self.last_candle_publish = time.time()
+        self.last_candle_store = time.time()
         
     def connect(self, base_stock_codes):
         """웹소켓 연결 - 기본 종목들로 시작(top28)"""
         try:
+            self.stopped = False
             self.base_stock_codes = base_stock_codes
             self.additional_stock_codes = []  # 초기화
             self.stock_codes = base_stock_codes.copy()  # 초기에는 기본 종목만
 
             self.access_token = get_websocket_token()
+            self.start_tick_worker()
 
             if not self.access_token:
                 raise Exception("WebSocket 토큰이 없습니다")
@@ -131,6 +185,8 @@ class KisWebSocketService:
     # 추가 구독 기능
     def add_additional_subscriptions(self, new_stock_codes):
         """추가 종목 구독 (기본 종목은 유지)"""
+        if self.relay and not self.relay.is_leader:
+            return self.relay.forward('add', new_stock_codes)
         try:
             # 중복 제거: 이미 구독 중인 종목 제외
             current_all_codes = set(self.base_stock_codes + self.additional_stock_codes)
@@ -197,6 +253,8 @@ class KisWebSocketService:
 
     def remove_additional_subscriptions(self, stock_codes_to_remove):
         """특정 추가 구독 종목 해제 (기본 종목은 유지)"""
+        if self.relay and not self.relay.is_leader:
+            return self.relay.forward('remove', stock_codes_to_remove)
         try:
             removed_count = 0
             
@@ -222,10 +280,13 @@ class KisWebSocketService:
 
     def clear_all_additional_subscriptions(self):
         """모든 추가 구독 해제 (기본 종목은 유지)"""
+        if self.relay and not self.relay.is_leader:
+            return self.relay.forward('clear')
         return self.remove_additional_subscriptions(self.additional_stock_codes.copy())
     
     def on_message(self, ws, message):
         """웹소켓 메시지 수신 시"""
+        received_at = time.perf_counter()
         try:
             # 메시지가 JSON 형태인지 확인 (초기 응답)
             if message.startswith('{'):
@@ -272,7 +333,9 @@ class KisWebSocketService:
             # 실시간 데이터 처리
             if message[0] in ['0', '1']:
                 # self.app.logger.info(f"📊 실시간 데이터 수신: {message[:100]}...")
-                self.process_realtime_data(message)
+                # 처리 스레드로 넘기고 바로 다음 메시지 수신
+                self.tick_queue.put(frame_symbol(message), (message, received_at))
+                self.tick_latency['receive'].observe((time.perf_counter() - received_at) * 1000)
             else:
                 self.app.logger.debug(f"알 수 없는 메시지: {message[:50]}...")
                 
@@ -323,11 +386,48 @@ class KisWebSocketService:
         except Exception as e:
             self.app.logger.error(f"재구독 실패: {e}")
     
+    def start_tick_worker(self):
+        """실시간 프레임 처리 스레드 시작 (이미 실행 중이면 유지)"""
+        if self.tick_worker is not None and self.tick_worker.is_alive():
+            return
+        self.tick_worker_stop.clear()
+        self.tick_worker = threading.Thread(target=self._process_tick_queue, daemon=True)
+        self.tick_worker.start()
+
+    def _process_tick_queue(self):
+        """
+        대기열의 프레임을 꺼내 처리 (처리 중 예외는 process_realtime_data에서 기록)
+        체결이 끊겨도 대기 시간마다 stock_latest 반영 주기를 확인하고, 종료할 때 남은 시세를 반영
+        """
+        while not self.tick_worker_stop.is_set():
+            item = self.tick_queue.get(timeout=1)
+            if item is None:
+                self._flush_latest_quotes()
+                continue
+
+            message, received_at = item
+            started = time.perf_counter()
+            self.tick_latency['queue_wait'].observe((started - received_at) * 1000)
+            self.process_realtime_data(message)
+            self.tick_latency['process'].observe((time.perf_counter() - started) * 1000)
+            self.processed_frames += 1
+
+        self._flush_latest_quotes(force=True)
+
+    def get_pipeline_metrics(self):
+        """수신 -> 처리 대기열 상태와 단계별 지연"""
+        return {
+            'queue': self.tick_queue.get_metrics(),
+            'processed_frames': self.processed_frames,
+            'worker_running': self.tick_worker is not None and self.tick_worker.is_alive(),
+            'latency': {stage: histogram.snapshot() for stage, histogram in self.tick_latency.items()}
+        }
+
     def process_realtime_data(self, data):
         """실시간 데이터 처리 및 Redis 저장"""
         try:
             if data[0] == '0':  # 암호화되지 않은 데이터
-                parts = data.split('|')
+                parts = data.split('|', 3)
                 if len(parts) < 4:
                     self.app.logger.warning(f"데이터 형식 오류: {len(parts)}개 부분만 있음")
                     return
@@ -338,68 +438,104 @@ class KisWebSocketService:
 
                 # self.app.logger.info(f"📊 실시간 데이터 파싱: TR_ID={tr_id}, COUNT={data_count}")
                 
-                if tr_id == "H0STCNT0":  # 주식 체결가
-                    self.process_stock_price_data(raw_data)
+                if tr_id == "H0STCNT0":  # 주식 체결가 (한 프레임에 여러 건이 묶여 올 수 있음)
+                    ticks, skipped = parse_ticks(raw_data, data_count)
+                    if skipped:
+                        self.app.logger.warning(f"⚠️ 체결 레코드 {skipped}건 변환 실패 (프레임 {data_count}건)")
+                    self.process_stock_price_data(ticks)
                     
         except Exception as e:
             self.app.logger.error(f"실시간 데이터 처리 실패: {e}")
 
-    def process_stock_price_data(self, raw_data):
-        """주식 체결가 데이터 처리"""
+    def process_stock_price_data(self, ticks):
+        """주식 체결가 데이터 처리 (ticks: 프레임 하나의 TickRecord 리스트, 시간순)"""
         try:
-            # 데이터를 ^ 구분자로 분리
-            fields = raw_data.split('^')
-            
-            if len(fields) < 14:
-                self.app.logger.warning(f"⚠️ 필드 수 부족: {len(fields)}개 (최소 14개 필요)")
+            ticks = [tick for tick in ticks if tick.stock_code]
+            if not ticks:
                 return
-            
-            # 주요 데이터 추출
-            stock_code = fields[0]
-            trade_time = fields[1]
-            current_price = fields[2]
-            change_sign = fields[3]
-            change_amount = fields[4]
-            change_rate = fields[5]
 
-            
-            # 데이터 검증 및 변환
-            try:
-                current_price_float = float(current_price) if current_price else 0
-                change_rate_float = float(change_rate) if change_rate else 0
-                change_amount_int = int(change_amount) if change_amount else 0
-            except (ValueError, TypeError):
-                self.app.logger.warning(f"⚠️ 데이터 변환 실패: {stock_code}")
-                return
+            # Redis 반영 대기 (종목별 마지막 체결만 남아 REALTIME_FLUSH_INTERVAL_MS마다 일괄 반영)
+            updated_at = datetime.now().isoformat()
+            if self.realtime_buffer:
+                self.realtime_buffer.start()
+                for tick in ticks:
+                    self.realtime_buffer.put(f"realtime_price:{tick.stock_code}", {
+                        "stock_code": tick.stock_code,
+                        "current_price": str(tick.price),
+                        "change_rate": str(tick.change_rate),
+                        "change_amount": str(tick.change_amount),
+                        "change_sign": tick.change_sign,
+                        "volume": str(tick.acc_volume),
+                        "trade_time": tick.trade_time,
+                        "updated_at": updated_at
+                    })
 
-            
-            # Redis에 저장
-            if self.redis_client and stock_code:
-                realtime_key = f"realtime_price:{stock_code}"
-                realtime_data = {
-                    "stock_code": stock_code,
-                    "current_price": str(current_price_float),
-                    "change_rate": str(change_rate_float),
-                    "change_amount": str(change_amount_int),
-                    "change_sign": change_sign,
-                    "updated_at": datetime.now().isoformat()
+            for tick in ticks:
+                # 최신 시세 스냅샷(stock_latest) 반영 대기 (누적거래량 포함)
+                self.pending_latest_quotes[tick.stock_code] = {
+                    "stock_code": tick.stock_code,
+                    "current_price": tick.price,
+                    "change_rate": tick.change_rate,
+                    "change_amount": tick.change_amount,
+                    "daily_volume": tick.acc_volume
                 }
-                
-                self.redis_client.hset(realtime_key, mapping=realtime_data)
-                self.redis_client.expire(realtime_key, 300)  # 5분 만료
-                
-                # 성공적인 데이터 처리 로깅 (부호 변환)
-                sign_map = {'1': '↑', '2': '▲', '3': '=', '4': '↓', '5': '▼'}
-                sign_symbol = sign_map.get(change_sign, '')
-                
-                # self.app.logger.info(
-                #     f"📊 실시간 저장: {stock_code} {current_price_float:,.0f}원 "
-                #     f"{sign_symbol} {change_rate_float:+.2f}%"
-                # )
+
+                # 분봉 집계 (진행 중 봉은 Redis, 마감된 봉은 DB에 주기적으로 반영)
+                if tick.price > 0 and len(tick.trade_time) >= 4:
+                    self.candle_builder.add_tick(tick.stock_code, tick.trade_time, tick.price, tick.volume, tick.trade_date)
+
+            self._flush_latest_quotes()
+            self.flush_live_candles()
                     
         except Exception as e:
             self.app.logger.error(f"❌ 주식 체결가 데이터 처리 실패: {e}")
     
+    def _flush_latest_quotes(self, force=False):
+        """대기 중인 실시간 시세를 주기적으로 stock_latest에 일괄 반영"""
+        if not self.pending_latest_quotes:
+            return
+        if not force and time.time() - self.last_latest_flush < LATEST_FLUSH_INTERVAL:
+            return
+
+        quotes = list(self.pending_latest_quotes.values())
+        self.pending_latest_quotes = {}
+        self.last_latest_flush = time.time()
+
+        try:
+            with self.app.app_context():
+                StockService.apply_realtime_quotes(quotes)
+        except Exception as e:
+            self.app.logger.error(f"❌ 실시간 시세 스냅샷 반영 실패: {e}")
+    
+    def flush_live_candles(self, force=False):
+        """
+        진행 중 분봉을 LIVE_CANDLE_PUBLISH_INTERVAL마다 Redis에, 마감된 1분봉을 LIVE_CANDLE_STORE_INTERVAL마다 DB에 반영
+        force: 체결이 없어도 끝난 구간의 봉을 마감하고 즉시 반영 (스케줄러, 장 마감 후)
+        """
+        now = time.time()
+        if force:
+            self.candle_builder.close_stale()
+
+        if force or now - self.last_candle_publish >= LIVE_CANDLE_PUBLISH_INTERVAL:
+            self.last_candle_publish = now
+            try:
+                MinuteBarService.publish_live_bars(self.candle_builder.drain_open())
+            except Exception as e:
+                self.app.logger.error(f"❌ 실시간 분봉 Redis 반영 실패: {e}")
+
+        if force or now - self.last_candle_store >= LIVE_CANDLE_STORE_INTERVAL:
+            self.last_candle_store = now
+            bars = self.candle_builder.drain_closed()
+            if not bars:
+                return
+            try:
+                with self.app.app_context():
+                    MinuteBarService.store_closed_bars(bars)
+            except Exception as e:
+                # 다음 주기에 다시 기록
+                self.candle_builder.requeue_closed(bars, LIVE_CANDLE_MAX_PENDING)
+                self.app.logger.error(f"❌ 실시간 분봉 DB 기록 실패 ({len(bars)}개 재시도 대기): {e}")
+
     def on_error(self, ws, error):
         """웹소켓 에러 시"""
         self.app.logger.error(f"웹소켓 에러: {error}")
@@ -410,7 +546,9 @@ class KisWebSocketService:
         self.app.logger.warning(f"🔌 웹소켓 연결 종료 - 상태코드: {close_status_code}, 메시지: {close_msg}")
         self.is_connected = False
         
-        # 자동 재연결 시도
+        # 자동 재연결 시도 (직접 해제했거나 수집 리더가 아니면 재연결하지 않음)
+        if self.stopped or (self.relay and not self.relay.is_leader):
+            return
         if self.reconnect_attempts < self.max_reconnect_attempts:
             self.reconnect_attempts += 1
             self.app.logger.info(f"웹소켓 재연결 시도 {self.reconnect_attempts}/{self.max_reconnect_attempts}")
@@ -421,13 +559,24 @@ class KisWebSocketService:
     
     def disconnect(self):
         """웹소켓 연결 해제"""
+        self.stopped = True
         if self.ws:
             self.ws.close()
             self.is_connected = False
             self.app.logger.info("웹소켓 연결 해제")
+        self.tick_worker_stop.set()
+        if self.tick_worker is not None and self.tick_worker is not threading.current_thread():
+            self.tick_worker.join(timeout=3)  # 처리 스레드가 남은 stock_latest 시세를 반영하고 끝날 때까지
+        if self.realtime_buffer:
+            self.realtime_buffer.stop()
     
     def get_realtime_price(self, stock_code):
-        """Redis에서 실시간 가격 조회"""
+        """실시간 가격 조회 (중계받은 로컬 시세 우선, 없으면 Redis)"""
+        if self.relay:
+            quote = self.relay.get_price(stock_code)
+            if quote:
+                return dict(quote)
+
         if not self.redis_client:
             return None
             
@@ -435,14 +584,7 @@ class KisWebSocketService:
         data = self.redis_client.hgetall(realtime_key)
         
         if data:
-            return {
-                "stock_code": data.get("stock_code"),
-                "current_price": float(data.get("current_price", 0)),
-                "change_rate": float(data.get("change_rate", 0)),
-                "change_amount": int(data.get("change_amount", 0)),
-                "change_sign": data.get("change_sign"),
-                "updated_at": data.get("updated_at")
-            }
+            return to_quote(data)
         return None
     
     def get_realtime_ranking(self, limit=28):
@@ -464,7 +606,18 @@ class KisWebSocketService:
         return stocks
 
     def get_subscription_status(self):
-        """구독 상태 정보 반환"""
+        """구독 상태 정보 반환 (수집 리더가 아니면 리더가 Redis에 기록한 상태)"""
+        status = None
+        if self.relay and not self.relay.is_leader:
+            status = self.relay.get_leader_status()
+        if status is None:
+            status = self.get_local_subscription_status()
+        if self.relay:
+            status['ingest'] = self.relay.get_status()
+        return status
+
+    def get_local_subscription_status(self):
+        """이 프로세스의 웹소켓 구독 상태"""
         return {
             'base_subscriptions': {
                 'count': len(self.base_stock_codes),
@@ -482,7 +635,9 @@ class KisWebSocketService:
             'connection_status': self.is_connected,
             'successful_subscriptions': self.successful_subscriptions,
             'failed_subscriptions': len(self.failed_subscriptions),
-            'failed_stock_codes': self.failed_subscriptions
+            'failed_stock_codes': self.failed_subscriptions,
+            'redis_writes': self.realtime_buffer.get_metrics() if self.realtime_buffer else None,
+            'tick_pipeline': self.get_pipeline_metrics()
         }
 
 # 전역 웹소켓 서비스 인스턴스 (None으로 초기화)
@@ -0,0 +1,42 @@
+from flask import Flask
+from flask_cors import CORS
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from config import setup_logging # logging
+from config import setup_response_pipeline # orjson + 압축
+from config.redis import redis_config # redis
+
+from routes.stream_routes import stream_bp
+from services.realtime_relay import get_price_feed
+
+# 실시간 시세 스트림(SSE) 전용 앱
+# SSE 연결은 수 분간 열려 있어 API 워커(gthread)에서 받으면 연결마다 스레드를 하나씩 점유하므로,
+# 비동기 워커(gevent)로 따로 띄워 연결당 greenlet 하나만 쓰고 API 워커의 스레드는 요청/응답 처리에 남겨 둔다.
+# DB/스케줄러/KIS 수집 없이 Redis realtime:ticks 채널만 구독한다 (수집은 API 워커 중 리더가 담당).
+#
+# gunicorn --worker-class gevent --workers 1 --worker-connections 1000 --bind 127.0.0.1:5002 "stream_app:create_stream_app()"
+# nginx: location /api/stock/stream -> 127.0.0.1:5002 (proxy_buffering off)
+
+def create_stream_app():
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
+    setup_logging(app)
+
+    CORS(app, origins=['http://localhost:3000', 'http://127.0.0.1:3000'])
+    setup_response_pipeline(app)
+
+    redis_config.init_redis(app)
+    app.register_blueprint(stream_bp)
+
+    # 첫 연결 전에 구독을 시작해 최신 시세를 미리 받아 둠
+    get_price_feed(app)
+
+    app.logger.info("✅ 실시간 시세 스트림 앱 시작")
+    return app
+
+if __name__ == '__main__':
+    app = create_stream_app()
+    app.run(debug=True, port=5002, threaded=True)
@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+# server 디렉터리에서 python -m pytest -q 로 실행 (앱과 같은 최상위 import 경로 사용)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def app_context():
+    """current_app.logger를 쓰는 유틸 함수용 최소 앱 컨텍스트 (DB/Redis 연결 없음)"""
+    app = Flask(__name__)
+    with app.app_context():
+        yield app
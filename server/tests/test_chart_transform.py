@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from benchmarks.chart_transform_bench import legacy_transform, make_kis_output, assert_same
+from utils.chart_transform import transform_chart_data
+
+@pytest.mark.parametrize('days', [1, 4, 5, 19, 20, 250, 1250])
+def test_matches_legacy_transform(app_context, days):
+    random.seed(days)
+    kis_output = make_kis_output(days)
+    assert_same(legacy_transform(kis_output), transform_chart_data(kis_output))
+
+def test_empty_output(app_context):
+    assert transform_chart_data([]) == legacy_transform([])
+
+def test_tail_keeps_moving_averages_from_full_series(app_context):
+    random.seed(7)
+    kis_output = make_kis_output(120)
+    full = transform_chart_data(kis_output)
+    tail = transform_chart_data(kis_output, tail=30)
+
+    assert len(tail['candleData']) == 30
+    assert tail['candleData'] == full['candleData'][-30:]
+
+def test_extra_moving_average_windows(app_context):
+    random.seed(11)
+    kis_output = make_kis_output(100)
+    chart = transform_chart_data(kis_output, (60,))
+
+    closes = [bar['close'] for bar in chart['candleData']]
+    assert chart['candleData'][-1]['ma60'] == pytest.approx(sum(closes[-60:]) / 60)
+    # 기본 이동평균은 추가 기간과 관계없이 같음
+    assert_same(transform_chart_data(kis_output), {
+        **chart,
+        'candleData': [{key: value for key, value in bar.items() if key != 'ma60'} for bar in chart['candleData']]
+    })
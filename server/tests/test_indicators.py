@@ -0,0 +1,97 @@
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from utils.indicators import INDICATORS, Indicator, parse_indicator
+from services.indicator_service import IndicatorSeries
+
+def make_bars(count, seed=3):
+    """(날짜, 시가, 고가, 저가, 종가, 거래량) 일봉 (거래량 0인 봉 포함)"""
+    rng = random.Random(seed)
+    bars = []
+    day = date(2020, 1, 1)
+    close = 10000.0
+    for i in range(count):
+        open_price = close
+        close = max(100.0, close * rng.uniform(0.95, 1.05))
+        high = max(open_price, close) * rng.uniform(1.0, 1.02)
+        low = min(open_price, close) * rng.uniform(0.98, 1.0)
+        volume = 0 if i % 17 == 0 else rng.randrange(1000, 10 ** 6)
+        bars.append((day + timedelta(days=i), open_price, high, low, close, volume))
+    return bars
+
+def columns(bars):
+    return [[bar[i] for bar in bars] for i in (2, 3, 4, 5)]
+
+def assert_series_equal(expected, actual):
+    assert len(expected) == len(actual)
+    for old, new in zip(expected, actual):
+        if old is None:
+            assert new is None
+        else:
+            assert new == pytest.approx(old, rel=1e-9, abs=1e-9)
+
+def update_all(indicator, bars):
+    rows = [indicator.update(*bar[2:]) for bar in bars]
+    return {key: [row[i] for row in rows] for i, key in enumerate(indicator.OUTPUTS)}
+
+@pytest.mark.parametrize('name', sorted(INDICATORS))
+def test_run_matches_bar_by_bar_update(name):
+    bars = make_bars(300)
+    full = INDICATORS[name]().run(*columns(bars))
+    incremental = update_all(INDICATORS[name](), bars)
+
+    for key in INDICATORS[name].OUTPUTS:
+        assert_series_equal(incremental[key], full[key])
+
+@pytest.mark.parametrize('name', sorted(INDICATORS))
+@pytest.mark.parametrize('split', [1, 10, 35, 299])
+def test_update_after_run_continues_full_series(name, split):
+    bars = make_bars(300)
+    full = INDICATORS[name]().run(*columns(bars))
+
+    indicator = INDICATORS[name]()
+    head = indicator.run(*columns(bars[:split]))
+    rest = update_all(indicator, bars[split:])
+
+    for key in INDICATORS[name].OUTPUTS:
+        assert_series_equal(full[key], head[key] + rest[key])
+
+@pytest.mark.parametrize('name', sorted(INDICATORS))
+def test_series_extend_matches_fresh_series(name):
+    bars = make_bars(200)
+    series = IndicatorSeries(INDICATORS[name](), bars[:150])
+
+    # 마지막 봉 값 변경(당일 봉 재기록) 후 새 봉 추가
+    revised = list(bars[149])
+    revised[4] *= 1.01
+    revised = tuple(revised)
+    assert series.extend([revised]) == 1
+    assert series.extend([revised] + bars[150:]) == 50
+
+    fresh = IndicatorSeries(INDICATORS[name](), bars[:149] + [revised] + bars[150:])
+    assert series.dates == fresh.dates
+    for key in INDICATORS[name].OUTPUTS:
+        assert_series_equal(fresh.values[key], series.values[key])
+
+def test_series_extend_ignores_unchanged_and_older_bars():
+    bars = make_bars(50)
+    series = IndicatorSeries(INDICATORS['rsi'](), bars)
+    assert series.extend(bars[-5:]) == 0
+
+def test_parse_indicator_validates_params():
+    assert parse_indicator('EMA', {'length': '10'}).params == {'length': 10}
+    with pytest.raises(ValueError):
+        parse_indicator('ema', {'length': '1'})
+    with pytest.raises(ValueError):
+        parse_indicator('macd', {'fast': '30', 'slow': '26'})
+    with pytest.raises(ValueError):
+        parse_indicator('unknown', {})
+
+def test_indicator_requires_update():
+    class Incomplete(Indicator):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        Incomplete()
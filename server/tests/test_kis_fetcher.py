@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from utils.kis_fetcher import KisFetchEngine, KisFetchAbort, KisFetchItemError
+
+def fetch(stock_code):
+    if stock_code == 'fetch_error':
+        raise RuntimeError("EGW00201")
+    if stock_code == 'empty':
+        return None
+    return {'stock_code': stock_code}
+
+def test_report_accounts_each_failure_kind(app_context):
+    saved = []
+
+    def on_result(stock_code, data):
+        if stock_code == 'no_price':
+            raise KisFetchItemError("현재가 응답 없음")
+        if stock_code == 'save_error':
+            raise ValueError("duplicate")
+        saved.append(stock_code)
+
+    codes = ['005930', '000660', 'fetch_error', 'empty', 'no_price', 'save_error']
+    report = KisFetchEngine(fetch, max_workers=3, calls_per_item=2).run(codes, on_result)
+
+    assert sorted(saved) == ['000660', '005930']
+    assert report['total'] == 6
+    assert report['succeeded'] == 2
+    assert report['failed'] == 4
+    assert report['failures'] == {
+        'fetch_error': "조회 오류: EGW00201",
+        'empty': "응답 데이터 없음",
+        'no_price': "조회 오류: 현재가 응답 없음",
+        'save_error': "저장 오류: duplicate",
+    }
+
+def test_abort_cancels_remaining_fetches(app_context):
+    fetched = []
+
+    def slow_fetch(stock_code):
+        fetched.append(stock_code)
+        time.sleep(0.01)
+        return {'stock_code': stock_code}
+
+    def on_result(stock_code, data):
+        raise KisFetchAbort("배치 기록 실패")
+
+    codes = [f"{i:06d}" for i in range(20)]
+    with pytest.raises(KisFetchAbort):
+        KisFetchEngine(slow_fetch, max_workers=1).run(codes, on_result)
+
+    assert len(fetched) < len(codes)
+
+def test_empty_run_reports_zero(app_context):
+    report = KisFetchEngine(fetch).run([], lambda stock_code, data: None)
+    assert report['total'] == 0
+    assert report['failed'] == 0
@@ -0,0 +1,57 @@
+from datetime import date, datetime
+
+import pytest
+from flask import Flask
+
+from models import db
+from models.stock import Stock
+from models.stock_candle import StockCandle
+from models.stock_minute_bar import StockMinuteBar
+# Stock 관계 매핑용 (app.py와 같은 모델 등록)
+from models import user, stock_history, stock_latest, portfolio, transaction, bookmark  # noqa: F401
+from services.minute_bar_service import MinuteBarService
+
+TRADE_DATE = date(2026, 10, 14)
+
+@pytest.fixture
+def stock():
+    """저장된 일봉 1일 + 1분봉 2개가 있는 종목 (sqlite 메모리 DB)"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+        stock = Stock(stock_code='005930', stock_name='삼성전자', market='KOSPI', candles_backfilled_at=datetime.now())
+        db.session.add(stock)
+        db.session.flush()
+        db.session.add(StockCandle(stock_id=stock.id, trade_date=TRADE_DATE, close_price=70000))
+        for minute in (0, 1):
+            db.session.add(StockMinuteBar(
+                stock_id=stock.id, bar_time=datetime(2026, 10, 14, 9, minute),
+                open_price=70000, high_price=70100, low_price=69900, close_price=70000, volume=10
+            ))
+        db.session.commit()
+        yield stock
+
+def fail_sync(stock, trade_days, live=None):
+    raise RuntimeError("FHKST03010230 응답 오류")
+
+def test_sync_failure_serves_stored_and_live_bars(stock, monkeypatch):
+    live_bar = [datetime(2026, 10, 14, 9, 2), 70000, 70200, 70000, 70200, 5]
+    monkeypatch.setattr(MinuteBarService, 'sync_stock', staticmethod(fail_sync))
+    monkeypatch.setattr(MinuteBarService, 'get_live_state',
+                        staticmethod(lambda code: {'since': live_bar[0], 'bars': {1: live_bar}}))
+
+    chart = MinuteBarService.get_chart('005930', timeframe='1m', days=5)
+
+    assert chart['partial'] is True
+    assert len(chart['candleData']) == 3
+
+def test_sync_success_is_not_partial(stock, monkeypatch):
+    monkeypatch.setattr(MinuteBarService, 'sync_stock', staticmethod(lambda stock, trade_days, live=None: 0))
+    monkeypatch.setattr(MinuteBarService, 'get_live_state', staticmethod(lambda code: None))
+
+    chart = MinuteBarService.get_chart('005930', timeframe='1m', days=5)
+
+    assert chart['partial'] is False
+    assert len(chart['candleData']) == 2
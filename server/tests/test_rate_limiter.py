@@ -0,0 +1,81 @@
+import pytest
+
+import utils.rate_limiter as rate_limiter
+from utils.rate_limiter import TokenBucket, RedisTokenBucket
+
+class FakeRedis:
+    """register_script 결과로 정해 둔 대기 시간(문자열)을 차례로 돌려주는 Redis 대역"""
+
+    def __init__(self, waits=(), error=None):
+        self.waits = list(waits)
+        self.error = error
+        self.registered = 0
+        self.calls = []
+
+    def register_script(self, script):
+        self.registered += 1
+
+        def run(keys, args):
+            if self.error:
+                raise self.error
+            self.calls.append((keys, args))
+            return self.waits.pop(0)
+        return run
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    calls = []
+    monkeypatch.setattr(rate_limiter.time, 'sleep', calls.append)
+    return calls
+
+@pytest.fixture
+def fallback_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(TokenBucket, 'acquire', lambda self, tokens=1: calls.append(tokens))
+    return calls
+
+def test_token_bucket_capacity():
+    bucket = TokenBucket(rate=1, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+def test_token_bucket_rejects_zero_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        RedisTokenBucket(lambda: None, 'ratelimit:test', 0)
+
+def test_redis_bucket_waits_for_reserved_slot(sleeps, fallback_calls):
+    client = FakeRedis(waits=['0', '0.25'])
+    bucket = RedisTokenBucket(lambda: client, 'ratelimit:test', 20)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert sleeps == [0.25]  # 토큰이 남아 있던 첫 호출은 대기 없음
+    assert client.calls[0] == (['ratelimit:test'], [20.0, 1.0, 1])
+    assert client.registered == 1  # 같은 클라이언트면 스크립트 재등록 없음
+    assert fallback_calls == []
+
+def test_redis_bucket_reregisters_for_new_client(sleeps):
+    clients = [FakeRedis(waits=['0']), FakeRedis(waits=['0'])]
+    current = iter(clients)
+    bucket = RedisTokenBucket(lambda: next(current), 'ratelimit:test', 20)
+
+    bucket.acquire()
+    bucket.acquire()
+
+    assert [client.registered for client in clients] == [1, 1]
+
+def test_redis_bucket_falls_back_without_client(sleeps, fallback_calls):
+    bucket = RedisTokenBucket(lambda: None, 'ratelimit:test', 20)
+    bucket.acquire(2)
+    assert fallback_calls == [2]
+    assert sleeps == []
+
+def test_redis_bucket_falls_back_on_redis_error(sleeps, fallback_calls):
+    client = FakeRedis(error=ConnectionError("redis down"))
+    bucket = RedisTokenBucket(lambda: client, 'ratelimit:test', 20)
+    bucket.acquire()
+    assert fallback_calls == [1]
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+import pytest
+
+import services.stock_service as stock_service
+from services.stock_service import StockService
+
+QUOTES = [{'stock_code': '005930', 'current_price': 70000, 'change_rate': 1.2, 'change_amount': 800, 'daily_volume': 1000}]
+
+@pytest.fixture
+def published(monkeypatch):
+    calls = []
+    monkeypatch.setattr(StockService, 'publish_snapshot', staticmethod(lambda: calls.append(1)))
+    return calls
+
+def use_rowcount(monkeypatch, rowcount):
+    session = SimpleNamespace(
+        execute=lambda stmt, params: SimpleNamespace(rowcount=rowcount),
+        commit=lambda: None,
+        rollback=lambda: None
+    )
+    monkeypatch.setattr(stock_service.db, 'session', session)
+
+@pytest.mark.parametrize('rowcount', [1, 3, -1])
+def test_every_written_flush_bumps_snapshot(monkeypatch, published, rowcount):
+    use_rowcount(monkeypatch, rowcount)
+    assert StockService.apply_realtime_quotes(QUOTES) == 1
+    assert StockService.apply_realtime_quotes(QUOTES) == 1
+    assert len(published) == 2  # 간격 제한 없이 반영마다 발행
+
+def test_flush_without_rows_keeps_snapshot(monkeypatch, published):
+    use_rowcount(monkeypatch, 0)
+    StockService.apply_realtime_quotes(QUOTES)
+    assert published == []
+
+def test_empty_quotes_skip_write(published):
+    assert StockService.apply_realtime_quotes([]) == 0
+    assert published == []
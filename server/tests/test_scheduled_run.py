@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+# app 모듈 import 시 OpenAI 클라이언트가 생성되므로 테스트용 키 지정 (실제 호출 없음)
+os.environ.setdefault('OPENAI_API_KEY', 'test')
+
+import app as app_module
+from app import claim_scheduled_run
+
+class FakeRedis:
+    def __init__(self, error=None):
+        self.keys = {}
+        self.error = error
+
+    def set(self, key, value, nx=False, ex=None):
+        if self.error:
+            raise self.error
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = (value, ex)
+        return True
+
+@pytest.fixture
+def use_redis(monkeypatch):
+    def use(client):
+        monkeypatch.setattr(app_module, 'get_redis', lambda: client)
+        return client
+    return use
+
+def test_only_first_worker_claims_run(app_context, use_redis):
+    client = use_redis(FakeRedis())
+
+    assert claim_scheduled_run(app_context, 'save_daily_history', ttl=60) is True
+    assert claim_scheduled_run(app_context, 'save_daily_history', ttl=60) is False
+    assert client.keys['scheduler:save_daily_history'] == (os.getpid(), 60)
+
+def test_jobs_are_claimed_separately(app_context, use_redis):
+    use_redis(FakeRedis())
+
+    assert claim_scheduled_run(app_context, 'update_basic_info')
+    assert claim_scheduled_run(app_context, 'save_daily_history')
+
+def test_runs_everywhere_without_redis(app_context, use_redis):
+    use_redis(None)
+    assert claim_scheduled_run(app_context, 'save_daily_history')
+
+def test_runs_when_redis_fails(app_context, use_redis):
+    use_redis(FakeRedis(error=ConnectionError("redis down")))
+    assert claim_scheduled_run(app_context, 'save_daily_history')
@@ -0,0 +1,54 @@
+import pytest
+
+import services.stock_service as stock_service
+from services.stock_service import StockService, MASTER_VERSION, SNAPSHOT_VERSION
+from utils.stock_search import StockSearchIndex
+
+ROWS = [(1, '005930', '삼성전자', 'KOSPI', 1000, 70000)]
+
+@pytest.fixture
+def index(monkeypatch):
+    index = StockSearchIndex()
+    monkeypatch.setattr(stock_service, 'stock_search_index', index)
+    return index
+
+@pytest.fixture
+def versions(monkeypatch):
+    current = {MASTER_VERSION: 1, SNAPSHOT_VERSION: 1}
+    monkeypatch.setattr(stock_service.CacheService, 'get_versions', staticmethod(lambda names: dict(current)))
+    return current
+
+@pytest.fixture
+def rebuilds(monkeypatch, index):
+    calls = []
+
+    def refresh(versions=None):
+        calls.append(versions)
+        return index.build(ROWS, versions=versions)
+
+    monkeypatch.setattr(StockService, 'refresh_search_index', staticmethod(refresh))
+    return calls
+
+def test_builds_empty_index(versions, rebuilds, index):
+    StockService._ensure_search_index()
+    assert rebuilds == [{MASTER_VERSION: 1, SNAPSHOT_VERSION: 1}]
+    assert index.versions == {MASTER_VERSION: 1, SNAPSHOT_VERSION: 1}
+
+def test_keeps_index_while_versions_match(versions, rebuilds):
+    StockService._ensure_search_index()
+    StockService._ensure_search_index()
+    assert len(rebuilds) == 1
+
+@pytest.mark.parametrize('name', [MASTER_VERSION, SNAPSHOT_VERSION])
+def test_rebuilds_after_another_worker_publishes(versions, rebuilds, name):
+    StockService._ensure_search_index()
+    versions[name] += 1
+    StockService._ensure_search_index()
+    assert len(rebuilds) == 2
+    assert rebuilds[-1][name] == 2
+
+def test_keeps_ready_index_when_redis_is_unavailable(monkeypatch, versions, rebuilds):
+    StockService._ensure_search_index()
+    monkeypatch.setattr(stock_service.CacheService, 'get_versions', staticmethod(lambda names: None))
+    StockService._ensure_search_index()
+    assert len(rebuilds) == 1
@@ -0,0 +1,74 @@
+import pytest
+
+from utils.stock_search import StockSearchIndex
+
+# (stock_id, stock_code, stock_name, market, trading_value)
+ROWS = [
+    (1, '005930', '삼성전자', 'KOSPI', 1000),
+    (2, '000660', 'SK하이닉스', 'KOSPI', 900),
+    (3, '066570', 'LG전자', 'KOSPI', 800),
+    (4, '006400', '삼성SDI', 'KOSPI', 500),
+    (5, '035720', '카카오', 'KOSPI', 400),
+    (6, '028260', '삼성물산', 'KOSPI', 300),
+    (7, '005935', '삼성전자우', 'KOSPI', 100),
+    (8, '123456', '대한전자', 'KOSDAQ', 50),
+    (9, '003550', 'LG', 'KOSPI', 10),
+    (10, '095570', '전자랜드', 'KOSDAQ', 1),
+]
+
+@pytest.fixture
+def index():
+    index = StockSearchIndex()
+    index.build(ROWS)
+    return index
+
+def names(entries):
+    return [entry.stock_name for entry in entries]
+
+def test_exact_match_ranks_before_higher_trading_value(index):
+    assert names(index.search('lg')) == ['LG', 'LG전자']
+    assert names(index.search('삼성전자')) == ['삼성전자', '삼성전자우']
+
+def test_prefix_ranks_before_substring(index):
+    # 접두어 일치(전자랜드)가 거래대금이 큰 부분 일치보다 먼저, 같은 구간은 거래대금 순
+    assert names(index.search('전자')) == ['전자랜드', '삼성전자', 'LG전자', '삼성전자우', '대한전자']
+
+def test_same_tier_ordered_by_trading_value(index):
+    assert names(index.search('삼성')) == ['삼성전자', '삼성SDI', '삼성물산', '삼성전자우']
+
+def test_case_and_whitespace_insensitive(index):
+    assert names(index.search('sk 하이닉스')) == ['SK하이닉스']
+    assert names(index.search(' Sk')) == ['SK하이닉스']
+
+def test_chosung_search(index):
+    assert names(index.search('ㅅㅅㅈㅈ')) == ['삼성전자', '삼성전자우']
+    assert names(index.search('ㅋㅋㅇ')) == ['카카오']
+
+def test_mixed_chosung_and_syllables(index):
+    assert names(index.search('삼ㅅ')) == ['삼성전자', '삼성SDI', '삼성물산', '삼성전자우']
+    assert names(index.search('ㅅ성ㅈ')) == ['삼성전자', '삼성전자우']
+
+def test_stock_code_search(index):
+    # 완전 일치 코드가 먼저, 나머지 접두어 일치는 거래대금 순
+    assert names(index.search('005935')) == ['삼성전자우']
+    assert names(index.search('0059')) == ['삼성전자', '삼성전자우']
+
+def test_limit_and_empty_queries(index):
+    assert names(index.search('삼성', limit=2)) == ['삼성전자', '삼성SDI']
+    assert index.search('') == []
+    assert index.search('   ') == []
+    assert index.search('없는종목') == []
+    assert StockSearchIndex().search('삼성') == []
+
+def test_autocomplete_prefix_then_typo(index):
+    assert names(index.autocomplete('삼성전', 2)) == ['삼성전자', '삼성전자우']
+    assert names(index.autocomplete('카카', 5)) == ['카카오']
+    # 한 글자 치환/누락/삽입 허용
+    assert names(index.autocomplete('삼성잔자', 5))[0] == '삼성전자'
+    assert names(index.autocomplete('하이닉', 5)) == ['SK하이닉스']
+    assert names(index.autocomplete('카캬오', 5)) == ['카카오']
+
+def test_rebuild_replaces_snapshot(index):
+    index.build([(11, '373220', 'LG에너지솔루션', 'KOSPI', 2000)] + ROWS)
+    assert names(index.search('lg')) == ['LG', 'LG에너지솔루션', 'LG전자']
+    assert index.get('373220').stock_name == 'LG에너지솔루션'
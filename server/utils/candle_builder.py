@@ -0,0 +1,94 @@
+import threading
+from datetime import datetime, date, time, timedelta
+
+# 실시간 체결(틱) -> 종목별 진행 중 분봉 집계
+# 틱마다 열린 봉의 고가/저가/종가/거래량만 갱신하고, 다음 구간의 틱이 오거나
+# 구간이 끝난 뒤 CLOSE_GRACE가 지나면 봉을 마감해 1분봉 기록 대기열에 넣는다.
+
+LIVE_CANDLE_INTERVALS = (1, 5)  # 분 단위 (60의 약수)
+CLOSE_GRACE = timedelta(seconds=5)  # 구간 종료 직후 늦게 도착하는 체결 허용
+
+class LiveCandleBuilder:
+    """
+    봉: [시작 시각, 시가, 고가, 저가, 종가, 거래량]
+    웹소켓 수신 스레드(add_tick)와 스케줄러(close_stale, drain_*)가 함께 사용하므로 잠금으로 보호
+    """
+
+    def __init__(self, intervals=LIVE_CANDLE_INTERVALS):
+        self.intervals = intervals
+        self.open_bars = {}     # (종목코드, 분) -> 진행 중 봉
+        self.closed_bars = []   # 마감된 1분봉 (종목코드, 시작, 시가, 고가, 저가, 종가, 거래량)
+        self.since = {}         # 종목코드 -> 오늘 처음 집계한 분 (이전 구간은 실시간 집계 없음)
+        self.dirty = set()      # 마지막 drain_open 이후 바뀐 종목
+        self.late_ticks = 0     # 이미 마감된 구간에 도착해 버린 체결 수
+        self._lock = threading.Lock()
+
+    def add_tick(self, stock_code, trade_time, price, volume, trade_date=None):
+        """체결 1건 반영 (trade_time: HHMMSS, trade_date 없으면 오늘)"""
+        minute = datetime.combine(trade_date or date.today(), time(int(trade_time[:2]), int(trade_time[2:4])))
+
+        with self._lock:
+            since = self.since.get(stock_code)
+            if since is None or since.date() != minute.date():
+                self.since[stock_code] = minute
+
+            for interval in self.intervals:
+                start = minute.replace(minute=minute.minute // interval * interval)
+                key = (stock_code, interval)
+                bar = self.open_bars.get(key)
+
+                if bar is None or start > bar[0]:
+                    if bar is not None:
+                        self._close(key, bar)
+                    self.open_bars[key] = [start, price, price, price, price, volume]
+                elif start == bar[0]:
+                    if price > bar[2]:
+                        bar[2] = price
+                    if price < bar[3]:
+                        bar[3] = price
+                    bar[4] = price
+                    bar[5] += volume
+                elif interval == 1:
+                    self.late_ticks += 1
+
+            self.dirty.add(stock_code)
+
+    def _close(self, key, bar):
+        if key[1] == 1:
+            self.closed_bars.append((key[0], *bar))
+
+    def close_stale(self, now=None):
+        """구간이 끝난 지 CLOSE_GRACE가 지난 봉 마감 (체결이 끊긴 종목, 장 마감 후)"""
+        now = now or datetime.now()
+        with self._lock:
+            for key, bar in list(self.open_bars.items()):
+                if bar[0] + timedelta(minutes=key[1]) + CLOSE_GRACE <= now:
+                    self._close(key, bar)
+                    del self.open_bars[key]
+                    self.dirty.add(key[0])
+
+    def drain_closed(self):
+        """마감된 1분봉을 꺼내고 대기열 비움"""
+        with self._lock:
+            bars, self.closed_bars = self.closed_bars, []
+            return bars
+
+    def requeue_closed(self, bars, limit):
+        """기록 실패한 봉을 대기열 앞에 되돌림 (limit 초과분은 오래된 것부터 버림)"""
+        with self._lock:
+            self.closed_bars = (bars + self.closed_bars)[-limit:]
+
+    def drain_open(self):
+        """바뀐 종목의 진행 중 봉 -> {종목코드: {'since': 시각, 분: 봉 또는 None}}"""
+        with self._lock:
+            snapshot = {
+                stock_code: {
+                    'since': self.since.get(stock_code),
+                    **{interval: list(self.open_bars[(stock_code, interval)])
+                       if (stock_code, interval) in self.open_bars else None
+                       for interval in self.intervals}
+                }
+                for stock_code in self.dirty
+            }
+            self.dirty = set()
+            return snapshot
@@ -0,0 +1,32 @@
+import numpy as np
+
+# 1분봉 -> N분봉 집계 (한 번의 벡터 연산)
+# 봉 시각을 N분 단위로 내림한 값이 바뀌는 지점을 구간 경계로 삼고,
+# 구간별 시가/종가는 첫/마지막 값, 고가/저가/거래량은 ufunc.reduceat으로 계산한다.
+
+# 차트 주기 -> 분 단위 길이
+TIMEFRAME_MINUTES = {'1m': 1, '5m': 5, '15m': 15, '1h': 60}
+
+def resample(times, opens, highs, lows, closes, volumes, minutes):
+    """
+    시간순 1분봉 배열 -> minutes분봉 배열 (봉 시각은 구간 시작 시각, 예: 09:00, 09:05 ...)
+    times: datetime64[m] 배열 (naive 로컬 시각, 날짜가 달라지면 새 구간)
+    return -> (times, opens, highs, lows, closes, volumes)
+    """
+    times = np.asarray(times, dtype='datetime64[m]')
+    if len(times) == 0 or minutes == 1:
+        return times, np.asarray(opens), np.asarray(highs), np.asarray(lows), np.asarray(closes), np.asarray(volumes)
+
+    # 시간 단위 이하 구간은 정시 기준으로 정렬되므로 epoch 분을 그대로 내림
+    buckets = times.astype(np.int64) // minutes
+    starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+    ends = np.concatenate((starts[1:], [len(times)])) - 1
+
+    return (
+        (buckets[starts] * minutes).astype('datetime64[m]'),
+        np.asarray(opens)[starts],
+        np.maximum.reduceat(np.asarray(highs), starts),
+        np.minimum.reduceat(np.asarray(lows), starts),
+        np.asarray(closes)[ends],
+        np.add.reduceat(np.asarray(volumes), starts)
+    )
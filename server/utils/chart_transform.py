@@ -0,0 +1,210 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+from flask import current_app
+
+# KIS 일/주/월/년봉 응답(또는 같은 필드명의 행) -> 차트 컴포넌트용 데이터 변환
+# 실시간 KIS 조회와 로컬 캔들 저장소 조회가 같은 변환을 사용한다.
+# 행을 한 번에 컬럼 배열로 바꾼 뒤 이동평균/가격범위/최대거래량을 NumPy로 계산한다.
+
+# 항상 계산하는 이동평균 (ma5, ma20 키는 기존 응답 형식)
+BASE_MA_WINDOWS = (5, 20)
+# 요청 시 추가로 계산할 수 있는 이동평균 기간 (예: ?ma=60,120)
+EXTRA_MA_WINDOWS = tuple(
+    int(window) for window in os.getenv("CHART_EXTRA_MA_WINDOWS", "60,120").split(',') if window.strip()
+)
+
+def _empty_chart():
+    return {
+        'candleData': [],
+        'priceRange': {'min': 0, 'max': 0},
+        'maxVolume': 0
+    }
+
+def parse_ma_windows(ma_param):
+    """
+    ?ma=60,120 형식의 파라미터를 추가 이동평균 기간 튜플로 변환
+    EXTRA_MA_WINDOWS에 없는 기간이면 ValueError
+    """
+    if not ma_param:
+        return ()
+
+    windows = []
+    for value in ma_param.split(','):
+        value = value.strip()
+        if not value:
+            continue
+        if not value.isdigit() or int(value) not in EXTRA_MA_WINDOWS:
+            raise ValueError(f"지원하지 않는 이동평균 기간: {value} (지원: {', '.join(map(str, EXTRA_MA_WINDOWS))})")
+        windows.append(int(value))
+    return tuple(dict.fromkeys(windows))
+
+def rolling_mean(values, window):
+    """
+    누적합 기반 O(n) 이동평균
+    앞쪽 window-1개는 구간이 채워지지 않으므로 해당 봉의 값을 그대로 사용 (기존 차트 동작)
+    """
+    result = values.copy()
+    if window <= 1 or len(values) < window:
+        return result
+
+    cumsum = np.cumsum(values)
+    result[window - 1:] = (cumsum[window - 1:] - np.concatenate(([0.0], cumsum[:-window]))) / window
+    return result
+
+def _to_epoch_ms(times):
+    # strptime 결과(naive, 서버 로컬 시간)의 timestamp()와 같은 값
+    naive_ms = times.astype('datetime64[ms]').astype(np.int64)
+    if not time.daylight:
+        return naive_ms + time.timezone * 1000
+
+    # 서머타임이 있는 시간대는 날짜별 오프셋이 달라 행 단위로 계산
+    return np.array(
+        [int(datetime.fromisoformat(value).timestamp() * 1000) for value in np.datetime_as_string(times)],
+        dtype=np.int64
+    )
+
+def _valid_rows(kis_output):
+    """변환할 수 없는 행을 경고 후 제외 (배열 일괄 변환이 실패했을 때만 사용)"""
+    rows = []
+    for item in kis_output:
+        try:
+            datetime.strptime(item.get('stck_bsop_date') or '', '%Y%m%d')
+            for key in ('stck_oprc', 'stck_hgpr', 'stck_lwpr', 'stck_clpr', 'prdy_ctrt'):
+                float(item.get(key, 0) or 0)
+            int(item.get('acml_vol', 0) or 0)
+            int(float(item.get('prdy_vrss', 0) or 0))
+            rows.append(item)
+        except (ValueError, TypeError) as e:
+            current_app.logger.warning(f"차트 데이터 변환 중 오류: {e}, item: {item}")
+    return rows
+
+def _to_columns(kis_output):
+    """행 목록 -> 날짜 오름차순 컬럼 배열 dict"""
+    dates = [item.get('stck_bsop_date') or '' for item in kis_output]
+    # YYYYMMDD 문자열은 사전순 = 날짜순
+    order = np.argsort(np.array(dates), kind='stable')
+
+    def column(key, dtype=np.float64):
+        return np.array([item.get(key, 0) or 0 for item in kis_output], dtype=dtype)[order]
+
+    iso_days = np.array([f"{d[:4]}-{d[4:6]}-{d[6:8]}" for d in dates])[order]
+    return {
+        'times': iso_days.astype('datetime64[D]'),
+        'iso_times': [day + 'T00:00:00' for day in iso_days.tolist()],
+        'open': column('stck_oprc'),
+        'high': column('stck_hgpr'),
+        'low': column('stck_lwpr'),
+        'close': column('stck_clpr'),
+        'volume': column('acml_vol', np.int64),
+        # 정수 변환은 기존처럼 소수점 이하 버림
+        'change_amount': column('prdy_vrss').astype(np.int64),
+        'change_rate': column('prdy_ctrt'),
+        'is_up': np.array([item.get('prdy_vrss_sign') in ('1', '2') for item in kis_output], dtype=bool)[order]
+    }
+
+def transform_chart_data(kis_output, extra_ma_windows=(), tail=None):
+    """
+    KIS API 응답을 차트 컴포넌트용 데이터로 변환
+    extra_ma_windows: 추가 이동평균 기간 (ma{기간} 키로 포함)
+    tail: 최근 tail개 봉만 반환 (앞쪽 봉은 이동평균 계산에만 사용)
+    """
+    if not kis_output or len(kis_output) == 0:
+        return _empty_chart()
+
+    try:
+        columns = _to_columns(kis_output)
+    except (ValueError, TypeError):
+        kis_output = _valid_rows(kis_output)
+        if not kis_output:
+            return _empty_chart()
+        columns = _to_columns(kis_output)
+
+    return _build_chart(columns, extra_ma_windows, tail)
+
+def candles_to_chart(times, opens, highs, lows, closes, volumes, extra_ma_windows=(), tail=None):
+    """
+    시간순 봉 배열(분/시간봉 등) -> 차트 컴포넌트용 데이터 (transform_chart_data와 같은 형식)
+    times: datetime64 배열, 등락은 직전 봉 종가 대비 (첫 봉은 0)
+    """
+    if len(times) == 0:
+        return _empty_chart()
+
+    closes = np.asarray(closes, dtype=np.float64)
+    previous = np.concatenate((closes[:1], closes[:-1]))
+    change = closes - previous
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change_rate = np.where(previous > 0, np.round(change / previous * 100, 2), 0.0)
+
+    columns = {
+        'times': times,
+        'iso_times': np.datetime_as_string(times.astype('datetime64[s]')).tolist(),
+        'open': np.asarray(opens, dtype=np.float64),
+        'high': np.asarray(highs, dtype=np.float64),
+        'low': np.asarray(lows, dtype=np.float64),
+        'close': closes,
+        'volume': np.asarray(volumes, dtype=np.int64),
+        'change_amount': change.astype(np.int64),
+        'change_rate': change_rate,
+        'is_up': change > 0
+    }
+    return _build_chart(columns, extra_ma_windows, tail)
+
+def _build_chart(columns, extra_ma_windows, tail):
+    """날짜 오름차순 컬럼 배열 -> 차트 응답 (이동평균, 가격범위, 최대거래량 포함)"""
+    close = columns['close']
+    moving_averages = {
+        f"ma{window}": rolling_mean(close, window)
+        for window in dict.fromkeys(BASE_MA_WINDOWS + tuple(extra_ma_windows))
+    }
+
+    start = max(len(close) - tail, 0) if tail else 0
+
+    # 응답 dict는 리터럴로 생성 (dict(zip(...))보다 빠름), 추가 이동평균은 뒤에 덧붙임
+    candleData = [
+        {
+            'timestamp': timestamp,
+            'date': iso_time,
+            'open': open_price,
+            'high': high,
+            'low': low,
+            'close': close_price,
+            'volume': volume,
+            'ma5': ma5,
+            'ma20': ma20,
+            'changeAmount': change_amount,
+            'changeRate': change_rate,
+            'isUp': is_up
+        }
+        for timestamp, iso_time, open_price, high, low, close_price, volume, ma5, ma20, change_amount, change_rate, is_up
+        in zip(
+            _to_epoch_ms(columns['times'][start:]).tolist(),
+            columns['iso_times'][start:],
+            columns['open'][start:].tolist(),
+            columns['high'][start:].tolist(),
+            columns['low'][start:].tolist(),
+            close[start:].tolist(),
+            columns['volume'][start:].tolist(),
+            moving_averages.pop('ma5')[start:].tolist(),
+            moving_averages.pop('ma20')[start:].tolist(),
+            columns['change_amount'][start:].tolist(),
+            columns['change_rate'][start:].tolist(),
+            columns['is_up'][start:].tolist()
+        )
+    ]
+    for key, ma in moving_averages.items():
+        for candle, value in zip(candleData, ma[start:].tolist()):
+            candle[key] = value
+
+    high = columns['high'][start:]
+    low = columns['low'][start:]
+    return {
+        'candleData': candleData,
+        'priceRange': {
+            'min': float(min(high.min(), low.min())) * 0.98,
+            'max': float(max(high.max(), low.max())) * 1.02
+        },
+        'maxVolume': int(columns['volume'][start:].max())
+    }
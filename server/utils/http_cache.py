@@ -0,0 +1,61 @@
+import hashlib
+from functools import wraps
+from flask import request, current_app
+
+from services.cache_service import CacheService
+
+# 조회 전용 API의 조건부 GET (If-None-Match -> 304)
+# 데이터 버전(스냅샷/실시간 체결/캐시 항목)으로 ETag를 먼저 계산하므로
+# 변경이 없으면 서비스 호출(DB/외부 API) 없이 바로 304를 응답한다.
+
+def versions_tag(*names):
+    """버전 카운터 조합 태그 (Redis를 사용할 수 없으면 None -> 조건부 GET 미적용)"""
+    versions = CacheService.get_versions(names)
+    if versions is None:
+        return None
+    return ','.join(f"{name}:{versions[name]}" for name in names)
+
+def cache_entry_tag(key):
+    """캐시 항목 지문 태그 (캐시가 없으면 None -> 새로 계산하는 응답이므로 미적용)"""
+    return CacheService.get_fingerprint(key)
+
+def _make_etag(tag):
+    # 같은 데이터 버전이라도 경로/쿼리 파라미터별로 응답이 다르므로 함께 해시
+    query = '&'.join(f"{key}={value}" for key, value in sorted(request.args.items(multi=True)))
+    source = f"{request.path}?{query}|{tag}"
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()[:20]
+
+def conditional_get(tag_func):
+    """
+    tag_func(*view_args, **view_kwargs) -> 데이터 버전 태그 (None이면 조건부 GET 미적용)
+    200 응답에는 ETag를 붙이고, 요청의 If-None-Match와 같으면 뷰를 실행하지 않고 304 반환
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(*args, **kwargs)
+
+            try:
+                tag = tag_func(*args, **kwargs)
+            except Exception as e:
+                current_app.logger.warning(f"ETag 태그 계산 실패 ({request.path}): {e}")
+                tag = None
+
+            if tag is None:
+                return view(*args, **kwargs)
+
+            etag = _make_etag(tag)
+            # 압축 응답은 weak ETag로 나가므로 weak 비교
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'no-cache'  # 저장은 허용, 사용 전 재검증
+            return response
+        return wrapper
+    return decorator
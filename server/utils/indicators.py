@@ -0,0 +1,228 @@
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 저장된 봉 배열 위의 기술적 지표 계산 (EMA, RSI, MACD, 볼린저밴드, VWAP)
+# 각 지표는 전체 구간을 한 번 계산(run)한 뒤 내부 상태를 유지하므로,
+# 새 봉이 생기면 update로 그 봉 하나만 반영할 수 있다.
+# 구간이 채워지기 전(warm-up) 값은 None.
+
+def _nan_to_none(values):
+    return [None if math.isnan(value) else value for value in values.tolist()]
+
+class _Ema:
+    """지수이동평균 상태 (첫 값은 처음 period개의 단순평균으로 시작)"""
+
+    def __init__(self, period):
+        self.period = period
+        self.alpha = 2 / (period + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = None
+
+    def update(self, x):
+        if self.value is None:
+            self.count += 1
+            self.seed_sum += x
+            if self.count == self.period:
+                self.value = self.seed_sum / self.period
+            return self.value
+
+        self.value += self.alpha * (x - self.value)
+        return self.value
+
+class Indicator(ABC):
+    """
+    지표 공통 인터페이스
+    PARAMS: 파라미터명 -> (기본값, 최소, 최대)  (기본값의 타입으로 변환)
+    OUTPUTS: 봉마다 반환하는 값 이름
+    """
+    name = None
+    PARAMS = {}
+    OUTPUTS = ()
+
+    def __init__(self, **params):
+        self.params = {key: params.get(key, default) for key, (default, _, _) in self.PARAMS.items()}
+
+    @property
+    def cache_key(self):
+        return (self.name,) + tuple(self.params[key] for key in self.PARAMS)
+
+    @abstractmethod
+    def update(self, high, low, close, volume):
+        """봉 하나 반영 -> OUTPUTS 순서의 값 튜플"""
+
+    def run(self, highs, lows, closes, volumes):
+        """전체 구간 계산 -> {출력명: 값 리스트} (기본: 봉마다 update, 상태도 함께 갱신)"""
+        rows = [self.update(*bar) for bar in zip(highs, lows, closes, volumes)]
+        return {key: [row[i] for row in rows] for i, key in enumerate(self.OUTPUTS)}
+
+class EMA(Indicator):
+    name = 'ema'
+    PARAMS = {'length': (20, 2, 250)}
+    OUTPUTS = ('ema',)
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.ema = _Ema(self.params['length'])
+
+    def update(self, high, low, close, volume):
+        return (self.ema.update(close),)
+
+class RSI(Indicator):
+    """Wilder 평활 RSI"""
+    name = 'rsi'
+    PARAMS = {'length': (14, 2, 100)}
+    OUTPUTS = ('rsi',)
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.prev_close = None
+        self.count = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+
+    def update(self, high, low, close, volume):
+        if self.prev_close is None:
+            self.prev_close = close
+            return (None,)
+
+        change = close - self.prev_close
+        self.prev_close = close
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        length = self.params['length']
+
+        self.count += 1
+        if self.count <= length:
+            # 처음 length개 변화량은 단순평균
+            self.avg_gain += gain / length
+            self.avg_loss += loss / length
+            if self.count < length:
+                return (None,)
+        else:
+            self.avg_gain = (self.avg_gain * (length - 1) + gain) / length
+            self.avg_loss = (self.avg_loss * (length - 1) + loss) / length
+
+        if self.avg_loss == 0:
+            return (100.0 if self.avg_gain > 0 else 50.0,)
+        return (100 - 100 / (1 + self.avg_gain / self.avg_loss),)
+
+class MACD(Indicator):
+    name = 'macd'
+    PARAMS = {'fast': (12, 2, 100), 'slow': (26, 3, 250), 'signal': (9, 2, 100)}
+    OUTPUTS = ('macd', 'signal', 'histogram')
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        if self.params['fast'] >= self.params['slow']:
+            raise ValueError("macd: fast는 slow보다 작아야 합니다.")
+        self.fast = _Ema(self.params['fast'])
+        self.slow = _Ema(self.params['slow'])
+        self.signal = _Ema(self.params['signal'])
+
+    def update(self, high, low, close, volume):
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        if slow is None:
+            return (None, None, None)
+
+        macd = fast - slow
+        signal = self.signal.update(macd)
+        return (macd, signal, macd - signal if signal is not None else None)
+
+class Bollinger(Indicator):
+    """볼린저밴드 (중심선 = 단순이동평균, 밴드 = 중심선 ± k × 모표준편차)"""
+    name = 'bollinger'
+    PARAMS = {'length': (20, 2, 250), 'k': (2.0, 0.5, 5.0)}
+    OUTPUTS = ('middle', 'upper', 'lower')
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.window = deque(maxlen=self.params['length'])
+
+    def _bands(self, mean, std):
+        k = self.params['k']
+        return mean, mean + k * std, mean - k * std
+
+    def update(self, high, low, close, volume):
+        self.window.append(close)
+        if len(self.window) < self.window.maxlen:
+            return (None, None, None)
+
+        values = np.fromiter(self.window, dtype=np.float64, count=len(self.window))
+        return tuple(float(value) for value in self._bands(values.mean(), values.std()))
+
+    def run(self, highs, lows, closes, volumes):
+        closes = np.asarray(closes, dtype=np.float64)
+        length = self.params['length']
+        self.window.extend(closes[-length:].tolist())
+
+        middle = np.full(len(closes), np.nan)
+        upper = middle.copy()
+        lower = middle.copy()
+        if len(closes) >= length:
+            windows = sliding_window_view(closes, length)
+            middle[length - 1:], upper[length - 1:], lower[length - 1:] = self._bands(
+                windows.mean(axis=1), windows.std(axis=1)
+            )
+        return {'middle': _nan_to_none(middle), 'upper': _nan_to_none(upper), 'lower': _nan_to_none(lower)}
+
+class VWAP(Indicator):
+    """이동 VWAP: 최근 length봉의 Σ(대표가 × 거래량) / Σ거래량 (대표가 = (고가+저가+종가)/3)"""
+    name = 'vwap'
+    PARAMS = {'length': (20, 1, 250)}
+    OUTPUTS = ('vwap',)
+
+    def __init__(self, **params):
+        super().__init__(**params)
+        self.window = deque(maxlen=self.params['length'])
+
+    def update(self, high, low, close, volume):
+        self.window.append(((high + low + close) / 3 * volume, volume))
+        if len(self.window) < self.window.maxlen:
+            return (None,)
+
+        total_volume = sum(v for _, v in self.window)
+        return (sum(pv for pv, _ in self.window) / total_volume if total_volume else None,)
+
+    def run(self, highs, lows, closes, volumes):
+        highs, lows, closes, volumes = (np.asarray(values, dtype=np.float64) for values in (highs, lows, closes, volumes))
+        price_volume = (highs + lows + closes) / 3 * volumes
+        length = self.params['length']
+        self.window.extend(zip(price_volume[-length:].tolist(), volumes[-length:].tolist()))
+
+        vwap = np.full(len(closes), np.nan)
+        if len(closes) >= length:
+            total_volume = sliding_window_view(volumes, length).sum(axis=1)
+            total_pv = sliding_window_view(price_volume, length).sum(axis=1)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                vwap[length - 1:] = np.where(total_volume > 0, total_pv / total_volume, np.nan)
+        return {'vwap': _nan_to_none(vwap)}
+
+INDICATORS = {cls.name: cls for cls in (EMA, RSI, MACD, Bollinger, VWAP)}
+
+def parse_indicator(name, args):
+    """
+    지표명과 요청 파라미터(dict 형식) -> 지표 인스턴스
+    알 수 없는 지표이거나 파라미터가 범위를 벗어나면 ValueError
+    """
+    cls = INDICATORS.get((name or '').lower())
+    if cls is None:
+        raise ValueError(f"지원하지 않는 지표입니다: {name} (지원: {', '.join(INDICATORS)})")
+
+    params = {}
+    for key, (default, minimum, maximum) in cls.PARAMS.items():
+        raw = args.get(key)
+        if raw is None or raw == '':
+            continue
+        try:
+            value = type(default)(raw)
+        except ValueError:
+            raise ValueError(f"{cls.name}: {key} 값이 올바르지 않습니다: {raw}")
+        if not minimum <= value <= maximum:
+            raise ValueError(f"{cls.name}: {key}는 {minimum}~{maximum} 사이여야 합니다.")
+        params[key] = value
+    return cls(**params)
@@ -6,6 +6,8 @@ from datetime import datetime, timedelta
 from flask import current_app
 
 from config.redis import get_redis
+from utils.kis_session import kis_session, KIS_RATE_LIMIT_PER_SEC
+from utils.chart_transform import transform_chart_data
 
 KIS_CLIENT_ID=os.getenv("KIS_API_KEY")
 KIS_CLIENT_SECRET=os.getenv("KIS_SECRET_KEY")
@@ -35,7 +37,7 @@ def kis_access_token():
 
     try:
         # API 요청
-        response = requests.post(url, headers=headers, data=json.dumps(body), timeout=30)
+        response = kis_session.post(url, headers=headers, data=json.dumps(body), timeout=30, rate_limited=False)
         response.raise_for_status()  # HTTP 오류 시 예외 발생
         
         res = response.json()
@@ -101,6 +103,10 @@ class KisAPI:
             current_app.logger.error("KIS API 토큰이 없습니다")
             raise Exception("KIS API 토큰이 발급되지 않았습니다")
 
+    def _get(self, url, headers, params):
+        """공유 세션으로 KIS REST GET 호출 (rate limit, 타임아웃, 재시도 적용)"""
+        return kis_session.get(url, headers=headers, params=params)
+
     def fetch_stock_basic_info(self, stock_code):
         try:
             # KIS API 호출
@@ -117,7 +123,7 @@ class KisAPI:
                 "PRDT_TYPE_CD": "300"  # 주식
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._get(url, headers, params)
             data = response.json()
             
             if data.get('rt_cd') == '0':  # 성공
@@ -157,7 +163,7 @@ class KisAPI:
                 "fid_input_iscd": stock_code # 종목코드
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._get(url, headers, params)
             data = response.json()
             
             if data.get('rt_cd') == '0':  # 성공
@@ -250,7 +256,7 @@ class KisAPI:
                 "fid_pw_data_incu_yn": "Y"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._get(url, headers, params)
             data = response.json()
 
             current_app.logger.info(f"당일분봉 API 호출: {stock_code}, rt_cd={data.get('rt_cd')}")
@@ -296,7 +302,7 @@ class KisAPI:
                 "fid_org_adj_prc": "1"
             }
             
-            response = requests.get(url, headers=headers, params=params)
+            response = self._get(url, headers, params)
             data = response.json()
             
             current_app.logger.info(f"주식일별분봉조회 API 호출: {stock_code}, rt_cd={data.get('rt_cd')}, msg={data.get('msg1')}")
@@ -314,7 +320,7 @@ class KisAPI:
                 
                 params['fid_period_div_code'] = "D"  # D:일봉
                 
-                response = requests.get(url, headers=headers, params=params)
+                response = self._get(url, headers, params)
                 data = response.json()
                 
                 current_app.logger.info(f"일봉 대체 API: {stock_code}, rt_cd={data.get('rt_cd')}")
@@ -336,10 +342,12 @@ class KisAPI:
                 'raw_response': {}
             }
 
-    def fetch_daily_chart_data(self, stock_code, period='D'):
+    def fetch_daily_chart_data(self, stock_code, period='D', extra_ma_windows=(), count=None):
         """
         국내주식기간별시세 API - 차트용 데이터 조회
         period: D(일), W(주), M(월), Y(년)
+        extra_ma_windows: 추가 이동평균 기간 (예: (60, 120))
+        count: 최근 count개 봉만 반환 (없으면 응답 전체)
         """
         try:
             url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-daily-price"
@@ -363,7 +371,7 @@ class KisAPI:
                 "FID_DAY_COUNT": "100"   # 기간 조회 시 카운트
             }
 
-            response = requests.get(url, headers=headers, params=params)
+            response = self._get(url, headers, params)
             data = response.json()
 
             current_app.logger.info(f"차트 데이터 API 호출: {stock_code}, period={period}")
@@ -381,7 +389,7 @@ class KisAPI:
                 raise Exception("KIS API 응답에 유효한 output 데이터가 없습니다")
 
             if data.get('rt_cd') == '0' and data.get('output'):
-                transformed_data = self.transform_chart_data(data.get('output', []))
+                transformed_data = self.transform_chart_data(data.get('output', []), extra_ma_windows, tail=count)
                 return {
                     'success': True,
                     'data': transformed_data,
@@ -404,110 +412,131 @@ class KisAPI:
                 'raw_response': {}
             }
 
-    def transform_chart_data(self, kis_output):
+    def fetch_daily_candles(self, stock_code, start_date, end_date):
         """
-        KIS API 응답을 차트 컴포넌트용 데이터로 변환
+        국내주식기간별시세(일봉) - start_date~end_date 구간 최대 100개 (수정주가)
+        return -> list: output2 원본 행 (최신순)
         """
-        if not kis_output or len(kis_output) == 0:
-            return {
-                'candleData': [],
-                'priceRange': {'min': 0, 'max': 0},
-                'maxVolume': 0
-            }
+        url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-daily-itemchartprice"
+
+        headers = {
+            "Content-Type": "application/json",
+            "authorization": f"Bearer {self.kis_token}",
+            "appkey": KIS_CLIENT_ID,
+            "appsecret": KIS_CLIENT_SECRET,
+            "tr_id": "FHKST03010100",
+            "custtype": "P"
+        }
 
-        candleData = []
+        params = {
+            "fid_cond_mrkt_div_code": "J",
+            "fid_input_iscd": stock_code,
+            "fid_input_date_1": start_date.strftime("%Y%m%d"),
+            "fid_input_date_2": end_date.strftime("%Y%m%d"),
+            "fid_period_div_code": "D",  # D:일봉
+            "fid_org_adj_prc": "0"       # 0:수정주가
+        }
 
-        # 날짜 오름차순으로 정렬
-        sorted_output = sorted(kis_output, key=lambda x: x.get('stck_bsop_date', ''))
+        response = self._get(url, headers, params)
+        data = response.json()
 
-        # sorted_output을 사용하여 오래된 항목부터 처리 (오래된 -> 최신)
-        for i, item in enumerate(sorted_output):
-            try:
-                open_price = float(item.get('stck_oprc', 0) or 0)
-                high = float(item.get('stck_hgpr', 0) or 0)
-                low = float(item.get('stck_lwpr', 0) or 0)
-                close = float(item.get('stck_clpr', 0) or 0)
-                volume = int(item.get('acml_vol', 0) or 0)
-
-                # 이동평균 계산 (간단히 구현)
-                ma5 = close
-                if i >= 4:
-                    ma5_values = []
-                    for j in range(max(0, i-4), i+1):
-                        if j < len(candleData):
-                            ma5_values.append(candleData[j]['close'])
-                        else:
-                            ma5_values.append(close)
-                    ma5 = sum(ma5_values) / len(ma5_values)
-
-                ma20 = close
-                if i >= 19:
-                    ma20_values = []
-                    for j in range(max(0, i-19), i+1):
-                        if j < len(candleData):
-                            ma20_values.append(candleData[j]['close'])
-                        else:
-                            ma20_values.append(close)
-                    ma20 = sum(ma20_values) / len(ma20_values)
-
-                # 날짜 문자열 -> datetime 및 epoch(ms) 변환
-                date_obj = None
-                ts_ms = None
-                if item.get('stck_bsop_date'):
-                    try:
-                        date_obj = datetime.strptime(item.get('stck_bsop_date'), '%Y%m%d')
-                        ts_ms = int(date_obj.timestamp() * 1000)
-                    except Exception:
-                        date_obj = datetime.now()
-                        ts_ms = int(date_obj.timestamp() * 1000)
-                else:
-                    date_obj = datetime.now()
-                    ts_ms = int(date_obj.timestamp() * 1000)
-
-                candle_data = {
-                    'timestamp': ts_ms,
-                    'date': date_obj.isoformat(),
-                    'open': open_price,
-                    'high': high,
-                    'low': low,
-                    'close': close,
-                    'volume': volume,
-                    'ma5': ma5,
-                    'ma20': ma20,
-                    'changeAmount': int(item.get('prdy_vrss', 0) or 0),
-                    'changeRate': float(item.get('prdy_ctrt', 0) or 0),
-                    'isUp': item.get('prdy_vrss_sign') in ['1', '2']
-                }
+        if data.get('rt_cd') != '0':
+            raise Exception(f"KIS API 에러: {data.get('msg1', '알 수 없는 오류')}")
 
-                candleData.append(candle_data)
+        # 거래가 없는 구간은 빈 dict 행이 올 수 있음
+        return [row for row in data.get('output2') or [] if row.get('stck_bsop_date')]
 
-            except (ValueError, TypeError) as e:
-                current_app.logger.warning(f"차트 데이터 변환 중 오류: {e}, item: {item}")
-                continue
+    def fetch_market_open_days(self, base_date):
+        """
+        국내휴장일조회 - base_date부터 이어지는 날짜별 개장일 여부
+        KIS 권장에 따라 하루 1회 정도만 호출 (원장 서비스와 연관된 조회)
+        return -> dict: {date: 개장일 여부(bool)}
+        """
+        url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/chk-holiday"
+
+        headers = {
+            "Content-Type": "application/json",
+            "authorization": f"Bearer {self.kis_token}",
+            "appkey": KIS_CLIENT_ID,
+            "appsecret": KIS_CLIENT_SECRET,
+            "tr_id": "CTCA0903R",
+            "custtype": "P"
+        }
 
-        # 가격 범위 계산
-        if candleData:
-            all_prices = []
-            for d in candleData:
-                all_prices.extend([d['high'], d['low']])
+        params = {
+            "BASS_DT": base_date.strftime("%Y%m%d"),  # 기준일자
+            "CTX_AREA_NK": "",
+            "CTX_AREA_FK": ""
+        }
 
-            priceRange = {
-                'min': min(all_prices) * 0.98,
-                'max': max(all_prices) * 1.02
-            }
+        response = self._get(url, headers, params)
+        data = response.json()
 
-            # 거래량 범위 계산
-            maxVolume = max([d['volume'] for d in candleData]) if candleData else 0
-        else:
-            priceRange = {'min': 0, 'max': 0}
-            maxVolume = 0
+        if data.get('rt_cd') != '0':
+            raise Exception(f"KIS API 에러: {data.get('msg1', '알 수 없는 오류')}")
 
+        # opnd_yn: 개장일여부 (주문 가능한 날, 영업일/거래일과 구분)
         return {
-            'candleData': candleData,
-            'priceRange': priceRange,
-            'maxVolume': maxVolume
+            datetime.strptime(row['bass_dt'], "%Y%m%d").date(): row.get('opnd_yn') == 'Y'
+            for row in data.get('output') or [] if row.get('bass_dt')
+        }
+
+    def fetch_minute_bars(self, stock_code, trade_date, end_time):
+        """
+        1분봉 조회 - trade_date의 end_time(HHMMSS) 이전 분봉 (최신순)
+        당일은 주식당일분봉조회(30개), 지난 거래일은 주식일별분봉조회(최대 120개)
+        return -> list: output2 원본 행 중 trade_date 분봉만
+        """
+        is_today = trade_date == datetime.now().date()
+        if is_today:
+            url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-time-itemchartprice"
+            tr_id = "FHKST03010200"
+            params = {
+                "fid_etc_cls_code": "",
+                "fid_cond_mrkt_div_code": "J",
+                "fid_input_iscd": stock_code,
+                "fid_input_hour_1": end_time,
+                "fid_pw_data_incu_yn": "N"
+            }
+        else:
+            url = "https://openapi.koreainvestment.com:9443/uapi/domestic-stock/v1/quotations/inquire-time-dailychartprice"
+            tr_id = "FHKST03010230"
+            params = {
+                "fid_cond_mrkt_div_code": "J",
+                "fid_input_iscd": stock_code,
+                "fid_input_hour_1": end_time,
+                "fid_input_date_1": trade_date.strftime("%Y%m%d"),
+                "fid_pw_data_incu_yn": "N",
+                "fid_fake_tick_incu_yn": ""
+            }
+
+        headers = {
+            "Content-Type": "application/json",
+            "authorization": f"Bearer {self.kis_token}",
+            "appkey": KIS_CLIENT_ID,
+            "appsecret": KIS_CLIENT_SECRET,
+            "tr_id": tr_id,
+            "custtype": "P"
         }
 
+        response = self._get(url, headers, params)
+        data = response.json()
+
+        if data.get('rt_cd') != '0':
+            raise Exception(f"KIS API 에러: {data.get('msg1', '알 수 없는 오류')}")
+
+        day = trade_date.strftime("%Y%m%d")
+        return [
+            row for row in data.get('output2') or []
+            if row.get('stck_bsop_date') == day and row.get('stck_cntg_hour')
+        ]
+
+    def transform_chart_data(self, kis_output, extra_ma_windows=(), tail=None):
+        """
+        KIS API 응답을 차트 컴포넌트용 데이터로 변환
+        """
+        return transform_chart_data(kis_output, extra_ma_windows, tail=tail)
+
     # def fetch_daily_data_raw(self, stock_code, start_date, end_date):
         """
         국내주식기간별시세 API - 순수 API 호출만
@@ -533,7 +562,7 @@ class KisAPI:
                 "fid_org_adj_prc": "1"
             }
 
-            response = requests.get(url, headers=headers, params=params)
+            response = self._get(url, headers, params)
             data = response.json()
 
             current_app.logger.info(f"일봉 API 호출: {stock_code}, rt_cd={data.get('rt_cd')}")
@@ -0,0 +1,90 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import current_app
+
+from utils.kis_session import KIS_RATE_LIMIT_PER_SEC
+
+# 동시 작업 스레드 수 (호출 지연 동안에도 초당 한도를 채울 수 있을 만큼)
+KIS_FETCH_WORKERS = int(os.getenv("KIS_FETCH_WORKERS", 8))
+
+class KisFetchAbort(Exception):
+    """on_result에서 발생시키면 종목별 실패로 기록하지 않고 남은 조회를 취소한 뒤 run() 밖으로 전달 (배치 기록 실패 등)"""
+
+class KisFetchItemError(Exception):
+    """on_result에서 발생시키면 해당 종목만 조회 실패로 기록하고 나머지 종목은 계속 (응답에 필요한 값이 빠진 경우 등)"""
+
+class KisFetchEngine:
+    """
+    종목별 KIS 조회를 worker pool로 병렬 실행
+    초당 호출 수는 KisAPI가 공유하는 kis_rate_limiter가 제한하고,
+    worker들은 한도를 꽉 채우도록 대기 없이 다음 종목을 가져간다.
+    """
+
+    def __init__(self, fetch_func, max_workers=KIS_FETCH_WORKERS, calls_per_item=1):
+        self.fetch_func = fetch_func            # stock_code -> dict | None
+        self.max_workers = max_workers
+        self.calls_per_item = calls_per_item    # 종목당 KIS 호출 수 (리포트용)
+
+    def run(self, stock_codes, on_result):
+        """
+        stock_codes를 병렬 조회하고 결과가 도착하는 대로 호출 스레드에서 on_result(stock_code, data) 실행
+        DB 세션은 호출 스레드에서만 사용하도록 on_result 안에서 처리한다.
+        on_result의 일반 예외는 해당 종목의 저장 오류로, KisFetchItemError는 조회 오류로 기록하고,
+        KisFetchAbort는 전체 실행을 중단한다.
+        return -> dict: 실행 요약 리포트
+        """
+        app = current_app._get_current_object()
+        started_at = time.monotonic()
+
+        succeeded = 0
+        failures = {}  # stock_code -> 실패 사유
+
+        def task(stock_code):
+            with app.app_context():
+                return self.fetch_func(stock_code)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='kis-fetch')
+        try:
+            futures = {executor.submit(task, code): code for code in stock_codes}
+
+            for future in as_completed(futures):
+                stock_code = futures[future]
+                try:
+                    data = future.result()
+                except Exception as e:
+                    failures[stock_code] = f"조회 오류: {e}"
+                    continue
+
+                if not data:
+                    failures[stock_code] = "응답 데이터 없음"
+                    continue
+
+                try:
+                    on_result(stock_code, data)
+                    succeeded += 1
+                except KisFetchItemError as e:
+                    failures[stock_code] = f"조회 오류: {e}"
+                except KisFetchAbort:
+                    # 아직 시작하지 않은 조회는 취소하고 중단 사유를 호출자에게 전달
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    raise
+                except Exception as e:
+                    failures[stock_code] = f"저장 오류: {e}"
+        finally:
+            executor.shutdown(wait=True)
+
+        return self._build_report(len(stock_codes), succeeded, failures, time.monotonic() - started_at)
+
+    def _build_report(self, total, succeeded, failures, elapsed):
+        total_calls = total * self.calls_per_item
+        return {
+            'total': total,
+            'succeeded': succeeded,
+            'failed': len(failures),
+            'failures': failures,
+            'elapsed_seconds': round(elapsed, 2),
+            'calls_per_second': round(total_calls / elapsed, 2) if elapsed > 0 else 0,
+            'rate_limit_per_second': KIS_RATE_LIMIT_PER_SEC,
+            'theoretical_min_seconds': round(total_calls / KIS_RATE_LIMIT_PER_SEC, 2)
+        }
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.redis import get_redis
+from utils.rate_limiter import RedisTokenBucket
+
+# KIS REST 초당 호출 한도 (실전 계좌 20건/초, 여유분을 두고 설정, 모든 워커 프로세스 합계)
+KIS_RATE_LIMIT_PER_SEC = float(os.getenv("KIS_RATE_LIMIT_PER_SEC", 18))
+
+# 연결/응답 타임아웃 (초)
+KIS_CONNECT_TIMEOUT = float(os.getenv("KIS_CONNECT_TIMEOUT", 3))
+KIS_READ_TIMEOUT = float(os.getenv("KIS_READ_TIMEOUT", 10))
+
+# 재시도 정책: 5xx/429 및 연결 오류 시 지수 백오프
+KIS_MAX_RETRIES = int(os.getenv("KIS_MAX_RETRIES", 3))
+KIS_RETRY_BACKOFF = float(os.getenv("KIS_RETRY_BACKOFF", 0.5))
+KIS_RETRY_STATUS = {429, 500, 502, 503, 504}  # KIS 초당 거래건수 초과(EGW00201)는 500으로 응답
+
+# 커넥션 풀 크기 (병렬 조회 worker 수 이상)
+KIS_POOL_MAXSIZE = int(os.getenv("KIS_POOL_MAXSIZE", 16))
+
+# 모든 프로세스의 KIS REST 호출이 공유하는 rate limiter (Redis를 쓸 수 없으면 프로세스 단위로 제한)
+kis_rate_limiter = RedisTokenBucket(get_redis, 'ratelimit:kis_rest', KIS_RATE_LIMIT_PER_SEC)
+
+class KisSession:
+    """
+    keep-alive 커넥션 풀을 공유하는 KIS REST 세션
+    모든 요청에 타임아웃을 적용하고, 5xx/429/연결 오류는 백오프 후 재시도한다.
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        self.adapter = HTTPAdapter(
+            pool_connections=2,           # 호스트 수 (openapi.koreainvestment.com)
+            pool_maxsize=KIS_POOL_MAXSIZE,
+            pool_block=True,              # 풀 초과 시 새 연결 대신 반납 대기
+            max_retries=0                 # 재시도는 아래에서 rate limiter와 함께 처리
+        )
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        self.lock = threading.Lock()
+        self.counters = {
+            'requests': 0,
+            'retries': 0,
+            'failures': 0
+        }
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method, url, rate_limited=True, **kwargs):
+        """
+        rate limiter -> 요청 -> (필요 시) 백오프 후 재시도
+        rate_limited: 토큰 발급 등 시세 조회 한도와 무관한 호출은 False
+        """
+        kwargs.setdefault('timeout', (KIS_CONNECT_TIMEOUT, KIS_READ_TIMEOUT))
+
+        for attempt in range(KIS_MAX_RETRIES + 1):
+            if rate_limited:
+                kis_rate_limiter.acquire()
+            self._incr('requests')
+
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= KIS_MAX_RETRIES:
+                    self._incr('failures')
+                    raise
+                self._incr('retries')
+                time.sleep(self._backoff_seconds(attempt))
+                continue
+
+            if response.status_code in KIS_RETRY_STATUS and attempt < KIS_MAX_RETRIES:
+                self._incr('retries')
+                time.sleep(self._backoff_seconds(attempt, response))
+                continue
+
+            if response.status_code in KIS_RETRY_STATUS:
+                self._incr('failures')
+            return response
+
+    def _backoff_seconds(self, attempt, response=None):
+        # Retry-After 헤더가 있으면 우선 적용
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return KIS_RETRY_BACKOFF * (2 ** attempt)
+
+    def _incr(self, key):
+        with self.lock:
+            self.counters[key] += 1
+
+    def get_stats(self):
+        """요청/재시도 수와 새 연결 vs 재사용 연결 수"""
+        new_connections = 0
+        pooled_requests = 0
+
+        pools = self.adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            new_connections += pool.num_connections
+            pooled_requests += pool.num_requests
+
+        with self.lock:
+            stats = dict(self.counters)
+
+        stats['new_connections'] = new_connections
+        stats['reused_connections'] = max(pooled_requests - new_connections, 0)
+        return stats
+
+# 프로세스 전역 KIS 세션 (스레드 간 공유)
+kis_session = KisSession()
@@ -0,0 +1,131 @@
+from datetime import date
+
+# KIS 실시간 체결가(H0STCNT0) 프레임 파서
+# 프레임: 암호화여부|TR_ID|건수|레코드1^...^레코드N (레코드당 46개 필드를 ^로 이어 붙임)
+# 데이터부를 한 번만 split하고 레코드별로 오프셋을 옮겨 가며 필요한 필드만 변환한다
+# (레코드마다 문자열/리스트를 다시 자르지 않음).
+
+# H0STCNT0 레코드 필드 순서 (KIS 실시간 체결가 응답 명세)
+H0STCNT0_FIELDS = (
+    'mksc_shrn_iscd',               # 0 종목코드
+    'stck_cntg_hour',               # 1 체결시간 (HHMMSS)
+    'stck_prpr',                    # 2 현재가
+    'prdy_vrss_sign',               # 3 전일대비부호
+    'prdy_vrss',                    # 4 전일대비
+    'prdy_ctrt',                    # 5 전일대비율
+    'wghn_avrg_stck_prc',           # 6 가중평균가
+    'stck_oprc',                    # 7 시가
+    'stck_hgpr',                    # 8 고가
+    'stck_lwpr',                    # 9 저가
+    'askp1',                        # 10 매도호가1
+    'bidp1',                        # 11 매수호가1
+    'cntg_vol',                     # 12 체결거래량
+    'acml_vol',                     # 13 누적거래량
+    'acml_tr_pbmn',                 # 14 누적거래대금
+    'seln_cntg_csnu',               # 15 매도체결건수
+    'shnu_cntg_csnu',               # 16 매수체결건수
+    'ntby_cntg_csnu',               # 17 순매수체결건수
+    'cttr',                         # 18 체결강도
+    'seln_cntg_smtn',               # 19 총매도수량
+    'shnu_cntg_smtn',               # 20 총매수수량
+    'ccld_dvsn',                    # 21 체결구분 (1 매수, 3 장전, 5 매도)
+    'shnu_rate',                    # 22 매수비율
+    'prdy_vol_vrss_acml_vol_rate',  # 23 전일거래량대비등락율
+    'oprc_hour',                    # 24 시가시간
+    'oprc_vrss_prpr_sign',          # 25 시가대비구분
+    'oprc_vrss_prpr',               # 26 시가대비
+    'hgpr_hour',                    # 27 최고가시간
+    'hgpr_vrss_prpr_sign',          # 28 고가대비구분
+    'hgpr_vrss_prpr',               # 29 고가대비
+    'lwpr_hour',                    # 30 최저가시간
+    'lwpr_vrss_prpr_sign',          # 31 저가대비구분
+    'lwpr_vrss_prpr',               # 32 저가대비
+    'bsop_date',                    # 33 영업일자 (YYYYMMDD)
+    'new_mkop_cls_code',            # 34 신장운영구분코드
+    'trht_yn',                      # 35 거래정지여부
+    'askp_rsqn1',                   # 36 매도호가잔량1
+    'bidp_rsqn1',                   # 37 매수호가잔량1
+    'total_askp_rsqn',              # 38 총매도호가잔량
+    'total_bidp_rsqn',              # 39 총매수호가잔량
+    'vol_tnrt',                     # 40 거래량회전율
+    'prdy_smns_hour_acml_vol',      # 41 전일동시간누적거래량
+    'prdy_smns_hour_acml_vol_rate', # 42 전일동시간누적거래량비율
+    'hour_cls_code',                # 43 시간구분코드
+    'mrkt_trtm_cls_code',           # 44 임의종료구분코드
+    'vi_stnd_prc',                  # 45 정적VI발동기준가
+)
+H0STCNT0_FIELD_COUNT = len(H0STCNT0_FIELDS)
+
+_business_dates = {}  # 'YYYYMMDD' -> date (영업일자 변환 캐시)
+
+def _float(value):
+    return float(value) if value else 0.0
+
+def _int(value):
+    return int(value) if value else 0
+
+def _business_date(value):
+    parsed = _business_dates.get(value)
+    if parsed is None and len(value) == 8:
+        try:
+            parsed = _business_dates[value] = date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+        except ValueError:
+            return None
+    return parsed
+
+class TickRecord:
+    """체결 1건 (H0STCNT0 레코드에서 시세/거래량/호가/시각 필드만 변환해 보관)"""
+    __slots__ = (
+        'stock_code', 'trade_time', 'trade_date', 'price', 'change_sign', 'change_amount', 'change_rate',
+        'open', 'high', 'low', 'ask_price', 'bid_price', 'ask_quantity', 'bid_quantity',
+        'volume', 'acc_volume', 'acc_trade_value'
+    )
+
+    def __init__(self, fields, offset=0):
+        """fields: 프레임 데이터부를 ^로 나눈 리스트, offset: 레코드 시작 위치"""
+        self.stock_code = fields[offset]
+        self.trade_time = fields[offset + 1]
+        self.price = _float(fields[offset + 2])
+        self.change_sign = fields[offset + 3]
+        self.change_amount = _int(fields[offset + 4])
+        self.change_rate = _float(fields[offset + 5])
+        self.open = _float(fields[offset + 7])
+        self.high = _float(fields[offset + 8])
+        self.low = _float(fields[offset + 9])
+        self.ask_price = _float(fields[offset + 10])
+        self.bid_price = _float(fields[offset + 11])
+        self.volume = _int(fields[offset + 12])
+        self.acc_volume = _int(fields[offset + 13])
+        self.acc_trade_value = _int(fields[offset + 14])
+        self.trade_date = _business_date(fields[offset + 33])
+        self.ask_quantity = _int(fields[offset + 36])
+        self.bid_quantity = _int(fields[offset + 37])
+
+def parse_ticks(raw_data, data_count):
+    """
+    H0STCNT0 데이터부 -> TickRecord 리스트 (프레임에 묶여 온 모든 체결)
+    data_count: 프레임 헤더의 건수, 필드 수가 모자라면 완전한 레코드까지만 변환
+    잘렸거나 변환할 수 없는 레코드는 건너뛰고 (체결 목록, 건너뛴 수) 반환
+    """
+    fields = raw_data.split('^')
+    expected = int(data_count or 1)
+    count = min(expected, len(fields) // H0STCNT0_FIELD_COUNT)
+
+    ticks = []
+    skipped = expected - count
+    for offset in range(0, count * H0STCNT0_FIELD_COUNT, H0STCNT0_FIELD_COUNT):
+        try:
+            ticks.append(TickRecord(fields, offset))
+        except ValueError:
+            skipped += 1
+    return ticks, skipped
+
+def frame_symbol(message):
+    """실시간 프레임의 첫 레코드 종목코드 (데이터부를 자르지 않고 위치만 찾음, 형식이 다르면 '')"""
+    start = 0
+    for _ in range(3):
+        start = message.find('|', start) + 1
+        if not start:
+            return ''
+    end = message.find('^', start)
+    return message[start:end] if end != -1 else ''
@@ -0,0 +1,183 @@
+import os
+import re
+import threading
+import time
+
+import orjson
+
+# 실시간 시세 서버 푸시 (Server-Sent Events)
+# 스트림 프로세스의 시세 구독 스레드(RealtimeSubscriber)가 publish()로 종목별 최신 시세만 남기면, 전송 스레드가 종목마다
+# 최소 간격(1 / PRICE_STREAM_MAX_RATE초)을 지켜 그 사이 쌓인 체결을 마지막 값 하나로 합쳐(conflation)
+# 한 번 직렬화한 SSE 메시지를 그 종목을 구독한 클라이언트에 나눠 준다.
+# 구독자 수와 무관하게 체결당 DB/Redis 조회가 없고, 종목당 초당 최대 PRICE_STREAM_MAX_RATE번만 직렬화한다.
+
+PRICE_STREAM_MAX_RATE = float(os.getenv("PRICE_STREAM_MAX_RATE", "4"))           # 종목당 초당 최대 전송 수
+PRICE_STREAM_MAX_CLIENTS = int(os.getenv("PRICE_STREAM_MAX_CLIENTS", "1000"))    # 스트림 프로세스당 동시 스트림 수 (gevent worker-connections 이하)
+PRICE_STREAM_MAX_CODES = 50          # 스트림 하나가 구독할 수 있는 최대 종목 수
+PRICE_STREAM_KEEPALIVE = 15          # 전송할 시세가 없을 때 연결 유지 주석 전송 간격 (초)
+PRICE_STREAM_MAX_SECONDS = int(os.getenv("PRICE_STREAM_MAX_SECONDS", "300"))     # 스트림 최대 유지 시간 (이후 브라우저가 자동 재연결)
+PRICE_STREAM_RETRY_MS = 3000         # 브라우저 재연결 대기 (SSE retry)
+
+_STOCK_CODE_PATTERN = re.compile(r'^[0-9A-Z]{6}$')
+
+def parse_stream_codes(codes_param):
+    """
+    ?codes=005930,000660 -> 중복 제거한 종목코드 튜플
+    비어 있거나 형식이 잘못됐거나 PRICE_STREAM_MAX_CODES를 넘으면 ValueError
+    """
+    codes = tuple(dict.fromkeys(code.strip().upper() for code in (codes_param or '').split(',') if code.strip()))
+    if not codes:
+        raise ValueError("구독할 종목 코드(codes)가 필요합니다.")
+    if len(codes) > PRICE_STREAM_MAX_CODES:
+        raise ValueError(f"종목은 최대 {PRICE_STREAM_MAX_CODES}개까지 구독할 수 있습니다.")
+
+    invalid = [code for code in codes if not _STOCK_CODE_PATTERN.match(code)]
+    if invalid:
+        raise ValueError(f"잘못된 종목 코드입니다: {', '.join(invalid)}")
+    return codes
+
+def format_event(payload, event='price'):
+    """SSE 메시지 문자열 (한 번 만들어 모든 구독자에 그대로 전송)"""
+    return f"event: {event}\ndata: {orjson.dumps(payload).decode('utf-8')}\n\n"
+
+class StreamClient:
+    """SSE 연결 1개: 구독 종목과 아직 보내지 못한 종목별 최신 메시지 (느린 클라이언트도 종목당 1개만 보관)"""
+
+    def __init__(self, codes):
+        self.codes = codes
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.event = threading.Event()
+
+    def offer(self, stock_code, message):
+        with self.lock:
+            self.pending[stock_code] = message
+        self.event.set()
+
+    def next_batch(self, timeout):
+        """보낼 메시지 리스트 (timeout 동안 없으면 None)"""
+        if not self.event.wait(timeout):
+            return None
+        with self.lock:
+            self.event.clear()
+            batch, self.pending = self.pending, {}
+        return list(batch.values())
+
+class PriceBroadcaster:
+    """종목별 최신 시세 -> 구독 클라이언트 전송 (종목당 최소 간격 보장)"""
+
+    def __init__(self, max_rate=PRICE_STREAM_MAX_RATE, max_clients=PRICE_STREAM_MAX_CLIENTS):
+        self.interval = 1 / max_rate
+        self.max_clients = max_clients
+
+        self.latest = {}       # 종목코드 -> 마지막 시세 (새 구독자 초기값, 전송한 적 없으면 dict로 두고 첫 구독 때 SSE 메시지로 변환)
+        self.pending = {}      # 종목코드 -> 아직 전송하지 않은 최신 시세
+        self.last_sent = {}    # 종목코드 -> 마지막 전송 시각 (monotonic)
+        self.subscribers = {}  # 종목코드 -> {StreamClient}
+        self.clients = set()
+
+        self._cond = threading.Condition()
+        self._thread = None
+
+        self.published = 0   # publish 호출 수
+        self.conflated = 0   # 전송 전에 더 새로운 시세로 대체된 수
+        self.fanouts = 0     # 종목 단위 전송 수 (직렬화 수)
+        self.deliveries = 0  # 클라이언트 단위 전송 수
+        self.rejected = 0    # max_clients 초과로 거절한 연결 수
+
+    def publish(self, stock_code, payload):
+        """시세 중계 구독 스레드에서 호출 (대기 없음)"""
+        with self._cond:
+            self.published += 1
+            if stock_code not in self.subscribers:
+                # 구독자가 없으면 직렬화를 미루고 초기값만 갱신
+                self.latest[stock_code] = payload
+                return
+            if stock_code in self.pending:
+                self.conflated += 1
+            self.pending[stock_code] = payload
+            self._cond.notify()
+
+    def register(self, codes):
+        """스트림 연결 등록 (동시 연결 수 초과 시 None), 알고 있는 최신 시세를 초기값으로 넣어 둠"""
+        client = StreamClient(codes)
+        with self._cond:
+            if len(self.clients) >= self.max_clients:
+                self.rejected += 1
+                return None
+
+            self.clients.add(client)
+            for stock_code in codes:
+                self.subscribers.setdefault(stock_code, set()).add(client)
+                latest = self.latest.get(stock_code)
+                if latest is not None:
+                    if isinstance(latest, dict):
+                        latest = self.latest[stock_code] = format_event(latest)
+                    client.offer(stock_code, latest)
+
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return client
+
+    def unregister(self, client):
+        with self._cond:
+            self.clients.discard(client)
+            for stock_code in client.codes:
+                subscribers = self.subscribers.get(stock_code)
+                if subscribers is None:
+                    continue
+                subscribers.discard(client)
+                if not subscribers:
+                    del self.subscribers[stock_code]
+                    self.pending.pop(stock_code, None)
+
+    def _due_codes(self):
+        """전송 간격이 지난 대기 종목, 없으면 (빈 리스트, 다음 전송까지 남은 초 또는 None)"""
+        now = time.monotonic()
+        due = []
+        wait = None
+        for stock_code in self.pending:
+            remaining = self.last_sent.get(stock_code, float('-inf')) + self.interval - now
+            if remaining <= 0:
+                due.append(stock_code)
+            elif wait is None or remaining < wait:
+                wait = remaining
+        return due, wait
+
+    def _run(self):
+        while True:
+            with self._cond:
+                due, wait = self._due_codes()
+                while not due:
+                    self._cond.wait(wait)
+                    due, wait = self._due_codes()
+
+                now = time.monotonic()
+                batch = []
+                for stock_code in due:
+                    message = format_event(self.pending.pop(stock_code))
+                    self.latest[stock_code] = message
+                    self.last_sent[stock_code] = now
+                    batch.append((stock_code, message, tuple(self.subscribers.get(stock_code, ()))))
+
+            # 클라이언트 전달은 잠금 밖에서 (publish를 막지 않도록)
+            for stock_code, message, clients in batch:
+                for client in clients:
+                    client.offer(stock_code, message)
+                self.fanouts += 1
+                self.deliveries += len(clients)
+
+    def get_metrics(self):
+        with self._cond:
+            return {
+                'clients': len(self.clients),
+                'max_clients': self.max_clients,
+                'subscribed_codes': len(self.subscribers),
+                'max_rate_per_code': round(1 / self.interval, 2),
+                'published': self.published,
+                'conflated': self.conflated,
+                'fanouts': self.fanouts,
+                'deliveries': self.deliveries,
+                'rejected': self.rejected
+            }
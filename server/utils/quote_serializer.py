@@ -0,0 +1,112 @@
+from functools import lru_cache
+
+from models.stock import Stock
+from models.stock_latest import StockLatest
+
+# 종목 + 최신 시세 행을 응답 dict로 변환하는 공용 직렬화기
+# 요청한 필드의 컬럼만 SELECT 하고, 변환 함수는 필드 조합별로 한 번만 구성해 재사용한다.
+
+def _as_is(value):
+    return value
+
+def _to_float(value):
+    return float(value) if value is not None else None
+
+def _to_int(value):
+    return int(value) if value is not None else None
+
+def _to_iso(value):
+    return value.isoformat() if value is not None else None
+
+# 필드명 -> (컬럼, 변환 함수)  (응답 키 순서도 이 순서를 따름)
+QUOTE_FIELDS = {
+    'id': (Stock.id, _as_is),
+    'stock_code': (Stock.stock_code, _as_is),
+    'stock_name': (Stock.stock_name, _as_is),
+    'market': (Stock.market, _as_is),
+    'sector': (Stock.sector, _as_is),
+    'sector_detail': (Stock.sector_detail, _as_is),
+    'company_info': (Stock.company_info, _as_is),
+    'shares_outstanding': (Stock.shares_outstanding, _to_int),
+    'updated_at': (Stock.updated_at, _to_iso),
+    'current_price': (StockLatest.current_price, _to_float),
+    'previous_close': (StockLatest.previous_close, _to_float),
+    'change_rate': (StockLatest.change_rate, _to_float),
+    'change_amount': (StockLatest.change_amount, _to_float),
+    'day_open': (StockLatest.day_open, _to_float),
+    'day_high': (StockLatest.day_high, _to_float),
+    'day_low': (StockLatest.day_low, _to_float),
+    'daily_volume': (StockLatest.daily_volume, _to_int),
+    'market_cap': (StockLatest.market_cap, _to_int),
+    'week52_high': (StockLatest.week52_high, _to_float),
+    'week52_low': (StockLatest.week52_low, _to_float),
+    'per': (StockLatest.per, _to_float),
+    'pbr': (StockLatest.pbr, _to_float),
+    'trading_value': (StockLatest.trading_value, _to_int),
+    'history_updated_at': (StockLatest.updated_at, _to_iso),
+}
+
+# 종목 조회/검색 기본 응답 필드 (기존 응답 형식 유지)
+STOCK_DETAIL_FIELDS = (
+    'id', 'stock_code', 'stock_name', 'market', 'sector', 'sector_detail', 'company_info',
+    'shares_outstanding', 'updated_at',
+    'current_price', 'previous_close', 'change_rate', 'change_amount',
+    'day_open', 'day_high', 'day_low', 'daily_volume', 'market_cap',
+    'week52_high', 'week52_low', 'per', 'pbr', 'history_updated_at'
+)
+
+# 종목 마스터(/api/stock/all) 응답 필드 (시세 제외)
+STOCK_MASTER_FIELDS = (
+    'id', 'stock_code', 'stock_name', 'market', 'sector', 'sector_detail', 'company_info',
+    'shares_outstanding', 'updated_at'
+)
+
+# 거래대금 순위 기본 응답 필드
+RANKING_FIELDS = (
+    'stock_code', 'stock_name', 'market', 'sector', 'sector_detail', 'company_info',
+    'shares_outstanding',
+    'current_price', 'previous_close', 'change_rate', 'change_amount',
+    'day_open', 'day_high', 'day_low', 'daily_volume', 'market_cap',
+    'week52_high', 'week52_low', 'per', 'pbr', 'trading_value'
+)
+
+def parse_fields(fields_param, default_fields, allowed_fields=None):
+    """
+    ?fields=stock_code,current_price 형식의 파라미터를 필드 튜플로 변환
+    없으면 default_fields, 알 수 없는(허용되지 않은) 필드가 있으면 ValueError
+    """
+    if not fields_param:
+        return tuple(default_fields)
+
+    allowed = allowed_fields if allowed_fields is not None else QUOTE_FIELDS
+    requested = [field.strip() for field in fields_param.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in allowed]
+    if unknown:
+        raise ValueError(f"알 수 없는 필드: {', '.join(unknown)}")
+
+    # stock_code는 클라이언트 식별 키이므로 항상 포함
+    if 'stock_code' not in requested:
+        requested.insert(0, 'stock_code')
+    return tuple(dict.fromkeys(requested))
+
+class QuoteSerializer:
+    """필드 조합 하나에 대한 SELECT 컬럼 목록과 행 변환기"""
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self.columns = [QUOTE_FIELDS[field][0].label(field) for field in self.fields]
+        self.converters = tuple((field, index, QUOTE_FIELDS[field][1]) for index, field in enumerate(self.fields))
+        self.needs_latest = any(QUOTE_FIELDS[field][0].class_ is StockLatest for field in self.fields)
+
+    def serialize(self, row):
+        """쿼리 결과 행(columns 순서) -> dict (0 값도 그대로 유지)"""
+        return {field: convert(row[index]) for field, index, convert in self.converters}
+
+    def serialize_all(self, rows):
+        serialize = self.serialize
+        return [serialize(row) for row in rows]
+
+@lru_cache(maxsize=64)
+def get_serializer(fields):
+    """필드 튜플별 직렬화기 (프로세스 내 재사용)"""
+    return QuoteSerializer(fields)
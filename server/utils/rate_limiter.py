@@ -0,0 +1,107 @@
+import threading
+import time
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷
+    rate: 초당 발급 토큰 수, capacity: 최대 누적 토큰 수 (순간 버스트 허용량)
+    """
+
+    def __init__(self, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+        self.last_refill = now
+
+    def try_acquire(self, tokens=1):
+        """토큰이 있으면 즉시 차감하고 True, 없으면 False"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1):
+        """토큰을 얻을 때까지 대기 후 차감"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_seconds = (tokens - self.tokens) / self.rate
+
+            time.sleep(wait_seconds)
+
+# 여러 프로세스(gunicorn 워커)가 같은 한도를 나눠 쓰는 Redis 토큰 버킷
+# 호출마다 토큰을 먼저 차감(음수 허용)하고 채워질 때까지의 대기 시간을 돌려주므로
+# 대기 중인 호출들이 도착 순서대로 rate 간격으로 배치된다. 시각은 Redis TIME 기준.
+_REDIS_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate) - requested
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+class RedisTokenBucket:
+    """
+    Redis에 상태를 둔 프로세스 간 공유 토큰 버킷
+    get_client: Redis 클라이언트를 돌려주는 함수 (없거나 Redis 오류 시 프로세스 내 TokenBucket으로 대체)
+    """
+
+    def __init__(self, get_client, key, rate, capacity=1):
+        if rate <= 0:
+            raise ValueError("rate는 0보다 커야 합니다")
+
+        self.get_client = get_client
+        self.key = key
+        self.rate = float(rate)
+        self.capacity = max(float(capacity), 1.0)
+        self.fallback = TokenBucket(rate, capacity)
+        self._script = None
+        self._script_client = None
+
+    def _reserve(self, tokens):
+        """토큰 예약 후 대기할 초 (Redis를 쓸 수 없으면 None)"""
+        client = self.get_client()
+        if client is None:
+            return None
+        try:
+            if self._script is None or self._script_client is not client:
+                self._script = client.register_script(_REDIS_BUCKET_SCRIPT)
+                self._script_client = client
+            return float(self._script(keys=[self.key], args=[self.rate, self.capacity, tokens]))
+        except Exception:
+            return None
+
+    def acquire(self, tokens=1):
+        """공유 한도에서 토큰을 예약하고 차례가 될 때까지 대기"""
+        wait_seconds = self._reserve(tokens)
+        if wait_seconds is None:
+            self.fallback.acquire(tokens)
+        elif wait_seconds > 0:
+            time.sleep(wait_seconds)
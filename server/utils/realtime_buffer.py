@@ -0,0 +1,138 @@
+import threading
+import time
+
+import orjson
+
+# 실시간 시세 Redis 쓰기 지연 버퍼 (write-behind)
+# 웹소켓 수신 스레드는 put()으로 메모리에만 기록하고 바로 돌아가며,
+# 별도 스레드가 interval마다 종목별 마지막 값(last-write-wins)을 한 번의 파이프라인 트랜잭션으로 반영한다.
+# Redis 지연/장애가 소켓 수신 속도에 영향을 주지 않는다.
+# channel을 주면 같은 트랜잭션에서 반영한 값 목록을 PUBLISH해 다른 프로세스도 받아 볼 수 있다.
+
+class RealtimeWriteBuffer:
+    """
+    key -> hash 매핑을 모아 interval_ms마다 HSET + EXPIRE (+ counters INCR, channel PUBLISH)로 일괄 반영
+    max_pending: 아직 반영되지 않은 key 최대 수 (초과한 새 key의 값은 버림, 이미 있는 key는 덮어씀)
+    """
+
+    def __init__(self, redis_client, ttl, interval_ms=50, max_pending=5000, counters=(), channel=None, logger=None):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.interval = interval_ms / 1000
+        self.max_pending = max_pending
+        self.counters = counters  # 반영할 때마다 1씩 증가시킬 키 (캐시 버전 등)
+        self.channel = channel    # 반영한 매핑 목록(JSON 배열)을 보낼 pub/sub 채널
+        self.logger = logger
+
+        self.pending = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # 반영 스레드와 stop()의 동시 반영 방지
+        self._stop = threading.Event()
+        self._thread = None
+        self._failing = False  # 연속 실패 중 (장애 동안 interval마다 로그가 쌓이지 않도록 첫 실패만 기록)
+
+        self.metrics = {
+            'received': 0,        # 버퍼에 기록한 값 수 (버린 값 제외)
+            'coalesced': 0,       # 반영 전 같은 key 값으로 덮어쓴 수
+            'dropped': 0,         # max_pending 초과로 버린 수
+            'flushes': 0,
+            'flush_failures': 0,
+            'keys_written': 0,
+            'max_queue_depth': 0,
+            'last_flush_ms': 0.0,
+            'max_flush_ms': 0.0,
+            'total_flush_ms': 0.0,
+        }
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """반영 스레드 종료 후 남은 값 반영"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval * 10 + 1)
+        self.flush()
+
+    def put(self, key, mapping):
+        with self._lock:
+            pending = self.pending
+            if key in pending:
+                self.metrics['coalesced'] += 1
+            elif len(pending) >= self.max_pending:
+                self.metrics['dropped'] += 1
+                return False
+            pending[key] = mapping
+            self.metrics['received'] += 1
+            if len(pending) > self.metrics['max_queue_depth']:
+                self.metrics['max_queue_depth'] = len(pending)
+            return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        """대기 중인 값을 한 번의 파이프라인 트랜잭션으로 반영 (실패 시 더 새로운 값이 없는 key만 되돌림)"""
+        with self._flush_lock:
+            with self._lock:
+                if not self.pending:
+                    return 0
+                batch, self.pending = self.pending, {}
+
+            started = time.perf_counter()
+            try:
+                pipe = self.redis_client.pipeline(transaction=True)
+                for key, mapping in batch.items():
+                    pipe.hset(key, mapping=mapping)
+                    pipe.expire(key, self.ttl)
+                for counter in self.counters:
+                    pipe.incr(counter)
+                if self.channel:
+                    pipe.publish(self.channel, orjson.dumps(list(batch.values())))
+                pipe.execute()
+            except Exception as e:
+                with self._lock:
+                    self.metrics['flush_failures'] += 1
+                    for key, mapping in batch.items():
+                        if key not in self.pending and len(self.pending) < self.max_pending:
+                            self.pending[key] = mapping
+                if self.logger and not self._failing:
+                    self.logger.error(f"❌ 실시간 시세 Redis 일괄 반영 실패 ({len(batch)}개 재시도 대기): {e}")
+                self._failing = True
+                return 0
+
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            if self._failing:
+                self._failing = False
+                if self.logger:
+                    self.logger.info("✅ 실시간 시세 Redis 일괄 반영 복구")
+
+            with self._lock:
+                metrics = self.metrics
+                metrics['flushes'] += 1
+                metrics['keys_written'] += len(batch)
+                metrics['last_flush_ms'] = elapsed_ms
+                metrics['total_flush_ms'] += elapsed_ms
+                if elapsed_ms > metrics['max_flush_ms']:
+                    metrics['max_flush_ms'] = elapsed_ms
+            return len(batch)
+
+    def get_metrics(self):
+        with self._lock:
+            metrics = dict(self.metrics)
+            queue_depth = len(self.pending)
+
+        total_flush_ms = metrics.pop('total_flush_ms')
+        return {
+            **metrics,
+            'queue_depth': queue_depth,
+            'avg_flush_ms': round(total_flush_ms / metrics['flushes'], 3) if metrics['flushes'] else 0.0,
+            'last_flush_ms': round(metrics['last_flush_ms'], 3),
+            'max_flush_ms': round(metrics['max_flush_ms'], 3),
+            'interval_ms': round(self.interval * 1000),
+            'running': self._thread is not None and self._thread.is_alive(),
+        }
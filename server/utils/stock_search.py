@@ -0,0 +1,311 @@
+import threading
+from bisect import bisect_right
+
+# 종목명/종목코드 메모리 검색 인덱스
+# 접두어, 부분 문자열, 초성(예: "ㅅㅅㅈㅈ" -> 삼성전자) 검색을 DB 조회 없이 처리한다.
+
+HANGUL_BASE = 0xAC00
+HANGUL_LAST = 0xD7A3
+CHOSUNG_INTERVAL = 588  # 중성 21 × 종성 28
+CHOSUNG_LIST = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+CHOSUNG_SET = frozenset(CHOSUNG_LIST)
+
+KEY_SEPARATOR = '\n'  # 정규화된 키에는 공백이 없으므로 구분자가 검색어와 겹치지 않음
+
+# 자동완성 사전 계산 범위
+AUTOCOMPLETE_MAX_K = 20           # 접두어별로 보관하는 상위 종목 수 (요청 k의 상한)
+AUTOCOMPLETE_MAX_PREFIX = 12      # 이보다 긴 접두어는 일반 검색으로 처리
+AUTOCOMPLETE_TYPO_MIN_LENGTH = 2  # 한 글자 오타 허용을 시작하는 검색어 길이
+
+def normalize(text):
+    """대소문자/공백 차이를 무시하도록 정규화"""
+    return ''.join(text.split()).lower()
+
+def to_chosung(text):
+    """한글 음절은 초성으로, 나머지 문자는 그대로"""
+    chars = []
+    for char in text:
+        code = ord(char)
+        if HANGUL_BASE <= code <= HANGUL_LAST:
+            chars.append(CHOSUNG_LIST[(code - HANGUL_BASE) // CHOSUNG_INTERVAL])
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+def _chars_match(query, target):
+    """query의 초성 문자는 target 음절의 초성과, 나머지 문자는 그대로 비교"""
+    for q_char, t_char in zip(query, target):
+        if q_char == t_char:
+            continue
+        if q_char in CHOSUNG_SET and to_chosung(t_char) == q_char:
+            continue
+        return False
+    return True
+
+def _find_mixed(query, name):
+    """초성과 완성형이 섞인 검색어("삼ㅅ")의 일치 위치 (-1: 불일치)"""
+    for start in range(len(name) - len(query) + 1):
+        if _chars_match(query, name[start:start + len(query)]):
+            return start
+    return -1
+
+def _deletes(text):
+    """한 글자씩 뺀 변형 (삭제 기반 오타 사전용)"""
+    return {text[:i] + text[i + 1:] for i in range(len(text))}
+
+def _within_one_edit(a, b):
+    """두 문자열의 편집 거리가 1 이하인지 (삽입/삭제/치환)"""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) > len(b):
+        a, b = b, a
+
+    for i in range(len(a)):
+        if a[i] != b[i]:
+            if len(a) == len(b):
+                return a[i + 1:] == b[i + 1:]
+            return a[i:] == b[i + 1:]
+    return True
+
+def _push_top(table, key, item, key_limit=AUTOCOMPLETE_MAX_K):
+    """거래대금 순으로 들어오는 item을 key별 상위 key_limit개까지만 보관"""
+    items = table.get(key)
+    if items is None:
+        table[key] = [item]
+    elif len(items) < key_limit:
+        items.append(item)
+
+class StockSearchEntry:
+    __slots__ = (
+        'stock_id', 'stock_code', 'stock_name', 'market', 'trading_value', 'current_price',
+        'name_key', 'chosung_key'
+    )
+
+    def __init__(self, stock_id, stock_code, stock_name, market, trading_value, current_price=None):
+        self.stock_id = stock_id
+        self.stock_code = stock_code
+        self.stock_name = stock_name
+        self.market = market
+        self.trading_value = int(trading_value) if trading_value is not None else 0
+        self.current_price = float(current_price) if current_price is not None else None
+        self.name_key = normalize(stock_name)
+        self.chosung_key = to_chosung(self.name_key)
+
+class StockSearchIndex:
+    """
+    종목 목록 스냅샷 위의 검색 인덱스
+    키를 구분자로 이어 붙인 blob을 str.find로 스캔하므로 비용은 전체 종목 수가 아니라 결과 수에 비례한다.
+    build()는 새 스냅샷을 만든 뒤 참조만 교체하므로 검색 중인 요청은 이전 스냅샷을 그대로 사용한다.
+    """
+
+    def __init__(self):
+        self.snapshot = None
+        self.built_at = None
+        self.versions = None  # 인덱스를 만든 데이터의 버전 (호출자가 바뀐 버전과 비교해 재구성)
+        self.lock = threading.Lock()
+
+    @property
+    def is_ready(self):
+        return self.snapshot is not None and bool(self.snapshot['entries'])
+
+    def build(self, rows, built_at=None, versions=None):
+        """
+        rows: (stock_id, stock_code, stock_name, market, trading_value[, current_price]) 목록
+        versions: rows를 읽기 전에 확인한 데이터 버전
+        """
+        entries = [StockSearchEntry(*row) for row in rows if row[1] and row[2]]
+        entries.sort(key=lambda entry: entry.trading_value, reverse=True)  # blob 순서 = 거래대금 순위
+
+        exact = {}
+        for entry in entries:
+            exact.setdefault(entry.name_key, []).append(entry)
+            if entry.chosung_key != entry.name_key:
+                exact.setdefault(entry.chosung_key, []).append(entry)
+
+        snapshot = {
+            'entries': entries,
+            'by_code': {entry.stock_code: entry for entry in entries},
+            'exact': exact,
+            'name': self._build_blob([entry.name_key for entry in entries]),
+            # 초성 변환은 음절 단위 1:1이므로 종목명 blob과 위치가 같다
+            'chosung': self._build_blob([entry.chosung_key for entry in entries]),
+            'code': self._build_blob([entry.stock_code for entry in entries])
+        }
+        snapshot['prefix_top'], snapshot['typo_top'] = self._build_autocomplete(entries)
+
+        with self.lock:
+            self.snapshot = snapshot
+            self.built_at = built_at
+            self.versions = versions
+        return len(entries)
+
+    @staticmethod
+    def _build_blob(keys):
+        """각 키 앞에 구분자를 두어 (구분자 + 검색어)로 접두어만 찾을 수 있게 함"""
+        offsets = []
+        position = len(KEY_SEPARATOR)
+        for key in keys:
+            offsets.append(position)
+            position += len(key) + len(KEY_SEPARATOR)
+        return KEY_SEPARATOR + KEY_SEPARATOR.join(keys), offsets
+
+    @staticmethod
+    def _build_autocomplete(entries):
+        """
+        접두어 -> 거래대금 상위 종목 목록 (종목명/초성/종목코드)
+        종목명 접두어는 한 글자를 뺀 변형도 등록해 검색어와 편집 거리 1 이내인 접두어를 찾는다.
+        """
+        prefix_top = {}
+        typo_top = {}  # 삭제 변형 -> [(원래 접두어, entry)]
+
+        for entry in entries:
+            name_prefixes = {
+                entry.name_key[:length]
+                for length in range(1, min(len(entry.name_key), AUTOCOMPLETE_MAX_PREFIX) + 1)
+            }
+            prefixes = set(name_prefixes)
+            prefixes.update(
+                entry.chosung_key[:length]
+                for length in range(1, min(len(entry.chosung_key), AUTOCOMPLETE_MAX_PREFIX) + 1)
+            )
+            prefixes.update(entry.stock_code[:length] for length in range(1, len(entry.stock_code) + 1))
+
+            for prefix in prefixes:
+                _push_top(prefix_top, prefix, entry)
+
+            for prefix in name_prefixes:
+                if len(prefix) < AUTOCOMPLETE_TYPO_MIN_LENGTH:
+                    continue
+                for variant in _deletes(prefix):
+                    _push_top(typo_top, variant, (prefix, entry))
+
+        return prefix_top, typo_top
+
+    def autocomplete(self, keyword, k=10):
+        """
+        자동완성 상위 k개: 접두어 일치 -> 부분 일치 -> 한 글자 오타 허용 접두어 순
+        접두어 일치는 사전 계산된 목록을 그대로 잘라 반환한다.
+        """
+        query = normalize(keyword or '')
+        snapshot = self.snapshot
+        if not query or not snapshot:
+            return []
+        k = max(1, min(k, AUTOCOMPLETE_MAX_K))
+
+        results = {}  # stock_id -> entry (삽입 순서 = 순위)
+
+        def collect(candidates):
+            for entry in candidates:
+                if entry.stock_id not in results:
+                    results[entry.stock_id] = entry
+                    if len(results) >= k:
+                        return True
+            return False
+
+        # 1. 사전 계산된 접두어 상위 목록
+        if len(query) <= AUTOCOMPLETE_MAX_PREFIX and collect(snapshot['prefix_top'].get(query, [])):
+            return list(results.values())
+
+        # 2. 부분 일치/혼합 초성 등 일반 검색으로 보충
+        if collect(self.search(query, k)):
+            return list(results.values())
+
+        # 3. 한 글자 오타: 삽입(검색어에서 한 글자 삭제), 누락(사전의 삭제 변형), 치환(양쪽 삭제 변형)
+        if len(query) >= AUTOCOMPLETE_TYPO_MIN_LENGTH and len(query) <= AUTOCOMPLETE_MAX_PREFIX + 1:
+            typo_candidates = {}
+            query_deletes = _deletes(query)
+
+            for variant in query_deletes:
+                for entry in snapshot['prefix_top'].get(variant, []):
+                    typo_candidates.setdefault(entry.stock_id, entry)
+
+            for variant in query_deletes | {query}:
+                for prefix, entry in snapshot['typo_top'].get(variant, []):
+                    if _within_one_edit(query, prefix):
+                        typo_candidates.setdefault(entry.stock_id, entry)
+
+            collect(sorted(typo_candidates.values(), key=lambda entry: entry.trading_value, reverse=True))
+
+        return list(results.values())
+
+    def get(self, stock_code):
+        snapshot = self.snapshot
+        return snapshot['by_code'].get(stock_code) if snapshot else None
+
+    def search(self, keyword, limit=100):
+        """검색어에 맞는 종목을 일치 구간(완전 > 접두어 > 부분) -> 거래대금 순으로 최대 limit개 반환"""
+        query = normalize(keyword or '')
+        snapshot = self.snapshot
+        if not query or not snapshot or limit <= 0:
+            return []
+
+        entries = snapshot['entries']
+        results = {}  # stock_id -> entry (삽입 순서 = 순위)
+
+        def collect(candidates):
+            for entry in candidates:
+                if entry.stock_id not in results:
+                    results[entry.stock_id] = entry
+                    if len(results) >= limit:
+                        return True
+            return False
+
+        # 1. 종목코드 (숫자 검색어)
+        if query.isdigit():
+            code_blob, code_offsets = snapshot['code']
+            exact_code = snapshot['by_code'].get(query)
+            if collect([exact_code] if exact_code else []):
+                return list(results.values())
+            if collect(entry for _, entry in self._scan(code_blob, code_offsets, entries, query, prefix=True)):
+                return list(results.values())
+
+        # 2. 종목명: 초성이 포함되면 초성 blob으로 후보를 찾고, 완성형이 섞여 있으면 글자 단위로 재확인
+        if any(char in CHOSUNG_SET for char in query):
+            needle = to_chosung(query)
+            blob, offsets = snapshot['chosung']
+            verify = None if needle == query else query
+        else:
+            needle = query
+            blob, offsets = snapshot['name']
+            verify = None
+
+        def verified(matches, prefix):
+            for _, entry in matches:
+                if verify is not None:
+                    position = _find_mixed(verify, entry.name_key)
+                    if position < 0 or (prefix and position > 0):
+                        continue
+                yield entry
+
+        exact_entries = [
+            entry for entry in snapshot['exact'].get(needle, [])
+            if verify is None or _chars_match(verify, entry.name_key)
+        ]
+        if collect(exact_entries):
+            return list(results.values())
+        if collect(verified(self._scan(blob, offsets, entries, needle, prefix=True), prefix=True)):
+            return list(results.values())
+        collect(verified(self._scan(blob, offsets, entries, needle), prefix=False))
+        return list(results.values())
+
+    @staticmethod
+    def _scan(blob, offsets, entries, query, prefix=False):
+        """blob에서 query가 나오는 종목마다 (키 내 첫 위치, entry)를 blob 순서로 생성 (prefix: 키 시작 일치만)"""
+        needle = KEY_SEPARATOR + query if prefix else query
+        shift = len(KEY_SEPARATOR) if prefix else 0
+
+        start = blob.find(needle)
+        while start >= 0:
+            key_position = start + shift
+            index = bisect_right(offsets, key_position) - 1
+            yield key_position - offsets[index], entries[index]
+
+            next_index = index + 1
+            if next_index >= len(offsets):
+                break
+            start = blob.find(needle, offsets[next_index] - shift)
+
+# 프로세스 전역 종목 검색 인덱스
+stock_search_index = StockSearchIndex()
@@ -0,0 +1,143 @@
+import threading
+from collections import deque
+
+# 웹소켓 수신 -> 처리 스레드 사이의 유한 대기열과 단계별 지연 히스토그램
+# 수신 스레드는 프레임을 put()만 하고 바로 다음 메시지를 읽으며, 처리 스레드가 get()으로 꺼내 파싱/반영한다.
+# 대기열은 종목별 FIFO로 나뉘어 종목 안의 체결 순서는 유지하고, 처리 스레드는 종목을 번갈아 꺼낸다.
+
+TICK_OVERFLOW_POLICIES = ('drop_oldest', 'drop_newest')
+
+# 지연 히스토그램 구간 상한 (ms), 마지막 구간은 상한 없음
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+class LatencyHistogram:
+    """고정 구간 지연 히스토그램 (관측값은 ms)"""
+
+    def __init__(self, bounds=LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms):
+        index = 0
+        for bound in self.bounds:
+            if value_ms <= bound:
+                break
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value_ms
+        if value_ms > self.max:
+            self.max = value_ms
+
+    def _quantile(self, q):
+        """구간 상한 기준 분위수 근사값"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return self.bounds[index] if index < len(self.bounds) else round(self.max, 3)
+        return round(self.max, 3)
+
+    def snapshot(self):
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.bounds, self.counts)}
+        buckets['inf'] = self.counts[-1]
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'p50_ms': self._quantile(0.5),
+            'p99_ms': self._quantile(0.99),
+            'max_ms': round(self.max, 3),
+            'buckets': buckets
+        }
+
+class TickQueue:
+    """
+    종목별로 나뉜 유한 대기열 (전체 capacity개)
+    가득 찼을 때 overflow 정책
+    - drop_oldest: 같은 종목의 가장 오래된 항목을 버림 (해당 종목 대기분이 없으면 가장 많이 쌓인 종목에서)
+    - drop_newest: 새로 들어온 항목을 버림
+    """
+
+    def __init__(self, capacity=10000, overflow='drop_oldest'):
+        if overflow not in TICK_OVERFLOW_POLICIES:
+            raise ValueError(f"지원하지 않는 overflow 정책입니다: {overflow} (가능: {', '.join(TICK_OVERFLOW_POLICIES)})")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self._queues = {}       # 종목코드 -> deque[항목]
+        self._ready = deque()   # 대기분이 있는 종목 (꺼낼 순서, 종목당 1번)
+        self._size = 0
+        self._cond = threading.Condition()
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        return self._size
+
+    def put(self, symbol, item):
+        """항목 추가 (대기하지 않음), 버린 항목이 있으면 False"""
+        with self._cond:
+            accepted = True
+            if self._size >= self.capacity:
+                self.dropped += 1
+                accepted = False
+                if self.overflow == 'drop_newest':
+                    return False
+
+                victim = symbol if self._queues.get(symbol) else max(self._queues, key=lambda code: len(self._queues[code]))
+                self._queues[victim].popleft()
+                self._size -= 1
+                if not self._queues[victim]:
+                    del self._queues[victim]
+                    self._ready.remove(victim)
+
+            queue = self._queues.get(symbol)
+            if queue is None:
+                queue = self._queues[symbol] = deque()
+                self._ready.append(symbol)
+            queue.append(item)
+            self._size += 1
+            self.enqueued += 1
+            if self._size > self.max_depth:
+                self.max_depth = self._size
+
+            self._cond.notify()
+            return accepted
+
+    def get(self, timeout=None):
+        """가장 먼저 대기한 종목의 가장 오래된 항목 (timeout 동안 없으면 None)"""
+        with self._cond:
+            if not self._size and not self._cond.wait_for(lambda: self._size, timeout):
+                return None
+
+            symbol = self._ready.popleft()
+            queue = self._queues[symbol]
+            item = queue.popleft()
+            self._size -= 1
+
+            # 남은 항목이 있으면 다른 종목 뒤로 (종목 간 번갈아 처리)
+            if queue:
+                self._ready.append(symbol)
+            else:
+                del self._queues[symbol]
+            return item
+
+    def get_metrics(self):
+        with self._cond:
+            return {
+                'depth': self._size,
+                'max_depth': self.max_depth,
+                'capacity': self.capacity,
+                'overflow': self.overflow,
+                'symbols_waiting': len(self._queues),
+                'enqueued': self.enqueued,
+                'dropped': self.dropped
+            }